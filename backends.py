@@ -0,0 +1,974 @@
+"""
+Render-backends the shapes draw through.
+
+A backend offers the drawing commands known from the turtle-module, like
+forward, left or circle. The baseclass keeps track of the position, heading
+and pen of the turtle and turns these commands into a few primitives (moves,
+lines, arcs and fills), which are implemented by the actual backends.
+"""
+
+import math
+
+# the turtle-module needs Tk, which is not installed everywhere. All other
+# backends work without it.
+try:
+    import turtle
+except ImportError:
+    turtle = None
+
+
+class Backend():
+    """
+    Baseclass for backends, contains the state of the turtle.
+
+    Subclasses implement the primitives set_pen, move_to, line_to, arc_to,
+    fill_begin and fill_end as well as begin_image and end_image.
+    """
+
+    def __init__(self):
+        """
+        Generate a new backend with the turtle in its starting position.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.reset()
+
+    def reset(self):
+        """
+        Put the turtle back into its starting position.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.x = 0.0
+        self.y = 0.0
+        self.heading = 0.0
+        self.is_down = True
+        self.pen_color = "black"
+        self.pen_width = 1
+        self.fill_color = "black"
+        self.filling = False
+        # the style is only handed to set_pen right before it is needed
+        self.__pen_changed = True
+
+    # commands of the turtle-module
+    def penup(self):
+        """
+        Lift the pen, moving the turtle does not draw anymore.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.is_down = False
+
+    def pendown(self):
+        """
+        Put the pen down, moving the turtle draws a line.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.is_down = True
+
+    def pencolor(self, color: str):
+        """
+        Set the color of the lines.
+
+        Parameters
+        ----------
+        color : str
+            Name of the color.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.pen_color = color
+        self.__pen_changed = True
+
+    def width(self, width: float):
+        """
+        Set the width of the lines.
+
+        Parameters
+        ----------
+        width : float
+            Width of the pen.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.pen_width = width
+        self.__pen_changed = True
+
+    def fillcolor(self, color: str):
+        """
+        Set the color for filled areas.
+
+        Parameters
+        ----------
+        color : str
+            Name of the color.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.fill_color = color
+
+    def begin_fill(self):
+        """
+        Start an area which will be filled when end_fill is called.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.filling:
+            self.fill_end(self.fill_color)
+        self.filling = True
+        self.fill_begin(self.x, self.y)
+
+    def end_fill(self):
+        """
+        Fill the area drawn since begin_fill.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.filling:
+            self.filling = False
+            self.fill_end(self.fill_color)
+
+    def setheading(self, angle: float):
+        """
+        Turn the turtle into the given direction.
+
+        Parameters
+        ----------
+        angle : float
+            Direction in degrees, 0 is to the right, counterclockwise.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.heading = angle % 360
+
+    def left(self, angle: float):
+        """
+        Turn the turtle counterclockwise.
+
+        Parameters
+        ----------
+        angle : float
+            Angle in degrees.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.heading = (self.heading + angle) % 360
+
+    def right(self, angle: float):
+        """
+        Turn the turtle clockwise.
+
+        Parameters
+        ----------
+        angle : float
+            Angle in degrees.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.heading = (self.heading - angle) % 360
+
+    def setposition(self, x: float, y: float):
+        """
+        Move the turtle to the given position.
+
+        Parameters
+        ----------
+        x : float
+            Target x-coordinate.
+        y : float
+            Target y-coordinate.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__move(x, y)
+
+    def forward(self, distance: float):
+        """
+        Move the turtle into the direction it is heading.
+
+        Parameters
+        ----------
+        distance : float
+            Distance to move.
+
+        Returns
+        -------
+        None.
+
+        """
+        heading = math.radians(self.heading)
+        self.__move(self.x + distance * math.cos(heading),
+                    self.y + distance * math.sin(heading))
+
+    def circle(self, radius: float, extent: float = None):
+        """
+        Move the turtle along a circle.
+
+        Just like in the turtle-module, the center of the circle lies radius
+        units left of the turtle. With a negative radius it lies to the right.
+
+        Parameters
+        ----------
+        radius : float
+            Radius of the circle.
+        extent : float, optional
+            Part of the circle in degrees. The default is the full circle.
+
+        Returns
+        -------
+        None.
+
+        """
+        if extent is None:
+            extent = 360
+        if radius == 0:
+            self.heading = (self.heading + extent) % 360
+            return
+
+        heading = math.radians(self.heading)
+        center_x = self.x - radius * math.sin(heading)
+        center_y = self.y + radius * math.cos(heading)
+        if radius > 0:
+            start = self.heading - 90
+            sweep = extent
+        else:
+            start = self.heading + 90
+            sweep = -extent
+        end = math.radians(start + sweep)
+        x = center_x + abs(radius) * math.cos(end)
+        y = center_y + abs(radius) * math.sin(end)
+
+        if self.is_down:
+            self.__update_pen()
+            self.arc_to(center_x, center_y, abs(radius), start, sweep, x, y)
+        elif self.filling:
+            # the area to fill still follows the circle
+            for point_x, point_y in arc_points(center_x, center_y,
+                                               abs(radius), start, sweep):
+                self.move_to(point_x, point_y)
+        else:
+            self.move_to(x, y)
+
+        self.x = x
+        self.y = y
+        self.heading = (self.heading + sweep) % 360
+
+    def __move(self, x: float, y: float):
+        """
+        Move the turtle in a straight line, drawing if the pen is down.
+
+        Parameters
+        ----------
+        x : float
+            Target x-coordinate.
+        y : float
+            Target y-coordinate.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.is_down:
+            self.__update_pen()
+            self.line_to(x, y)
+        else:
+            self.move_to(x, y)
+        self.x = x
+        self.y = y
+
+    def __update_pen(self):
+        """
+        Hand the current style to the backend, if it was changed.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.__pen_changed:
+            self.__pen_changed = False
+            self.set_pen(self.pen_color, self.pen_width)
+
+    # primitives, implemented by the subclasses
+    def begin_image(self, image):
+        """
+        Prepare the drawingboard for the given image.
+
+        Parameters
+        ----------
+        image : Image
+            The image which will be drawn.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.reset()
+
+    def end_image(self, image):
+        """
+        Finish drawing the given image.
+
+        Parameters
+        ----------
+        image : Image
+            The image which was drawn.
+
+        Returns
+        -------
+        None.
+
+        """
+
+    def set_pen(self, color: str, width: float):
+        """
+        Set the style of the following lines and arcs.
+
+        Parameters
+        ----------
+        color : str
+            Name of the color.
+        width : float
+            Width of the pen.
+
+        Returns
+        -------
+        None.
+
+        """
+        raise NotImplementedError
+
+    def move_to(self, x: float, y: float):
+        """
+        Move to the given position without drawing.
+
+        Parameters
+        ----------
+        x : float
+            Target x-coordinate.
+        y : float
+            Target y-coordinate.
+
+        Returns
+        -------
+        None.
+
+        """
+        raise NotImplementedError
+
+    def line_to(self, x: float, y: float):
+        """
+        Draw a straight line to the given position.
+
+        Parameters
+        ----------
+        x : float
+            Target x-coordinate.
+        y : float
+            Target y-coordinate.
+
+        Returns
+        -------
+        None.
+
+        """
+        raise NotImplementedError
+
+    def arc_to(self, center_x: float, center_y: float, radius: float,
+               start: float, sweep: float, x: float, y: float):
+        """
+        Draw an arc from the current position.
+
+        The default implementation draws the arc as straight lines.
+
+        Parameters
+        ----------
+        center_x : float
+            X-coordinate of the center.
+        center_y : float
+            Y-coordinate of the center.
+        radius : float
+            Radius of the arc, always positive.
+        start : float
+            Angle in degrees from the center to the current position.
+        sweep : float
+            Angle in degrees the arc covers, positive is counterclockwise.
+        x : float
+            X-coordinate of the end of the arc.
+        y : float
+            Y-coordinate of the end of the arc.
+
+        Returns
+        -------
+        None.
+
+        """
+        for point_x, point_y in arc_points(center_x, center_y,
+                                           radius, start, sweep):
+            self.line_to(point_x, point_y)
+
+    def fill_begin(self, x: float, y: float):
+        """
+        Start an area which will be filled, starting at the given position.
+
+        Parameters
+        ----------
+        x : float
+            X-coordinate of the first point of the area.
+        y : float
+            Y-coordinate of the first point of the area.
+
+        Returns
+        -------
+        None.
+
+        """
+        raise NotImplementedError
+
+    def fill_end(self, color: str):
+        """
+        Fill the area started with fill_begin.
+
+        Parameters
+        ----------
+        color : str
+            Name of the color to fill with.
+
+        Returns
+        -------
+        None.
+
+        """
+        raise NotImplementedError
+
+
+def arc_points(center_x: float, center_y: float, radius: float,
+               start: float, sweep: float, tolerance: float = 0.25):
+    """
+    Split an arc into points, which can be connected by straight lines.
+
+    Parameters
+    ----------
+    center_x : float
+        X-coordinate of the center.
+    center_y : float
+        Y-coordinate of the center.
+    radius : float
+        Radius of the arc.
+    start : float
+        Angle in degrees from the center to the start of the arc.
+    sweep : float
+        Angle in degrees the arc covers, positive is counterclockwise.
+    tolerance : float, optional
+        Largest distance between the lines and the real arc.
+        The default is 0.25.
+
+    Returns
+    -------
+    list
+        The points of the arc as (x, y), without the starting point.
+
+    """
+    # every line may cover this angle to stay within the tolerance
+    if radius > tolerance:
+        step = 2 * math.acos(1 - tolerance / radius)
+    else:
+        step = math.pi / 2
+    steps = max(1, math.ceil(math.radians(abs(sweep)) / step))
+
+    start = math.radians(start)
+    sweep = math.radians(sweep) / steps
+    return [(center_x + radius * math.cos(start + sweep * i),
+             center_y + radius * math.sin(start + sweep * i))
+            for i in range(1, steps + 1)]
+
+
+def _turtle_screen():
+    """
+    Get the screen of the turtle, opening a new window if needed.
+
+    After a window was closed with bye, the turtle-module raises a
+    Terminator once and opens a new window on the next call.
+
+    Returns
+    -------
+    Screen
+        The screen of the turtle.
+
+    """
+    try:
+        return turtle.getscreen()
+    except turtle.Terminator:
+        return turtle.getscreen()
+
+
+class TurtleBackend(Backend):
+    """
+    Backend drawing with the turtle-module inside of a Tk-window.
+
+    In the fast mode the animation is turned off and the window is only
+    updated every few primitives or once at the end, which is much faster
+    for images with many shapes.
+    """
+
+    def __init__(self, fast: bool = False, update_every: int = 0,
+                 postscript: str = None, keep_open: bool = False):
+        """
+        Generate a new backend drawing with the turtle-module.
+
+        Parameters
+        ----------
+        fast : bool, optional
+            If True, the turtle is not animated. The default is False.
+        update_every : int, optional
+            Number of primitives after which the window is updated in the
+            fast mode. The default of 0 updates it only at the end.
+        postscript : str, optional
+            Path of a PostScript-file the finished drawing is saved to. The
+            window is closed afterwards instead of waiting until the user
+            closes it. The default waits for the user.
+        keep_open : bool, optional
+            If True, the window is neither waited for nor closed after an
+            image, so the next image can be drawn into it. The default is
+            False.
+
+        Raises
+        ------
+        ImportError
+            If the turtle-module can not be used, because Tk is missing.
+
+        Returns
+        -------
+        None.
+
+        """
+        if turtle is None:
+            raise ImportError("the turtle-module needs Tk, which is missing")
+        super().__init__()
+        self.fast = fast
+        self.update_every = update_every
+        self.postscript = postscript
+        self.keep_open = keep_open
+        self.screen = None
+        self.pen = None
+
+    def reset(self):
+        """
+        Put the turtle back into its starting position.
+
+        Returns
+        -------
+        None.
+
+        """
+        super().reset()
+        self.__is_down = None
+        self.__primitives = 0
+
+    def begin_image(self, image):
+        """
+        Set up the turtle-screen for the given image.
+
+        Parameters
+        ----------
+        image : Image
+            The image which will be drawn.
+
+        Returns
+        -------
+        None.
+
+        """
+        super().begin_image(image)
+        # the screen and the turtle are looked up only once
+        self.screen = _turtle_screen()
+        self.pen = turtle.getturtle()
+        # the window may have been used by another backend before, so both
+        # modes set the animation
+        if self.fast:
+            self.screen.tracer(0)
+            self.pen.hideturtle()
+        else:
+            self.screen.tracer(1)
+            self.pen.showturtle()
+
+        self.screen.setworldcoordinates(image.lower_left_x,
+                                        image.lower_left_y,
+                                        image.upper_right_x,
+                                        image.upper_right_y)
+
+        self.screen.screensize(image.upper_right_y - image.lower_left_y,
+                               image.upper_right_x - image.lower_left_x)
+        if image.background_color is not None:
+            self.screen.bgcolor(image.background_color)
+
+    def end_image(self, image):
+        """
+        Show the drawing, wait until the window is closed and tear it down.
+
+        If a PostScript-file is wanted, the drawing is saved and the window
+        is closed without waiting. A window which is kept open is neither
+        waited for nor closed.
+
+        Parameters
+        ----------
+        image : Image
+            The image which was drawn.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.fast:
+            self.screen.update()
+        if self.postscript is not None:
+            self.screen.getcanvas().postscript(file=self.postscript)
+        if self.keep_open:
+            return
+        if self.postscript is None:
+            turtle.done()
+        turtle.bye()
+
+    def set_pen(self, color: str, width: float):
+        """
+        Set the style of the turtle.
+
+        Parameters
+        ----------
+        color : str
+            Name of the color.
+        width : float
+            Width of the pen.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__attach()
+        self.pen.pencolor(color)
+        self.pen.width(width)
+
+    def move_to(self, x: float, y: float):
+        """
+        Move the turtle without drawing.
+
+        Parameters
+        ----------
+        x : float
+            Target x-coordinate.
+        y : float
+            Target y-coordinate.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__attach()
+        self.__pen(False)
+        self.pen.setposition(x, y)
+
+    def line_to(self, x: float, y: float):
+        """
+        Draw a line with the turtle.
+
+        Parameters
+        ----------
+        x : float
+            Target x-coordinate.
+        y : float
+            Target y-coordinate.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__attach()
+        self.__pen(True)
+        self.pen.setposition(x, y)
+        self.__count()
+
+    def arc_to(self, center_x: float, center_y: float, radius: float,
+               start: float, sweep: float, x: float, y: float):
+        """
+        Draw an arc with the circle-command of the turtle.
+
+        Parameters
+        ----------
+        center_x : float
+            X-coordinate of the center.
+        center_y : float
+            Y-coordinate of the center.
+        radius : float
+            Radius of the arc, always positive.
+        start : float
+            Angle in degrees from the center to the current position.
+        sweep : float
+            Angle in degrees the arc covers, positive is counterclockwise.
+        x : float
+            X-coordinate of the end of the arc.
+        y : float
+            Y-coordinate of the end of the arc.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__attach()
+        self.__pen(True)
+        if sweep >= 0:
+            self.pen.setheading(start + 90)
+            self.pen.circle(radius, sweep)
+        else:
+            self.pen.setheading(start - 90)
+            self.pen.circle(-radius, -sweep)
+        self.__count()
+
+    def fill_begin(self, x: float, y: float):
+        """
+        Start filling with the turtle.
+
+        Parameters
+        ----------
+        x : float
+            X-coordinate of the first point of the area.
+        y : float
+            Y-coordinate of the first point of the area.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__attach()
+        self.pen.begin_fill()
+
+    def fill_end(self, color: str):
+        """
+        Fill the area with the turtle.
+
+        Parameters
+        ----------
+        color : str
+            Name of the color to fill with.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__attach()
+        self.pen.fillcolor(color)
+        self.pen.end_fill()
+        self.__count()
+
+    def __attach(self):
+        """
+        Look up the screen and the turtle, if no image was begun.
+
+        A shape drawn on its own draws with the turtle as it is, without
+        setting up the window for an image.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.pen is None:
+            self.screen = _turtle_screen()
+            self.pen = turtle.getturtle()
+
+    def __pen(self, is_down: bool):
+        """
+        Lift or put down the pen of the turtle, if needed.
+
+        Parameters
+        ----------
+        is_down : bool
+            True, if the turtle shall draw.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.__is_down != is_down:
+            self.__is_down = is_down
+            if is_down:
+                self.pen.pendown()
+            else:
+                self.pen.penup()
+
+    def __count(self):
+        """
+        Count a drawn primitive and update the window if it is time to.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.fast and self.update_every:
+            self.__primitives += 1
+            if self.__primitives >= self.update_every:
+                self.__primitives = 0
+                self.screen.update()
+
+
+class TurtleRenderer():
+    """
+    Draws many images one after another into the same turtle-window.
+
+    Starting Tk takes longer than drawing most images, so the window is
+    opened once, cleared between the images and only closed at the end.
+    Nothing waits for the user, the drawings are saved as PostScript.
+    """
+
+    def __init__(self, fast: bool = True, update_every: int = 0):
+        """
+        Generate a new renderer, the window is not opened yet.
+
+        Parameters
+        ----------
+        fast : bool, optional
+            If True, the turtle is not animated. The default is True.
+        update_every : int, optional
+            Number of primitives after which the window is updated in the
+            fast mode. The default of 0 updates it only at the end.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.fast = fast
+        self.update_every = update_every
+        self.backend = None
+
+    def open(self):
+        """
+        Open the window, if it is not open yet.
+
+        Raises
+        ------
+        ImportError
+            If the turtle-module can not be used, because Tk is missing.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.backend is None:
+            self.backend = TurtleBackend(self.fast, self.update_every,
+                                         keep_open=True)
+            _turtle_screen()
+
+    def render(self, scene, postscript: str = None):
+        """
+        Clear the window and draw a scene into it.
+
+        Parameters
+        ----------
+        scene : Image
+            The image to draw or anything else drawn by draw(backend),
+            like a compiled scene.
+        postscript : str, optional
+            Path of a PostScript-file the drawing is saved to. The default
+            does not save it.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.open()
+        screen = _turtle_screen()
+        # reset removes all drawings, but keeps the window and its settings
+        screen.reset()
+        screen.bgcolor("white")
+        self.backend.postscript = postscript
+        scene.draw(self.backend)
+
+    def close(self):
+        """
+        Close the window, the renderer can be opened again afterwards.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.backend is not None:
+            self.backend = None
+            turtle.bye()
+
+    def __enter__(self):
+        """
+        Use the renderer in a with-statement, which closes it at the end.
+
+        Returns
+        -------
+        TurtleRenderer
+            The renderer itself.
+
+        """
+        self.open()
+        return self
+
+    def __exit__(self, *exception):
+        """
+        Close the renderer at the end of a with-statement.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.close()
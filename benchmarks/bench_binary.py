@@ -0,0 +1,90 @@
+"""
+Benchmark for the pre-compiled binary form of TML-files.
+
+A synthetic scene is written as text, parsed, compiled and loaded again from
+its compiled form. Loading only maps the file, so it should take
+milliseconds even for a million shapes. Building all shapes from the
+compiled file is timed as well.
+
+Usage: python benchmarks/bench_binary.py [--shapes COUNT]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import tml_binary  # noqa: E402
+import tml_parser  # noqa: E402
+from bench_parser import SHAPE  # noqa: E402
+
+
+def write_scene(file, count: int):
+    """
+    Write a TML-text with about the given number of shapes.
+
+    Parameters
+    ----------
+    file : file-object
+        File opened in text mode.
+    count : int
+        Number of shapes, every rectangle contains a circle.
+
+    Returns
+    -------
+    None.
+
+    """
+    file.write("<image>\n")
+    for index in range(count // 2):
+        file.write(SHAPE.format(x=index % 1000, y=index % 997,
+                                size=index % 50))
+    file.write("</image>\n")
+
+
+def main():
+    """
+    Run the benchmark and print the results.
+
+    Returns
+    -------
+    None.
+
+    """
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--shapes", type=int, default=1000000,
+                                 help="number of shapes in the scene")
+    arguments = argument_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, "scene.tml")
+        compiled_path = os.path.join(directory, "scene.tmlc")
+        with open(text_path, "w") as file:
+            write_scene(file, arguments.shapes)
+
+        start = time.perf_counter()
+        tml_parser.read_tml(text_path)
+        print(f"parse text:     {time.perf_counter() - start:10.4f}s "
+              f"({os.path.getsize(text_path)} bytes)")
+
+        start = time.perf_counter()
+        tml_binary.compile_file(text_path, compiled_path)
+        print(f"compile:        {time.perf_counter() - start:10.4f}s "
+              f"({os.path.getsize(compiled_path)} bytes)")
+
+        start = time.perf_counter()
+        scene = tml_binary.load(compiled_path)
+        print(f"load compiled:  {time.perf_counter() - start:10.4f}s "
+              f"({len(scene)} shapes)")
+
+        start = time.perf_counter()
+        scene.read()
+        print(f"build shapes:   {time.perf_counter() - start:10.4f}s")
+        scene.close()
+
+
+if __name__ == "__main__":
+    main()
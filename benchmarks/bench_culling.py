@@ -0,0 +1,67 @@
+"""
+Benchmark for drawing a small region of a big scene with viewport culling.
+
+Circles and rectangles are spread over a large map, but only a small region
+of it is rendered, once by drawing every shape and once by drawing only the
+shapes found in the grid index.
+
+Usage: python benchmarks/bench_culling.py [--count COUNT]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import raster  # noqa: E402
+import spatial  # noqa: E402
+from bench_memory import build_scene  # noqa: E402
+
+
+def main():
+    """
+    Run the benchmark and print the results.
+
+    Returns
+    -------
+    None.
+
+    """
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--count", type=int, default=20000,
+                                 help="number of shapes")
+    arguments = argument_parser.parse_args()
+
+    image = build_scene(arguments.count)
+    # spread the shapes over a map much bigger than the region
+    for index, shape in enumerate(image.sub_shapes):
+        shape.x_pos = index % 200 * 100
+        shape.y_pos = index // 200 * 100
+    region = (0, 0, 1000, 1000)
+
+    start = time.perf_counter()
+    view = spatial.SceneIndex(image)
+    indexed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    backend = raster.RasterBackend(500, 500)
+    (image.lower_left_x, image.lower_left_y,
+     image.upper_right_x, image.upper_right_y) = region
+    image.draw(backend)
+    everything = time.perf_counter() - start
+
+    start = time.perf_counter()
+    view.draw(raster.RasterBackend(500, 500), region)
+    culled = time.perf_counter() - start
+
+    print(f"shapes:          {len(image.sub_shapes)}")
+    print(f"visible shapes:  {len(view.visible_shapes(region))}")
+    print(f"build index:     {indexed:10.3f}s")
+    print(f"draw all:        {everything:10.3f}s")
+    print(f"draw culled:     {culled:10.3f}s")
+
+
+if __name__ == "__main__":
+    main()
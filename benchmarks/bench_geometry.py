@@ -0,0 +1,53 @@
+"""
+Benchmark for the outlines calculated in bulk by the geometry-module.
+
+The outlines of many circles and rectangles are calculated once by recording
+how every single shape is drawn and once for all shapes of a type at once.
+
+Usage: python benchmarks/bench_geometry.py [--count COUNT]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import geometry  # noqa: E402
+from bench_memory import build_scene  # noqa: E402
+
+
+def main():
+    """
+    Run the benchmark and print the results.
+
+    Returns
+    -------
+    None.
+
+    """
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--count", type=int, default=100000,
+                                 help="number of shapes")
+    arguments = argument_parser.parse_args()
+
+    shape_list = build_scene(arguments.count).sub_shapes
+
+    start = time.perf_counter()
+    for shape in shape_list:
+        geometry.recorded_outline(shape)
+    recorded = time.perf_counter() - start
+
+    start = time.perf_counter()
+    geometry.outlines(shape_list)
+    vectorized = time.perf_counter() - start
+
+    print(f"shapes:      {len(shape_list)}")
+    print(f"one by one:  {recorded:10.3f}s")
+    print(f"in bulk:     {vectorized:10.3f}s")
+    print(f"speedup:     {recorded / vectorized:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
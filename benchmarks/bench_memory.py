@@ -0,0 +1,81 @@
+"""
+Benchmark for the memory needed by the shapes.
+
+One million circles and rectangles are created and appended to an image,
+just like the parser does. The memory allocated for them is measured with
+tracemalloc and printed as total and per shape.
+
+Usage: python benchmarks/bench_memory.py [--count COUNT]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import shapes  # noqa: E402
+
+
+def build_scene(count: int):
+    """
+    Build an image containing the given number of shapes.
+
+    Parameters
+    ----------
+    count : int
+        Number of shapes, half of them circles and half rectangles.
+
+    Returns
+    -------
+    Image
+        The image with all shapes.
+
+    """
+    image = shapes.get_shape("image")
+    for index in range(count):
+        if index % 2:
+            shape = shapes.get_shape("circle")
+            shape.set_attribute("radius", str(index % 50))
+        else:
+            shape = shapes.get_shape("rectangle")
+            shape.set_attribute("width", str(index % 40))
+            shape.set_attribute("height", str(index % 30))
+        shape.set_attribute("x_pos", str(index % 1000))
+        shape.set_attribute("y_pos", str(index % 997))
+        shape.set_attribute("fill_color", "red")
+        image.append_shape(shape)
+    return image
+
+
+def main():
+    """
+    Run the benchmark and print the results.
+
+    Returns
+    -------
+    None.
+
+    """
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--count", type=int, default=1000000,
+                                 help="number of shapes")
+    arguments = argument_parser.parse_args()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    image = build_scene(arguments.count)
+    seconds = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"shapes:          {len(image.sub_shapes)}")
+    print(f"seconds:         {seconds:.3f}")
+    print(f"megabytes:       {current / 1024 / 1024:.1f}")
+    print(f"bytes per shape: {current / len(image.sub_shapes):.1f}")
+
+
+if __name__ == "__main__":
+    main()
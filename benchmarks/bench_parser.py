@@ -0,0 +1,90 @@
+"""
+Benchmark for the single-pass TML-parser.
+
+Synthetic scenes from 1 KB up to 100 MB are parsed and the throughput is
+printed for every size. With a linear parser the throughput stays about the
+same for all sizes.
+
+Usage: python benchmarks/bench_parser.py [--max-size MEGABYTES]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import tml_parser  # noqa: E402
+
+
+SHAPE = """    <rectangle>
+        <x_pos>{x}</x_pos>
+        <y_pos>{y}</y_pos>
+        <height>{size}</height>
+        <width>{size}</width>
+        <fill_color>red</fill_color>
+        <circle>
+            <x_pos>{x}</x_pos>
+            <y_pos>{y}</y_pos>
+            <radius>{size}</radius>
+        </circle>
+    </rectangle>
+"""
+
+
+def generate_scene(size: int):
+    """
+    Generate a TML-text of about the given size in bytes.
+
+    Parameters
+    ----------
+    size : int
+        Wanted size of the text in bytes.
+
+    Returns
+    -------
+    str
+        The generated TML-text.
+
+    """
+    parts = ["<image>\n"]
+    length = len(parts[0])
+    index = 0
+    while length < size:
+        part = SHAPE.format(x=index % 1000, y=index % 997, size=index % 50)
+        parts.append(part)
+        length += len(part)
+        index += 1
+    parts.append("</image>\n")
+    return "".join(parts)
+
+
+def main():
+    """
+    Run the benchmark and print the results.
+
+    Returns
+    -------
+    None.
+
+    """
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--max-size", type=float, default=100,
+                                 help="biggest scene in megabytes")
+    arguments = argument_parser.parse_args()
+
+    print(f"{'size':>12} {'seconds':>10} {'MB/s':>8}")
+    size = 1024
+    while size <= arguments.max_size * 1024 * 1024:
+        text = generate_scene(size)
+        start = time.perf_counter()
+        tml_parser.parse(text)
+        seconds = time.perf_counter() - start
+        print(f"{len(text):>12} {seconds:>10.4f} "
+              f"{len(text) / seconds / 1024 / 1024:>8.2f}")
+        size *= 10
+
+
+if __name__ == "__main__":
+    main()
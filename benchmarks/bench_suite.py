@@ -0,0 +1,276 @@
+"""
+Benchmark suite measuring the throughput of parsing, validating and rendering.
+
+Synthetic scenes of benchmarks/scenes.py are generated with a fixed seed,
+so every run measures the same work. Every benchmark is repeated and the
+fastest run is kept. The results can be saved as baseline and later runs
+compared to it, a run slower than the tolerance ends with exit code 1.
+Everything runs without a network or a display.
+
+Usage: python benchmarks/bench_suite.py [--scale SCALE] [--repeat COUNT]
+       [--only NAME] [--save FILE] [--baseline FILE] [--tolerance SHARE]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import raster  # noqa: E402
+import tml_columns  # noqa: E402
+import tml_parser  # noqa: E402
+import validator  # noqa: E402
+from scenes import SceneGenerator  # noqa: E402
+
+
+# scenes measured by every benchmark, by their name, with the arguments of
+# the SceneGenerator for a scale of 1
+SCENES = {
+    "flat": {"count": 2000},
+    "nested": {"count": 500, "depth": 4},
+    "sparse": {"count": 2000, "attributes": 0.3, "aliases": True},
+}
+
+# width and height of the rendered pictures in pixels
+PICTURE_SIZE = 512
+
+
+def bench_parse(text: str):
+    """
+    Parse a scene.
+
+    Parameters
+    ----------
+    text : str
+        The TML-text.
+
+    Returns
+    -------
+    None.
+
+    """
+    tml_parser.parse(text)
+
+
+def bench_columns(text: str):
+    """
+    Read the attributes of a scene into columns.
+
+    Parameters
+    ----------
+    text : str
+        The TML-text.
+
+    Returns
+    -------
+    None.
+
+    """
+    tml_columns.ColumnarScene(text)
+
+
+def bench_validate(text: str):
+    """
+    Validate a scene.
+
+    Parameters
+    ----------
+    text : str
+        The TML-text.
+
+    Returns
+    -------
+    None.
+
+    """
+    validator.validate(text)
+
+
+def bench_render(image):
+    """
+    Rasterize a parsed scene.
+
+    Parameters
+    ----------
+    image : Image
+        The parsed scene.
+
+    Returns
+    -------
+    None.
+
+    """
+    image.draw(raster.RasterBackend(PICTURE_SIZE, PICTURE_SIZE))
+
+
+def measure(function, argument, repeat: int) -> float:
+    """
+    Get the time of the fastest of several calls.
+
+    Parameters
+    ----------
+    function : callable
+        The benchmark.
+    argument : object
+        Argument of the benchmark.
+    repeat : int
+        Number of calls.
+
+    Returns
+    -------
+    float
+        Seconds of the fastest call.
+
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(argument)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(scale: float = 1.0, repeat: int = 5, only: str = None) -> dict:
+    """
+    Run all benchmarks.
+
+    Parameters
+    ----------
+    scale : float, optional
+        Factor for the number of shapes of every scene. The default is 1.
+    repeat : int, optional
+        Number of runs of every benchmark. The default is 5.
+    only : str, optional
+        Only run the benchmarks whose name contains this text.
+        The default runs all of them.
+
+    Returns
+    -------
+    dict
+        Results by the name of the benchmark, like 'parse/flat', each with
+        the seconds, the megabytes and the shapes per second.
+
+    """
+    results = dict()
+    for scene_name, scene_arguments in SCENES.items():
+        scene_arguments = dict(scene_arguments)
+        scene_arguments["count"] = max(1, round(scene_arguments["count"]
+                                                * scale))
+        text = SceneGenerator(**scene_arguments).text()
+        image = tml_parser.parse(text)
+        count = scene_arguments["count"] * scene_arguments.get("depth", 1)
+
+        for benchmark, function, argument in (
+                ("parse", bench_parse, text),
+                ("columns", bench_columns, text),
+                ("validate", bench_validate, text),
+                ("render", bench_render, image)):
+            name = f"{benchmark}/{scene_name}"
+            if only is not None and only not in name:
+                continue
+            if function is bench_columns and tml_columns.numpy is None:
+                continue
+            seconds = measure(function, argument, repeat)
+            results[name] = {
+                "seconds": seconds,
+                "megabytes_per_second": len(text) / seconds / 1024 / 1024,
+                "shapes_per_second": count / seconds}
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Find the benchmarks which got slower than a baseline.
+
+    Parameters
+    ----------
+    results : dict
+        Results of this run.
+    baseline : dict
+        Results of an earlier run.
+    tolerance : float
+        Share a benchmark may be slower without being reported.
+
+    Returns
+    -------
+    list
+        Names of the benchmarks which got slower.
+
+    """
+    slower = list()
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        if result["seconds"] > baseline[name]["seconds"] * (1 + tolerance):
+            slower.append(name)
+    return slower
+
+
+def main() -> int:
+    """
+    Run the suite and print the results.
+
+    Returns
+    -------
+    int
+        Exit code, 1 if a benchmark got slower than the baseline.
+
+    """
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--scale", type=float, default=1.0,
+                                 help="factor for the number of shapes")
+    argument_parser.add_argument("--repeat", type=int, default=5,
+                                 help="runs of every benchmark")
+    argument_parser.add_argument("--only",
+                                 help="only run benchmarks containing NAME")
+    argument_parser.add_argument("--save", metavar="FILE",
+                                 help="save the results as baseline")
+    argument_parser.add_argument("--baseline", metavar="FILE",
+                                 help="compare the results to a baseline")
+    argument_parser.add_argument("--tolerance", type=float, default=0.1,
+                                 help="share a benchmark may be slower than "
+                                      "the baseline, default is 0.1")
+    arguments = argument_parser.parse_args()
+
+    results = run(arguments.scale, arguments.repeat, arguments.only)
+
+    baseline = dict()
+    if arguments.baseline is not None:
+        with open(arguments.baseline) as file:
+            saved = json.load(file)
+        if saved["scale"] != arguments.scale:
+            print(f"the baseline was measured with a scale of "
+                  f"{saved['scale']}")
+            return 1
+        baseline = saved["results"]
+
+    print(f"{'benchmark':<18} {'seconds':>10} {'MB/s':>8} {'shapes/s':>10} "
+          f"{'change':>8}")
+    for name, result in results.items():
+        change = ""
+        if name in baseline:
+            ratio = result["seconds"] / baseline[name]["seconds"]
+            change = f"{ratio - 1:+.1%}"
+        print(f"{name:<18} {result['seconds']:>10.4f} "
+              f"{result['megabytes_per_second']:>8.2f} "
+              f"{result['shapes_per_second']:>10.0f} {change:>8}")
+
+    if arguments.save is not None:
+        with open(arguments.save, "w") as file:
+            json.dump({"scale": arguments.scale,
+                       "python": platform.python_version(),
+                       "machine": platform.machine(),
+                       "results": results}, file, indent=2)
+
+    slower = compare(results, baseline, arguments.tolerance)
+    for name in slower:
+        print(f"{name} is slower than the baseline")
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+Benchmark for rendering one big picture in tiles on many processors.
+
+A synthetic scene is rendered into a square picture with 1, 2, 4, ...
+processes up to the number of processors. The time should shrink with every
+process added.
+
+Usage: python benchmarks/bench_tiles.py [--size PIXELS] [--count COUNT]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import tiles  # noqa: E402
+from bench_memory import build_scene  # noqa: E402
+
+
+def main():
+    """
+    Run the benchmark and print the results.
+
+    Returns
+    -------
+    None.
+
+    """
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--size", type=int, default=16384,
+                                 help="width and height of the picture")
+    argument_parser.add_argument("--count", type=int, default=20000,
+                                 help="number of shapes")
+    argument_parser.add_argument("--tile-size", type=int, default=1024,
+                                 help="width and height of the tiles")
+    arguments = argument_parser.parse_args()
+
+    image = build_scene(arguments.count)
+
+    print(f"{'processes':>10} {'seconds':>10}")
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        tiles.render_tiled(image, arguments.size, arguments.size,
+                           arguments.tile_size, workers)
+        print(f"{workers:>10} {time.perf_counter() - start:>10.3f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark comparing the animated turtle with its fast mode.
+
+Every sample is drawn with the animated turtle and in the fast mode, which
+turns off the animation and updates the window only at the end. Both modes
+draw into the same window, which is cleared between the drawings and closed
+once at the end. The drawings are saved as PostScript, so no window has to
+be closed by hand. A display is needed for the turtle.
+
+Usage: python benchmarks/bench_turtle.py [--update-every COUNT] [FILES]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import backends  # noqa: E402
+import tml_parser  # noqa: E402
+
+
+SAMPLES = os.path.join(os.path.dirname(__file__), "..", "samples", "*.tml")
+
+
+def time_drawing(image, backend):
+    """
+    Draw an image and measure the time needed.
+
+    Parameters
+    ----------
+    image : Image
+        The image to draw.
+    backend : TurtleBackend
+        Backend to draw with, which keeps the window open.
+
+    Returns
+    -------
+    float
+        Seconds needed.
+
+    """
+    # the drawing before is removed, which is not measured
+    backends.turtle.getscreen().reset()
+    start = time.perf_counter()
+    image.draw(backend)
+    return time.perf_counter() - start
+
+
+def main():
+    """
+    Run the benchmark and print the results.
+
+    Returns
+    -------
+    None.
+
+    """
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("files", nargs="*",
+                                 help="TML-files, default are the samples")
+    argument_parser.add_argument("--update-every", type=int, default=0,
+                                 help="primitives between two updates in "
+                                      "the fast mode, default is only at "
+                                      "the end")
+    arguments = argument_parser.parse_args()
+
+    print(f"{'file':<20} {'animated':>10} {'fast':>10} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        postscript = os.path.join(directory, "image.ps")
+        # closing the window ends the turtle, so it is only closed at the end
+        animated_backend = backends.TurtleBackend(postscript=postscript,
+                                                  keep_open=True)
+        fast_backend = backends.TurtleBackend(
+            fast=True, update_every=arguments.update_every,
+            postscript=postscript, keep_open=True)
+        try:
+            for file_path in arguments.files or sorted(glob.glob(SAMPLES)):
+                image = tml_parser.read_tml(file_path)
+                animated = time_drawing(image, animated_backend)
+                fast = time_drawing(image, fast_backend)
+                print(f"{os.path.basename(file_path):<20} {animated:>10.3f} "
+                      f"{fast:>10.3f} {animated / fast:>8.1f}")
+        finally:
+            backends.turtle.bye()
+
+
+if __name__ == "__main__":
+    main()
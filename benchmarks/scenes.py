@@ -0,0 +1,294 @@
+"""
+Generator of synthetic TML-scenes for the benchmarks.
+
+Every shape class registered in shapes.py is used, every attribute gets a
+value fitting its name. A scene is described by the number of shapes below
+the image, the depth they are nested to, the share of the attributes which
+are written and a seed, so the same arguments always give the same text.
+
+Usage: python benchmarks/scenes.py OUTPUT [--count COUNT] [--depth DEPTH]
+       [--attributes SHARE] [--aliases] [--size MEGABYTES] [--seed SEED]
+"""
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import shapes  # noqa: E402
+
+
+COLORS = ("red", "green", "blue", "yellow", "cyan", "magenta", "black",
+          "orange", "pink", "purple", "light green", "#336699")
+
+# half of the width and height of the generated images
+EXTENT = 1000
+
+
+def shape_names() -> list:
+    """
+    Get the tags of all shapes, which can be placed inside of an image.
+
+    Definitions and their instances are left out, they need a name.
+
+    Returns
+    -------
+    list
+        Names of the shapes, sorted.
+
+    """
+    return sorted(name for name, shape_class in shapes.SHAPES.items()
+                  if not issubclass(shape_class, (shapes.Image,
+                                                  shapes.Definition,
+                                                  shapes.Use)))
+
+
+def required_attributes(shape_class: type) -> set:
+    """
+    Get the attributes of a shape class, which have no default value.
+
+    Parameters
+    ----------
+    shape_class : type
+        The shape class.
+
+    Returns
+    -------
+    set
+        Names of the attributes, a shape can not be drawn without.
+
+    """
+    shape = shape_class()
+    return {attribute.name for attribute in shape_class.attributes
+            if getattr(shape, attribute.name) is None}
+
+
+def attribute_value(attribute, generator: random.Random) -> str:
+    """
+    Get a random value fitting an attribute.
+
+    Parameters
+    ----------
+    attribute : Attribute
+        The attribute.
+    generator : random.Random
+        Source of the random numbers.
+
+    Returns
+    -------
+    str
+        Text of the value.
+
+    """
+    name = attribute.name
+    if attribute.converter is str:
+        return generator.choice(COLORS)
+    if name.endswith("angle"):
+        return str(generator.randrange(360))
+    if name.endswith("_pos"):
+        return str(generator.randrange(-EXTENT, EXTENT))
+    if name == "border_width":
+        return str(generator.randrange(1, 6))
+    return str(generator.randrange(5, 120))
+
+
+class SceneGenerator():
+    """Writes synthetic TML-scenes piece by piece."""
+
+    def __init__(self, count: int = 1000, depth: int = 1,
+                 attributes: float = 1.0, aliases: bool = False,
+                 size: int = None, seed: int = 0):
+        """
+        Describe a new scene.
+
+        Parameters
+        ----------
+        count : int, optional
+            Number of shapes directly below the image. The default is 1000.
+        depth : int, optional
+            Levels of shapes, every shape below the image contains a chain
+            of depth - 1 nested shapes. The default is 1.
+        attributes : float, optional
+            Share of the optional attributes of every shape, which are
+            written, the others keep their default. Attributes without a
+            default are always written. The default is 1, all of them.
+        aliases : bool, optional
+            If True, the attributes of the image are written by their
+            aliases, like 'llx'. The default is False.
+        size : int, optional
+            If given, shapes are added until the text has at least this
+            size in bytes and count is ignored. The default is None.
+        seed : int, optional
+            Seed of the random numbers. The default is 0.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.count = count
+        self.depth = depth
+        self.attributes = attributes
+        self.aliases = aliases
+        self.size = size
+        self.seed = seed
+
+    def __shape(self, name: str, level: int, indent: int,
+                generator: random.Random) -> str:
+        """
+        Generate the text of a shape and of the shapes nested into it.
+
+        Parameters
+        ----------
+        name : str
+            Tag of the shape.
+        level : int
+            Number of levels still to generate, including this one.
+        indent : int
+            Number of spaces in front of the tags.
+        generator : random.Random
+            Source of the random numbers.
+
+        Returns
+        -------
+        str
+            The text of the shape.
+
+        """
+        space = " " * indent
+        lines = [f"{space}<{name}>\n"]
+        shape_class = shapes.get_shape_class(name)
+        required = required_attributes(shape_class)
+        for attribute in shape_class.attributes:
+            if (attribute.name in required
+                    or generator.random() < self.attributes):
+                lines.append(f"{space}    <{attribute.name}>"
+                             f"{attribute_value(attribute, generator)}"
+                             f"</{attribute.name}>\n")
+        if level > 1:
+            lines.append(self.__shape(generator.choice(shape_names()),
+                                      level - 1, indent + 4, generator))
+        lines.append(f"{space}</{name}>\n")
+        return "".join(lines)
+
+    def __iter__(self):
+        """
+        Generate the text of the scene in pieces.
+
+        Yields
+        ------
+        str
+            The next piece of the text, one shape below the image at a time.
+
+        """
+        generator = random.Random(self.seed)
+        names = shape_names()
+
+        head = ["<image>\n"]
+        for attribute, value in zip(shapes.Image.attributes,
+                                    (-EXTENT, -EXTENT, EXTENT, EXTENT)):
+            tag = attribute.aliases[0] if self.aliases else attribute.name
+            head.append(f"    <{tag}>{value}</{tag}>\n")
+        head = "".join(head)
+        yield head
+
+        length = len(head)
+        index = 0
+        while (index < self.count if self.size is None
+               else length < self.size):
+            # all shape classes take turns, so every one of them is used
+            piece = self.__shape(names[index % len(names)], self.depth, 4,
+                                 generator)
+            length += len(piece)
+            index += 1
+            yield piece
+        yield "</image>\n"
+
+    def text(self) -> str:
+        """
+        Generate the whole text of the scene.
+
+        Returns
+        -------
+        str
+            The TML-text.
+
+        """
+        return "".join(self)
+
+    def write(self, file_path: str):
+        """
+        Write the scene into a file, without keeping it in memory.
+
+        Parameters
+        ----------
+        file_path : str
+            Path of the new .tml file.
+
+        Returns
+        -------
+        None.
+
+        """
+        with open(file_path, "w") as file:
+            for piece in self:
+                file.write(piece)
+
+
+def generate_scene(count: int = 1000, depth: int = 1,
+                   attributes: float = 1.0, aliases: bool = False,
+                   size: int = None, seed: int = 0) -> str:
+    """
+    Generate the text of a synthetic scene.
+
+    The parameters are the ones of SceneGenerator.
+
+    Returns
+    -------
+    str
+        The TML-text.
+
+    """
+    return SceneGenerator(count, depth, attributes, aliases, size,
+                          seed).text()
+
+
+def main():
+    """
+    Write a scene into a file.
+
+    Returns
+    -------
+    None.
+
+    """
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("output", help="path of the new .tml file")
+    argument_parser.add_argument("--count", type=int, default=1000,
+                                 help="number of shapes below the image")
+    argument_parser.add_argument("--depth", type=int, default=1,
+                                 help="levels of nested shapes")
+    argument_parser.add_argument("--attributes", type=float, default=1.0,
+                                 help="share of the attributes written")
+    argument_parser.add_argument("--aliases", action="store_true",
+                                 help="write the attributes of the image "
+                                      "by their aliases")
+    argument_parser.add_argument("--size", type=float,
+                                 help="size of the file in megabytes, "
+                                      "replaces --count")
+    argument_parser.add_argument("--seed", type=int, default=0,
+                                 help="seed of the random numbers")
+    arguments = argument_parser.parse_args()
+
+    size = None
+    if arguments.size is not None:
+        size = int(arguments.size * 1024 * 1024)
+    SceneGenerator(arguments.count, arguments.depth, arguments.attributes,
+                   arguments.aliases, size, arguments.seed).write(
+                       arguments.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""
+Caches used while reading and drawing TML-files.
+"""
+
+import hashlib
+import io
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+
+import tml_parser
+
+
+class LruCache():
+    """
+    A cache of limited size, which forgets the least recently used entries.
+
+    The number of hits and misses is counted, which helps to choose a size.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Create a new, empty cache.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            Number of entries kept at most. The default is 1024.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+
+    def __len__(self):
+        """
+        Get the number of entries.
+
+        Returns
+        -------
+        int
+            Number of entries in the cache.
+
+        """
+        return len(self.__entries)
+
+    def get(self, key, default=None):
+        """
+        Look up an entry and mark it as recently used.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the entry.
+        default : optional
+            Returned if there is no such entry. The default is None.
+
+        Returns
+        -------
+        object
+            The cached value or default.
+
+        """
+        try:
+            value = self.__entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.__entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Add an entry, forgetting the oldest one if the cache is full.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the entry.
+        value : object
+            Value to cache.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__entries[key] = value
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.maxsize:
+            self.__entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Forget all entries and reset the counters.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class SceneCache():
+    """
+    A cache of parsed TML-files, so unchanged files are not parsed again.
+
+    The shapes are found by the hash of the content of the file and the
+    version of the parser, the path and the time of modification are not
+    used. The recently used shapes are kept in memory. If a directory is
+    given, all shapes are pickled into it as well, so they survive the
+    process and can be shared between processes.
+
+    The shapes handed out are shared by all callers and must not be changed.
+    """
+
+    def __init__(self, maxsize: int = 64, directory: str = None):
+        """
+        Create a new, empty cache.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            Number of files kept in memory at most. The default is 64.
+        directory : str, optional
+            Directory for the pickled shapes. The default keeps them only in
+            memory.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.memory = LruCache(maxsize)
+        self.directory = directory
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def key(self, data: bytes) -> str:
+        """
+        Get the key of the content of a file.
+
+        Parameters
+        ----------
+        data : bytes
+            Content of the file.
+
+        Returns
+        -------
+        str
+            Hexadecimal hash of the content and the version of the parser.
+
+        """
+        digest = hashlib.sha256(data)
+        digest.update(f"\0{tml_parser.PARSER_VERSION}".encode())
+        return digest.hexdigest()
+
+    def read_tml(self, file_path: str):
+        """
+        Read the given TML-file, parsing it only if it is not cached.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the File.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a valid TML.
+
+        Returns
+        -------
+        Shape
+            The root shape of the file.
+
+        """
+        with open(file_path, "rb") as file:
+            data = file.read()
+        key = self.key(data)
+
+        shape = self.memory.get(key)
+        if shape is not None:
+            self.hits += 1
+            return shape
+
+        shape = self.__load(key)
+        if shape is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            # decoded just like a file opened in text mode
+            shape = tml_parser.parse(io.TextIOWrapper(io.BytesIO(data)).read())
+            self.__store(key, shape)
+        self.memory.put(key, shape)
+        return shape
+
+    def clear(self):
+        """
+        Forget all shapes in memory and reset the counters.
+
+        The pickled shapes are kept.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.memory.clear()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __path(self, key: str) -> str:
+        """
+        Get the path of the pickled shapes.
+
+        Parameters
+        ----------
+        key : str
+            Key of the file.
+
+        Returns
+        -------
+        str
+            Path inside of the directory.
+
+        """
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def __load(self, key: str):
+        """
+        Load pickled shapes from the directory.
+
+        Parameters
+        ----------
+        key : str
+            Key of the file.
+
+        Returns
+        -------
+        Shape
+            The root shape or None, if it was not found or can not be read.
+            A file which can not be unpickled is deleted.
+
+        """
+        if self.directory is None:
+            return None
+        path = self.__path(key)
+        try:
+            file = open(path, "rb")
+        except OSError:
+            return None
+        try:
+            with file:
+                return pickle.load(file)
+        except Exception:
+            # unpickling a damaged or outdated file can raise nearly any
+            # error, it is removed and the text simply parsed again
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def __store(self, key: str, shape):
+        """
+        Pickle shapes into the directory.
+
+        The file is written under a temporary name of its own first, so other
+        processes and threads never read a half written file. A shape, which
+        can not be pickled, like a very deep tree, is only kept in memory.
+
+        Parameters
+        ----------
+        key : str
+            Key of the file.
+        shape : Shape
+            The root shape.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.directory is None:
+            return
+        temporary_path = None
+        try:
+            with tempfile.NamedTemporaryFile(dir=self.directory,
+                                             prefix=f"{key}.",
+                                             suffix=".tmp",
+                                             delete=False) as file:
+                temporary_path = file.name
+                pickle.dump(shape, file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, self.__path(key))
+        except Exception:
+            # failing to store the shape must not fail reading the file
+            if temporary_path is not None:
+                try:
+                    os.remove(temporary_path)
+                except OSError:
+                    pass
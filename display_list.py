@@ -0,0 +1,586 @@
+"""
+Compile shapes into a flat display list of primitive draw commands.
+
+Drawing a display list only replays the recorded primitives, none of the
+geometry of the shapes is calculated again. The commands are kept in two
+arrays, one for the operations and one for their numeric arguments. Colors
+and pens are interned in a palette and only referenced by their index. Every
+display list has a palette of its own, the indices of a compiled shape are
+translated when it is added to an image, so no palette grows for the whole
+life of the process.
+"""
+
+from array import array
+
+import backends
+import cache
+import shapes
+
+
+# operations of a display list and the number of their arguments
+PEN = 0
+MOVE = 1
+LINE = 2
+ARC = 3
+FILL_BEGIN = 4
+FILL_END = 5
+
+ARGUMENT_COUNTS = (1, 2, 2, 7, 2, 1)
+
+
+class Palette():
+    """Interned colors and pens, which are referenced by their index."""
+
+    def __init__(self):
+        """
+        Create a new, empty palette.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.values = list()
+        self.__indices = dict()
+
+    def intern(self, value):
+        """
+        Get the index of a value, adding it if it is new.
+
+        Parameters
+        ----------
+        value : str or tuple
+            A color or a pen as (color, width).
+
+        Returns
+        -------
+        int
+            Index of the value.
+
+        """
+        index = self.__indices.get(value)
+        if index is None:
+            index = len(self.values)
+            self.values.append(value)
+            self.__indices[value] = index
+        return index
+
+    def __getstate__(self):
+        """
+        Get the state for pickling, the indices are built again on loading.
+
+        Returns
+        -------
+        list
+            The interned values.
+
+        """
+        return self.values
+
+    def __setstate__(self, values):
+        """
+        Restore the palette after unpickling.
+
+        Parameters
+        ----------
+        values : list
+            The interned values.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.values = values
+        self.__indices = {value: index for index, value in enumerate(values)}
+
+
+class DisplayList():
+    """A flat list of primitive draw commands."""
+
+    def __init__(self, palette: Palette = None):
+        """
+        Create a new, empty display list.
+
+        Parameters
+        ----------
+        palette : Palette, optional
+            Palette for colors and pens. The default is a new palette.
+
+        Returns
+        -------
+        None.
+
+        """
+        if palette is None:
+            palette = Palette()
+        self.palette = palette
+        self.operations = array("B")
+        self.arguments = array("d")
+        # arguments, which are indices into the palette
+        self.references = array("q")
+        # start of every shape as index into operations and arguments
+        self.shape_operations = array("q")
+        self.shape_arguments = array("q")
+        self.image = None
+
+    def __len__(self):
+        """
+        Get the number of operations.
+
+        Returns
+        -------
+        int
+            Number of operations.
+
+        """
+        return len(self.operations)
+
+    def add(self, operation: int, *arguments):
+        """
+        Append an operation.
+
+        Parameters
+        ----------
+        operation : int
+            One of the operations like LINE.
+        *arguments : float
+            Arguments of the operation.
+
+        Returns
+        -------
+        None.
+
+        """
+        if operation == PEN or operation == FILL_END:
+            self.references.append(len(self.arguments))
+        self.operations.append(operation)
+        self.arguments.extend(arguments)
+
+    def add_shape(self, fragment):
+        """
+        Append the display list of a single shape.
+
+        Parameters
+        ----------
+        fragment : DisplayList
+            Compiled shape, its colors and pens are added to the palette of
+            this display list.
+
+        Returns
+        -------
+        None.
+
+        """
+        start = len(self.arguments)
+        self.shape_operations.append(len(self.operations))
+        self.shape_arguments.append(start)
+        self.operations.extend(fragment.operations)
+        self.arguments.extend(fragment.arguments)
+        if fragment.palette is not self.palette:
+            arguments = self.arguments
+            values = fragment.palette.values
+            intern = self.palette.intern
+            for reference in fragment.references:
+                arguments[start + reference] = intern(
+                    values[int(fragment.arguments[reference])])
+        self.references.extend(start + reference
+                               for reference in fragment.references)
+
+    def shape_range(self, index: int):
+        """
+        Get where the operations of a shape start and end.
+
+        Parameters
+        ----------
+        index : int
+            Index of the shape.
+
+        Returns
+        -------
+        tuple
+            (first operation, end of operations, first argument).
+
+        """
+        start = self.shape_operations[index]
+        if index + 1 < len(self.shape_operations):
+            end = self.shape_operations[index + 1]
+        else:
+            end = len(self.operations)
+        return start, end, self.shape_arguments[index]
+
+    def replay(self, backend, start: int = 0, end: int = None,
+               argument: int = 0):
+        """
+        Hand the operations to the primitives of a backend.
+
+        Parameters
+        ----------
+        backend : Backend
+            Backend to draw with.
+        start : int, optional
+            First operation to replay. The default is 0.
+        end : int, optional
+            End of the operations to replay. The default is all of them.
+        argument : int, optional
+            Index of the first argument of the first operation.
+            The default is 0.
+
+        Returns
+        -------
+        None.
+
+        """
+        arguments = self.arguments
+        values = self.palette.values
+        for operation in self.operations[start:end]:
+            if operation == LINE:
+                backend.line_to(arguments[argument], arguments[argument + 1])
+                argument += 2
+            elif operation == MOVE:
+                backend.move_to(arguments[argument], arguments[argument + 1])
+                argument += 2
+            elif operation == ARC:
+                backend.arc_to(*arguments[argument:argument + 7])
+                argument += 7
+            elif operation == PEN:
+                backend.set_pen(*values[int(arguments[argument])])
+                argument += 1
+            elif operation == FILL_BEGIN:
+                backend.fill_begin(arguments[argument],
+                                   arguments[argument + 1])
+                argument += 2
+            else:
+                backend.fill_end(values[int(arguments[argument])])
+                argument += 1
+
+    def replay_shape(self, backend, index: int):
+        """
+        Hand the operations of a single shape to a backend.
+
+        Parameters
+        ----------
+        backend : Backend
+            Backend to draw with.
+        index : int
+            Index of the shape.
+
+        Returns
+        -------
+        None.
+
+        """
+        start, end, argument = self.shape_range(index)
+        self.replay(backend, start, end, argument)
+
+    def draw(self, backend=None):
+        """
+        Draw the compiled image.
+
+        Parameters
+        ----------
+        backend : Backend, optional
+            Backend to draw with. The default draws with the turtle.
+
+        Returns
+        -------
+        None.
+
+        """
+        if backend is None:
+            backend = backends.TurtleBackend()
+        backend.begin_image(self.image)
+        self.replay(backend)
+        backend.end_image(self.image)
+
+
+class Recorder(backends.Backend):
+    """Backend recording all primitives into a display list."""
+
+    def __init__(self, display_list: DisplayList):
+        """
+        Generate a new recorder.
+
+        Parameters
+        ----------
+        display_list : DisplayList
+            The display list the primitives are appended to.
+
+        Returns
+        -------
+        None.
+
+        """
+        super().__init__()
+        self.display_list = display_list
+
+    def set_pen(self, color: str, width: float):
+        """
+        Record a change of the pen.
+
+        Parameters
+        ----------
+        color : str
+            Name of the color.
+        width : float
+            Width of the pen.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.display_list.add(PEN,
+                              self.display_list.palette.intern((color, width)))
+
+    def move_to(self, x: float, y: float):
+        """
+        Record a move without drawing.
+
+        Parameters
+        ----------
+        x : float
+            Target x-coordinate.
+        y : float
+            Target y-coordinate.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.display_list.add(MOVE, x, y)
+
+    def line_to(self, x: float, y: float):
+        """
+        Record a straight line.
+
+        Parameters
+        ----------
+        x : float
+            Target x-coordinate.
+        y : float
+            Target y-coordinate.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.display_list.add(LINE, x, y)
+
+    def arc_to(self, center_x: float, center_y: float, radius: float,
+               start: float, sweep: float, x: float, y: float):
+        """
+        Record an arc.
+
+        Parameters
+        ----------
+        center_x : float
+            X-coordinate of the center.
+        center_y : float
+            Y-coordinate of the center.
+        radius : float
+            Radius of the arc, always positive.
+        start : float
+            Angle in degrees from the center to the current position.
+        sweep : float
+            Angle in degrees the arc covers, positive is counterclockwise.
+        x : float
+            X-coordinate of the end of the arc.
+        y : float
+            Y-coordinate of the end of the arc.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.display_list.add(ARC, center_x, center_y, radius,
+                              start, sweep, x, y)
+
+    def fill_begin(self, x: float, y: float):
+        """
+        Record the start of a filled area.
+
+        Parameters
+        ----------
+        x : float
+            X-coordinate of the first point of the area.
+        y : float
+            Y-coordinate of the first point of the area.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.display_list.add(FILL_BEGIN, x, y)
+
+    def fill_end(self, color: str):
+        """
+        Record the filling of an area.
+
+        Parameters
+        ----------
+        color : str
+            Name of the color to fill with.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.display_list.add(FILL_END,
+                              self.display_list.palette.intern(color))
+
+
+def shape_key(shape):
+    """
+    Get a key describing the shape with all its attributes and subshapes.
+
+    Shapes with the same key are drawn exactly the same way.
+
+    Parameters
+    ----------
+    shape : Shape
+        The shape.
+
+    Returns
+    -------
+    tuple
+        A hashable key.
+
+    """
+    if isinstance(shape, shapes.Use):
+        # an instance looks like its defined shape with some attributes
+        # replaced, whatever the name of the definition is
+        return (shapes.Use, shape.overrides,
+                shape_key(shape.definition.shape))
+    attributes = tuple(getattr(shape, attribute.name, None)
+                       for attribute in shape.attributes)
+    return (type(shape), attributes,
+            tuple(shape_key(sub_shape) for sub_shape in shape.sub_shapes))
+
+
+# compiled shapes, shared by all images
+FRAGMENTS = cache.LruCache(maxsize=4096)
+
+
+def compile_shape(shape, fragments: cache.LruCache = FRAGMENTS):
+    """
+    Compile a single shape and its subshapes.
+
+    Parameters
+    ----------
+    shape : Shape
+        The shape to compile.
+    fragments : LruCache, optional
+        Cache of compiled shapes, the shape is only compiled if it is not
+        found in there. None disables the cache. The default is a cache
+        shared by all images.
+
+    Returns
+    -------
+    DisplayList
+        The compiled shape.
+
+    """
+    if fragments is not None:
+        key = shape_key(shape)
+        fragment = fragments.get(key)
+        if fragment is not None:
+            return fragment
+
+    fragment = None
+    if isinstance(shape, shapes.Use):
+        fragment = _moved_instance(shape, fragments)
+    if fragment is None:
+        fragment = DisplayList()
+        shape.draw(Recorder(fragment))
+
+    if fragments is not None:
+        fragments.put(key, fragment)
+    return fragment
+
+
+# arguments of the operations, which are x- and y-coordinates
+COORDINATES = {MOVE: ((0, 1),), LINE: ((0, 1),), FILL_BEGIN: ((0, 1),),
+               ARC: ((0, 1), (5, 6))}
+
+
+def _moved_instance(instance, fragments: cache.LruCache):
+    """
+    Compile an instance, which only moves its definition, without drawing.
+
+    The compiled defined shape is shared by all such instances, only its
+    coordinates are moved.
+
+    Parameters
+    ----------
+    instance : Use
+        The instance.
+    fragments : LruCache
+        Cache of compiled shapes or None.
+
+    Returns
+    -------
+    DisplayList
+        The compiled instance or None, if the instance replaces other
+        attributes than the position or the defined shape has subshapes,
+        which are not moved with it.
+
+    """
+    shape = instance.definition.shape
+    overrides = dict(instance.overrides)
+    if (not overrides.keys() <= {"x_pos", "y_pos"} or shape.sub_shapes
+            or shape.x_pos is None or shape.y_pos is None):
+        return None
+    move_x = overrides.get("x_pos", shape.x_pos) - shape.x_pos
+    move_y = overrides.get("y_pos", shape.y_pos) - shape.y_pos
+
+    defined = compile_shape(shape, fragments)
+    fragment = DisplayList(defined.palette)
+    fragment.operations = array("B", defined.operations)
+    fragment.references = array("q", defined.references)
+    arguments = fragment.arguments = array("d", defined.arguments)
+    argument = 0
+    for operation in defined.operations:
+        for x, y in COORDINATES.get(operation, ()):
+            arguments[argument + x] += move_x
+            arguments[argument + y] += move_y
+        argument += ARGUMENT_COUNTS[operation]
+    return fragment
+
+
+def compile_image(image, fragments: cache.LruCache = FRAGMENTS):
+    """
+    Compile an image into a display list.
+
+    Parameters
+    ----------
+    image : Image
+        The image to compile.
+    fragments : LruCache, optional
+        Cache of compiled shapes. None disables the cache. The default is a
+        cache shared by all images.
+
+    Returns
+    -------
+    DisplayList
+        The compiled image, which can be drawn without the shapes.
+
+    """
+    display_list = DisplayList()
+
+    # the backends only need the settings of the image, not its shapes
+    display_list.image = shapes.Image()
+    display_list.image.lower_left_x = image.lower_left_x
+    display_list.image.lower_left_y = image.lower_left_y
+    display_list.image.upper_right_x = image.upper_right_x
+    display_list.image.upper_right_y = image.upper_right_y
+    display_list.image.background_color = image.background_color
+
+    for shape in image.sub_shapes:
+        display_list.add_shape(compile_shape(shape, fragments))
+    return display_list
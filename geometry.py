@@ -0,0 +1,725 @@
+"""
+Vertices of the outlines of shapes, calculated in bulk with NumPy.
+
+The shapes draw themselves step by step with the turtle. Here the corners of
+the simple shapes are calculated directly from their attributes, for many
+shapes of the same type at once. Circles and arcs are split into as many
+lines as their radius needs, so the lines never leave the real arc by more
+than a tolerance. Shapes without a formula, like the rose, are drawn into a
+recorder once and only their arcs are calculated here.
+
+Many outlines of different lengths are returned as one array of points and
+an array of offsets, the points of outline i are points[offsets[i]:
+offsets[i + 1]].
+
+NumPy is needed by all functions of this module.
+"""
+
+import copy
+import math
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import backends
+import shapes
+
+
+def _require_numpy():
+    """
+    Make sure NumPy can be used.
+
+    Raises
+    ------
+    ImportError
+        If NumPy is not installed.
+
+    Returns
+    -------
+    None.
+
+    """
+    if numpy is None:
+        raise ImportError("the geometry-module needs NumPy, which is missing")
+
+
+def _column(shape_list: list, name: str):
+    """
+    Collect an attribute of many shapes into an array.
+
+    Parameters
+    ----------
+    shape_list : list
+        The shapes.
+    name : str
+        Name of the attribute.
+
+    Returns
+    -------
+    ndarray
+        The values as floats.
+
+    """
+    return numpy.array([getattr(shape, name) for shape in shape_list],
+                       dtype=float)
+
+
+def arc_steps(radius, sweep, tolerance: float = 0.25):
+    """
+    Get the number of lines needed for arcs.
+
+    Parameters
+    ----------
+    radius : array_like
+        Radius of every arc.
+    sweep : array_like
+        Angle in degrees every arc covers.
+    tolerance : float, optional
+        Largest distance between the lines and the real arc.
+        The default is 0.25.
+
+    Returns
+    -------
+    ndarray
+        Number of lines for every arc, at least 1.
+
+    """
+    _require_numpy()
+    radius = numpy.abs(numpy.asarray(radius, dtype=float))
+    # every line may cover this angle to stay within the tolerance
+    step = numpy.full(radius.shape, math.pi / 2)
+    large = radius > tolerance
+    step[large] = 2 * numpy.arccos(1 - tolerance / radius[large])
+    steps = numpy.ceil(numpy.radians(numpy.abs(sweep)) / step)
+    return numpy.maximum(steps, 1).astype(numpy.int64)
+
+
+def arcs(center_x, center_y, radius, start, sweep, tolerance: float = 0.25):
+    """
+    Split many arcs into points, which can be connected by straight lines.
+
+    Parameters
+    ----------
+    center_x : array_like
+        X-coordinate of the center of every arc.
+    center_y : array_like
+        Y-coordinate of the center of every arc.
+    radius : array_like
+        Radius of every arc.
+    start : array_like
+        Angle in degrees from the center to the start of every arc.
+    sweep : array_like
+        Angle in degrees every arc covers, positive is counterclockwise.
+    tolerance : float, optional
+        Largest distance between the lines and the real arcs.
+        The default is 0.25.
+
+    Returns
+    -------
+    points : ndarray
+        The points of all arcs including their starting points, shaped
+        (number of points, 2).
+    offsets : ndarray
+        Index of the first point of every arc and the number of points at
+        the end.
+
+    """
+    _require_numpy()
+    center_x, center_y, radius, start, sweep = numpy.broadcast_arrays(
+        *(numpy.asarray(value, dtype=float).ravel()
+          for value in (center_x, center_y, radius, start, sweep)))
+    steps = arc_steps(radius, sweep, tolerance)
+    offsets = numpy.zeros(len(steps) + 1, dtype=numpy.int64)
+    numpy.cumsum(steps + 1, out=offsets[1:])
+
+    # index of every point inside of its arc
+    counts = steps + 1
+    index = numpy.arange(offsets[-1]) - numpy.repeat(offsets[:-1], counts)
+    angles = numpy.radians(numpy.repeat(start, counts)
+                           + numpy.repeat(sweep / steps, counts) * index)
+    radii = numpy.repeat(radius, counts)
+
+    points = numpy.empty((offsets[-1], 2))
+    points[:, 0] = numpy.repeat(center_x, counts) + radii * numpy.cos(angles)
+    points[:, 1] = numpy.repeat(center_y, counts) + radii * numpy.sin(angles)
+    return points, offsets
+
+
+def _directions(angle):
+    """
+    Get the directions of headings.
+
+    Parameters
+    ----------
+    angle : ndarray
+        Headings in degrees.
+
+    Returns
+    -------
+    tuple
+        (cosine, sine) of the headings, a step forward goes along them.
+
+    """
+    angle = numpy.radians(angle)
+    return numpy.cos(angle), numpy.sin(angle)
+
+
+def lines(x, y, length, angle):
+    """
+    Get the ends of many lines.
+
+    Parameters
+    ----------
+    x, y : array_like
+        Starting points of the lines.
+    length : array_like
+        Lengths of the lines.
+    angle : array_like
+        Headings of the lines in degrees.
+
+    Returns
+    -------
+    ndarray
+        The points shaped (number of lines, 2, 2).
+
+    """
+    _require_numpy()
+    x, y, length, angle = numpy.broadcast_arrays(
+        *(numpy.asarray(value, dtype=float) for value in (x, y, length,
+                                                          angle)))
+    cos, sin = _directions(angle)
+    points = numpy.empty(x.shape + (2, 2))
+    points[..., 0, 0] = x
+    points[..., 0, 1] = y
+    points[..., 1, 0] = x + length * cos
+    points[..., 1, 1] = y + length * sin
+    return points
+
+
+def parallelograms(x, y, length, side_length, lower_right_angle, angle):
+    """
+    Get the corners of many parallelograms.
+
+    Parameters
+    ----------
+    x, y : array_like
+        Lower left corners.
+    length : array_like
+        Lengths of the lower sides.
+    side_length : array_like
+        Lengths of the other sides.
+    lower_right_angle : array_like
+        Angles in degrees the turtle turns at the lower right corners.
+    angle : array_like
+        Headings of the lower sides in degrees.
+
+    Returns
+    -------
+    ndarray
+        The corners counterclockwise from the lower left one, shaped
+        (number of shapes, 4, 2).
+
+    """
+    _require_numpy()
+    x, y, length, side_length, lower_right_angle, angle = (
+        numpy.broadcast_arrays(*(numpy.asarray(value, dtype=float)
+                                 for value in (x, y, length, side_length,
+                                               lower_right_angle, angle))))
+    cos, sin = _directions(angle)
+    side_cos, side_sin = _directions(angle + lower_right_angle)
+    points = numpy.empty(x.shape + (4, 2))
+    points[..., 0, 0] = x
+    points[..., 0, 1] = y
+    points[..., 1, 0] = x + length * cos
+    points[..., 1, 1] = y + length * sin
+    points[..., 2, 0] = points[..., 1, 0] + side_length * side_cos
+    points[..., 2, 1] = points[..., 1, 1] + side_length * side_sin
+    points[..., 3, 0] = x + side_length * side_cos
+    points[..., 3, 1] = y + side_length * side_sin
+    return points
+
+
+def rectangles(x, y, width, height, angle):
+    """
+    Get the corners of many rectangles.
+
+    Parameters
+    ----------
+    x, y : array_like
+        Lower left corners.
+    width : array_like
+        Widths of the rectangles.
+    height : array_like
+        Heights of the rectangles.
+    angle : array_like
+        Headings of the lower sides in degrees.
+
+    Returns
+    -------
+    ndarray
+        The corners counterclockwise from the lower left one, shaped
+        (number of shapes, 4, 2).
+
+    """
+    return parallelograms(x, y, width, height, 90, angle)
+
+
+def triangles(x, y, length, height, angle):
+    """
+    Get the corners of many isosceles triangles.
+
+    Parameters
+    ----------
+    x, y : array_like
+        Left corners of the bases.
+    length : array_like
+        Lengths of the bases.
+    height : array_like
+        Heights of the triangles.
+    angle : array_like
+        Headings of the bases in degrees.
+
+    Returns
+    -------
+    ndarray
+        The corners counterclockwise from the left one, shaped
+        (number of shapes, 3, 2).
+
+    """
+    _require_numpy()
+    x, y, length, height, angle = numpy.broadcast_arrays(
+        *(numpy.asarray(value, dtype=float)
+          for value in (x, y, length, height, angle)))
+    cos, sin = _directions(angle)
+    points = numpy.empty(x.shape + (3, 2))
+    points[..., 0, 0] = x
+    points[..., 0, 1] = y
+    points[..., 1, 0] = x + length * cos
+    points[..., 1, 1] = y + length * sin
+    # the top lies above the middle of the base
+    points[..., 2, 0] = x + length / 2 * cos - height * sin
+    points[..., 2, 1] = y + length / 2 * sin + height * cos
+    return points
+
+
+def circles(x, y, radius, angle, tolerance: float = 0.25):
+    """
+    Split many circles into points, placed like the circle-shape does.
+
+    The turtle starts at (x + radius, y) with the given heading and the
+    center lies radius units to its left.
+
+    Parameters
+    ----------
+    x, y : array_like
+        Positions of the circles.
+    radius : array_like
+        Radii of the circles.
+    angle : array_like
+        Headings of the turtle in degrees.
+    tolerance : float, optional
+        Largest distance between the lines and the real circles.
+        The default is 0.25.
+
+    Returns
+    -------
+    points : ndarray
+        The points of all circles, the first point of every circle is
+        repeated at its end.
+    offsets : ndarray
+        Index of the first point of every circle and the number of points at
+        the end.
+
+    """
+    _require_numpy()
+    x, y, radius, angle = numpy.broadcast_arrays(
+        *(numpy.asarray(value, dtype=float) for value in (x, y, radius,
+                                                          angle)))
+    cos, sin = _directions(angle)
+    center_x = x + radius - radius * sin
+    center_y = y + radius * cos
+    # with a negative radius the center lies to the right and the turtle
+    # turns clockwise
+    start = angle - 90 * numpy.sign(radius)
+    return arcs(center_x, center_y, numpy.abs(radius), start,
+                360 * numpy.sign(radius), tolerance)
+
+
+class _PathRecorder(backends.Backend):
+    """Backend collecting the lines drawn as arrays of points."""
+
+    def __init__(self, tolerance: float):
+        """
+        Generate a new recorder.
+
+        Parameters
+        ----------
+        tolerance : float
+            Largest distance between the lines and the real arcs.
+
+        Returns
+        -------
+        None.
+
+        """
+        super().__init__()
+        self.tolerance = tolerance
+        self.paths = list()
+        self.__path = None
+
+    def set_pen(self, color: str, width: float):
+        """
+        Ignore the pen, only the points are recorded.
+
+        Parameters
+        ----------
+        color : str
+            Name of the color.
+        width : float
+            Width of the pen.
+
+        Returns
+        -------
+        None.
+
+        """
+
+    def move_to(self, x: float, y: float):
+        """
+        Start a new path at the given position.
+
+        Parameters
+        ----------
+        x : float
+            Target x-coordinate.
+        y : float
+            Target y-coordinate.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__path = [numpy.array([[x, y]])]
+        self.paths.append(self.__path)
+
+    def line_to(self, x: float, y: float):
+        """
+        Add a point to the current path.
+
+        Parameters
+        ----------
+        x : float
+            Target x-coordinate.
+        y : float
+            Target y-coordinate.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.__path is None:
+            self.move_to(self.x, self.y)
+        self.__path.append(numpy.array([[x, y]]))
+
+    def arc_to(self, center_x: float, center_y: float, radius: float,
+               start: float, sweep: float, x: float, y: float):
+        """
+        Add the points of an arc to the current path.
+
+        Parameters
+        ----------
+        center_x : float
+            X-coordinate of the center.
+        center_y : float
+            Y-coordinate of the center.
+        radius : float
+            Radius of the arc, always positive.
+        start : float
+            Angle in degrees from the center to the current position.
+        sweep : float
+            Angle in degrees the arc covers, positive is counterclockwise.
+        x : float
+            X-coordinate of the end of the arc.
+        y : float
+            Y-coordinate of the end of the arc.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.__path is None:
+            self.move_to(self.x, self.y)
+        points, _ = arcs(center_x, center_y, radius, start, sweep,
+                         self.tolerance)
+        self.__path.append(points[1:])
+
+    def fill_begin(self, x: float, y: float):
+        """
+        Ignore the start of a filled area.
+
+        Parameters
+        ----------
+        x : float
+            X-coordinate of the first point of the area.
+        y : float
+            Y-coordinate of the first point of the area.
+
+        Returns
+        -------
+        None.
+
+        """
+
+    def fill_end(self, color: str):
+        """
+        Ignore the end of a filled area.
+
+        Parameters
+        ----------
+        color : str
+            Name of the color to fill with.
+
+        Returns
+        -------
+        None.
+
+        """
+
+
+def recorded_outline(shape, tolerance: float = 0.25) -> list:
+    """
+    Get the outline of any shape by recording how it is drawn.
+
+    Parameters
+    ----------
+    shape : Shape
+        The shape, its subshapes are not drawn.
+    tolerance : float, optional
+        Largest distance between the lines and the real arcs.
+        The default is 0.25.
+
+    Returns
+    -------
+    list
+        An array of points shaped (number of points, 2) for every connected
+        line drawn.
+
+    """
+    _require_numpy()
+    alone = copy.copy(shape)
+    alone.sub_shapes = ()
+    recorder = _PathRecorder(tolerance)
+    alone.draw(recorder)
+    return [numpy.concatenate(path) for path in recorder.paths
+            if len(path) > 1]
+
+
+def __split(points, offsets) -> list:
+    """
+    Split the points of many outlines into one array for every outline.
+
+    Parameters
+    ----------
+    points : ndarray
+        Points of all outlines.
+    offsets : ndarray
+        Index of the first point of every outline.
+
+    Returns
+    -------
+    list
+        The points of every outline.
+
+    """
+    return numpy.split(points, offsets[1:-1])
+
+
+def __circle_outlines(shape_list: list, tolerance: float) -> list:
+    """
+    Get the outlines of many circles.
+
+    Parameters
+    ----------
+    shape_list : list
+        The circles.
+    tolerance : float
+        Largest distance between the lines and the real arcs.
+
+    Returns
+    -------
+    list
+        The points of every circle.
+
+    """
+    return __split(*circles(_column(shape_list, "x_pos"),
+                            _column(shape_list, "y_pos"),
+                            _column(shape_list, "radius"),
+                            _column(shape_list, "angle"), tolerance))
+
+
+def __line_outlines(shape_list: list, tolerance: float) -> list:
+    """
+    Get the outlines of many lines.
+
+    Parameters
+    ----------
+    shape_list : list
+        The lines.
+    tolerance : float
+        Largest distance between the lines and the real arcs.
+
+    Returns
+    -------
+    list
+        The two ends of every line.
+
+    """
+    return list(lines(_column(shape_list, "x_pos"),
+                      _column(shape_list, "y_pos"),
+                      _column(shape_list, "length"),
+                      _column(shape_list, "angle")))
+
+
+def __closed(points) -> list:
+    """
+    Repeat the first corner of every polygon at its end.
+
+    Parameters
+    ----------
+    points : ndarray
+        The corners shaped (number of polygons, corners, 2).
+
+    Returns
+    -------
+    list
+        The closed outline of every polygon.
+
+    """
+    return list(numpy.concatenate((points, points[:, :1]), axis=1))
+
+
+def __rectangle_outlines(shape_list: list, tolerance: float) -> list:
+    """
+    Get the outlines of many rectangles.
+
+    Parameters
+    ----------
+    shape_list : list
+        The rectangles.
+    tolerance : float
+        Largest distance between the lines and the real arcs.
+
+    Returns
+    -------
+    list
+        The corners of every rectangle.
+
+    """
+    return __closed(rectangles(_column(shape_list, "x_pos"),
+                               _column(shape_list, "y_pos"),
+                               _column(shape_list, "width"),
+                               _column(shape_list, "height"),
+                               _column(shape_list, "angle")))
+
+
+def __triangle_outlines(shape_list: list, tolerance: float) -> list:
+    """
+    Get the outlines of many triangles.
+
+    Parameters
+    ----------
+    shape_list : list
+        The triangles.
+    tolerance : float
+        Largest distance between the lines and the real arcs.
+
+    Returns
+    -------
+    list
+        The corners of every triangle.
+
+    """
+    return __closed(triangles(_column(shape_list, "x_pos"),
+                              _column(shape_list, "y_pos"),
+                              _column(shape_list, "length"),
+                              _column(shape_list, "height"),
+                              _column(shape_list, "angle")))
+
+
+def __parallelogram_outlines(shape_list: list, tolerance: float) -> list:
+    """
+    Get the outlines of many parallelograms.
+
+    Parameters
+    ----------
+    shape_list : list
+        The parallelograms.
+    tolerance : float
+        Largest distance between the lines and the real arcs.
+
+    Returns
+    -------
+    list
+        The corners of every parallelogram.
+
+    """
+    return __closed(parallelograms(_column(shape_list, "x_pos"),
+                                   _column(shape_list, "y_pos"),
+                                   _column(shape_list, "length"),
+                                   _column(shape_list, "side_length"),
+                                   _column(shape_list, "lower_right_angle"),
+                                   _column(shape_list, "angle")))
+
+
+# shapes with outlines calculated in bulk, all others are recorded
+OUTLINES = {
+    shapes.Circle: __circle_outlines,
+    shapes.Line: __line_outlines,
+    shapes.Rectangle: __rectangle_outlines,
+    shapes.Triangle: __triangle_outlines,
+    shapes.Parallelogram: __parallelogram_outlines,
+}
+
+
+def outlines(shape_list: list, tolerance: float = 0.25) -> list:
+    """
+    Get the outlines of many shapes, shapes of the same type at once.
+
+    Parameters
+    ----------
+    shape_list : list
+        The shapes, their subshapes are not included.
+    tolerance : float, optional
+        Largest distance between the lines and the real arcs.
+        The default is 0.25.
+
+    Returns
+    -------
+    list
+        For every shape, in the given order, a list with an array of points
+        shaped (number of points, 2) for every connected line of its
+        outline.
+
+    """
+    _require_numpy()
+    # indices of the shapes by their type
+    groups = dict()
+    for index, shape in enumerate(shape_list):
+        groups.setdefault(type(shape), list()).append(index)
+
+    result = [None] * len(shape_list)
+    for shape_class, indices in groups.items():
+        function = OUTLINES.get(shape_class)
+        group = [shape_list[index] for index in indices]
+        if function is None:
+            for index, shape in zip(indices, group):
+                result[index] = recorded_outline(shape, tolerance)
+        else:
+            for index, points in zip(indices, function(group, tolerance)):
+                result[index] = [points]
+    return result
@@ -0,0 +1,411 @@
+"""
+Opt-in counters and timers for reading and drawing TML-files.
+
+Nothing is measured until a profiler is enabled. While one is active, the
+parser, the drawing and the backends report what they do: tags and bytes
+scanned, shapes built and drawn by type, primitives emitted by backends and
+the time of every phase. The results can be written as JSON or as a trace
+for the Chrome-browser (chrome://tracing or https://ui.perfetto.dev).
+
+    profiler = profiling.enable()
+    ...
+    profiling.disable()
+    profiler.write_json("profile.json")
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+
+import backends
+
+
+# the profiler which is currently active or None
+ACTIVE = None
+
+# primitives of the backends, which are counted
+PRIMITIVES = ("set_pen", "move_to", "line_to", "arc_to", "fill_begin",
+              "fill_end")
+
+
+class Profiler():
+    """Collects counters, timers and trace events."""
+
+    def __init__(self):
+        """
+        Create a new profiler without any measurements.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.counters = dict()
+        # total seconds and number of calls by the name of the timer
+        self.timers = dict()
+        # the times of the trace are taken from the monotonic clock of the
+        # system, so the events of several processes fit together
+        self.events = list()
+
+    def count(self, name: str, amount: int = 1):
+        """
+        Increase a counter.
+
+        Parameters
+        ----------
+        name : str
+            Name of the counter, like 'tags scanned'.
+        amount : int, optional
+            Amount to add. The default is 1.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_time(self, name: str, seconds: float, calls: int = 1):
+        """
+        Add time to a timer.
+
+        Parameters
+        ----------
+        name : str
+            Name of the timer, like 'shape/Circle'.
+        seconds : float
+            Time to add.
+        calls : int, optional
+            Number of calls the time belongs to. The default is 1.
+
+        Returns
+        -------
+        None.
+
+        """
+        timer = self.timers.get(name)
+        if timer is None:
+            self.timers[name] = [seconds, calls]
+        else:
+            timer[0] += seconds
+            timer[1] += calls
+
+    @contextlib.contextmanager
+    def phase(self, name: str, category: str = "tml"):
+        """
+        Measure a phase, which is added to the timers and to the trace.
+
+        Parameters
+        ----------
+        name : str
+            Name of the phase, like 'parse'.
+        category : str, optional
+            Category of the phase in the trace. The default is 'tml'.
+
+        Yields
+        ------
+        None.
+
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.add_time(name, end - start)
+            self.events.append({
+                "name": name, "cat": category, "ph": "X",
+                "ts": start * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": os.getpid(), "tid": threading.get_ident()})
+
+    def count_shapes(self, shape):
+        """
+        Count a shape and its subshapes by their type.
+
+        Parameters
+        ----------
+        shape : Shape
+            The root of the shapes.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.count(f"shapes built/{type(shape).__name__}")
+        for sub_shape in shape.sub_shapes:
+            self.count_shapes(sub_shape)
+
+    def instrument(self, backend):
+        """
+        Count every primitive a backend emits.
+
+        The primitives of this backend are replaced by counting ones, other
+        backends are not changed. A backend is only instrumented once.
+
+        Parameters
+        ----------
+        backend : Backend
+            The backend.
+
+        Returns
+        -------
+        Backend
+            The same backend.
+
+        """
+        if backend.__dict__.get("_profiler") is self:
+            return backend
+        backend._profiler = self
+        prefix = f"primitives/{type(backend).__name__}/"
+        for name in PRIMITIVES:
+            backend.__dict__[name] = self.__counted(
+                getattr(backend, name), prefix + name)
+        return backend
+
+    def __counted(self, primitive, name: str):
+        """
+        Wrap a primitive, so its calls are counted.
+
+        Parameters
+        ----------
+        primitive : callable
+            The bound primitive.
+        name : str
+            Name of the counter.
+
+        Returns
+        -------
+        callable
+            The counting primitive.
+
+        """
+        counters = self.counters
+
+        def counted(*arguments):
+            counters[name] = counters.get(name, 0) + 1
+            return primitive(*arguments)
+        return counted
+
+    @contextlib.contextmanager
+    def drawing(self, backend):
+        """
+        Measure the time of a backend and count its primitives.
+
+        Parameters
+        ----------
+        backend : Backend
+            The backend, which is drawn with inside of the context.
+
+        Yields
+        ------
+        None.
+
+        """
+        self.instrument(backend)
+        with self.phase(f"draw/{type(backend).__name__}", "draw"):
+            yield
+
+    def draw(self, image, backend=None):
+        """
+        Draw an image, measuring the time of every type of shape.
+
+        The time of a shape includes its subshapes.
+
+        Parameters
+        ----------
+        image : Image
+            The image to draw.
+        backend : Backend, optional
+            Backend to draw with. The default draws with the turtle.
+
+        Returns
+        -------
+        None.
+
+        """
+        if backend is None:
+            backend = backends.TurtleBackend()
+        with self.drawing(backend):
+            backend.begin_image(image)
+            clock = time.perf_counter
+            for shape in image.sub_shapes:
+                start = clock()
+                shape.draw(backend)
+                self.add_time(f"shape/{type(shape).__name__}",
+                              clock() - start)
+            backend.end_image(image)
+
+    def merge(self, data: dict):
+        """
+        Add the measurements of another profiler, like one of a process.
+
+        Parameters
+        ----------
+        data : dict
+            The measurements as returned by to_dict.
+
+        Returns
+        -------
+        None.
+
+        """
+        for name, amount in data["counters"].items():
+            self.count(name, amount)
+        for name, timer in data["timers"].items():
+            self.add_time(name, timer["seconds"], timer["calls"])
+        self.events.extend(data["events"])
+
+    def to_dict(self) -> dict:
+        """
+        Get all measurements.
+
+        Returns
+        -------
+        dict
+            The counters, the timers with their seconds and calls and the
+            events of the trace.
+
+        """
+        return {"counters": dict(sorted(self.counters.items())),
+                "timers": {name: {"seconds": seconds, "calls": calls}
+                           for name, (seconds, calls)
+                           in sorted(self.timers.items())},
+                "events": list(self.events)}
+
+    def write_json(self, file_path: str):
+        """
+        Write the counters and timers as JSON.
+
+        Parameters
+        ----------
+        file_path : str
+            Path of the new file.
+
+        Returns
+        -------
+        None.
+
+        """
+        data = self.to_dict()
+        del data["events"]
+        with open(file_path, "w") as file:
+            json.dump(data, file, indent=2)
+
+    def write_chrome_trace(self, file_path: str):
+        """
+        Write a trace, which can be opened by the Chrome-browser.
+
+        The counters are added as metadata of the trace.
+
+        Parameters
+        ----------
+        file_path : str
+            Path of the new file.
+
+        Returns
+        -------
+        None.
+
+        """
+        data = self.to_dict()
+        with open(file_path, "w") as file:
+            json.dump({"traceEvents": data["events"],
+                       "displayTimeUnit": "ms",
+                       "otherData": {"counters": data["counters"]}}, file)
+
+    def write(self, file_path: str):
+        """
+        Write the measurements, as trace if the file ends with '.trace.json'
+        and as JSON otherwise.
+
+        Parameters
+        ----------
+        file_path : str
+            Path of the new file.
+
+        Returns
+        -------
+        None.
+
+        """
+        if file_path.endswith(".trace.json"):
+            self.write_chrome_trace(file_path)
+        else:
+            self.write_json(file_path)
+
+
+def enable() -> Profiler:
+    """
+    Start measuring with a new profiler.
+
+    Returns
+    -------
+    Profiler
+        The active profiler.
+
+    """
+    global ACTIVE
+    ACTIVE = Profiler()
+    return ACTIVE
+
+
+def disable():
+    """
+    Stop measuring.
+
+    Returns
+    -------
+    Profiler
+        The profiler which was active or None.
+
+    """
+    global ACTIVE
+    profiler = ACTIVE
+    ACTIVE = None
+    return profiler
+
+
+def phase(name: str, category: str = "tml"):
+    """
+    Measure a phase with the active profiler.
+
+    Parameters
+    ----------
+    name : str
+        Name of the phase.
+    category : str, optional
+        Category of the phase in the trace. The default is 'tml'.
+
+    Returns
+    -------
+    context manager
+        Measures the phase, does nothing if no profiler is active.
+
+    """
+    if ACTIVE is None:
+        return contextlib.nullcontext()
+    return ACTIVE.phase(name, category)
+
+
+def drawing(backend):
+    """
+    Measure a backend with the active profiler.
+
+    Parameters
+    ----------
+    backend : Backend
+        The backend, which is drawn with inside of the context.
+
+    Returns
+    -------
+    context manager
+        Measures the backend, does nothing if no profiler is active.
+
+    """
+    if ACTIVE is None:
+        return contextlib.nullcontext()
+    return ACTIVE.drawing(backend)
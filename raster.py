@@ -0,0 +1,592 @@
+"""
+Software-rasterizer, which draws the shapes into a pixel-buffer.
+
+The rasterizer does not need Tk or a display. The finished picture can be
+written as PNG or PPM into a file or any other buffer.
+"""
+
+import math
+import struct
+import zlib
+
+import backends
+
+
+COLORS = {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "red": (255, 0, 0),
+    "green": (0, 255, 0),
+    "blue": (0, 0, 255),
+    "yellow": (255, 255, 0),
+    "cyan": (0, 255, 255),
+    "magenta": (255, 0, 255),
+    "orange": (255, 165, 0),
+    "pink": (255, 192, 203),
+    "brown": (165, 42, 42),
+    "purple": (160, 32, 240),
+    "violet": (238, 130, 238),
+    "gold": (255, 215, 0),
+    "grey": (190, 190, 190),
+    "gray": (190, 190, 190),
+    "darkgrey": (169, 169, 169),
+    "darkgray": (169, 169, 169),
+    "lightgrey": (211, 211, 211),
+    "lightgray": (211, 211, 211),
+    "navy": (0, 0, 128),
+    "darkblue": (0, 0, 139),
+    "lightblue": (173, 216, 230),
+    "skyblue": (135, 206, 235),
+    "darkgreen": (0, 100, 0),
+    "lightgreen": (144, 238, 144),
+    "lime": (0, 255, 0),
+    "olive": (128, 128, 0),
+    "darkred": (139, 0, 0),
+    "maroon": (176, 48, 96),
+    "salmon": (250, 128, 114),
+    "tomato": (255, 99, 71),
+    "coral": (255, 127, 80),
+    "beige": (245, 245, 220),
+    "tan": (210, 180, 140),
+    "turquoise": (64, 224, 208),
+    "indigo": (75, 0, 130),
+    "silver": (192, 192, 192),
+}
+
+
+def to_rgb(color: str):
+    """
+    Convert the name of a color into its red, green and blue values.
+
+    Parameters
+    ----------
+    color : str
+        Name of the color like 'red' or a hex-value like '#ff0000'.
+
+    Raises
+    ------
+    ValueError
+        If the color is not known.
+
+    Returns
+    -------
+    tuple
+        (red, green, blue), every value between 0 and 255.
+
+    """
+    name = color.strip().lower().replace(" ", "")
+    if name in COLORS:
+        return COLORS[name]
+
+    if name.startswith("#") and len(name) in (4, 7):
+        digits = name[1:]
+        if len(digits) == 3:
+            digits = "".join(digit * 2 for digit in digits)
+        return tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+
+    raise ValueError(f"unknown color '{color}'")
+
+
+class RasterBackend(backends.Backend):
+    """Backend drawing into a buffer of RGB-pixels."""
+
+    def __init__(self, width: int = None, height: int = None):
+        """
+        Generate a new rasterizer.
+
+        Parameters
+        ----------
+        width : int, optional
+            Width of the picture in pixels. The default is the width of the
+            image in world coordinates.
+        height : int, optional
+            Height of the picture in pixels. The default is the height of the
+            image in world coordinates.
+
+        Returns
+        -------
+        None.
+
+        """
+        super().__init__()
+        self.pixel_width = width
+        self.pixel_height = height
+        self.pixels = None
+        # position of this picture inside of a bigger one, see begin_tile
+        self.origin_x = 0
+        self.origin_y = 0
+
+    def begin_image(self, image):
+        """
+        Create an empty picture for the given image.
+
+        Parameters
+        ----------
+        image : Image
+            The image which will be drawn.
+
+        Returns
+        -------
+        None.
+
+        """
+        super().begin_image(image)
+        self.set_view(image.lower_left_x, image.lower_left_y,
+                      image.upper_right_x, image.upper_right_y)
+        if image.background_color is not None:
+            self.clear(image.background_color)
+        else:
+            self.clear("white")
+
+    def begin_tile(self, image, image_width: int, image_height: int,
+                   left: int, top: int):
+        """
+        Create an empty picture for a part of a bigger picture of the image.
+
+        The pixels are placed exactly like in the bigger picture, so tiles
+        drawn one by one can be joined without seams.
+
+        Parameters
+        ----------
+        image : Image
+            The image which will be drawn.
+        image_width : int
+            Width of the whole picture in pixels.
+        image_height : int
+            Height of the whole picture in pixels.
+        left : int
+            Column of the whole picture, where this tile starts.
+        top : int
+            Row of the whole picture, where this tile starts.
+
+        Returns
+        -------
+        None.
+
+        """
+        backends.Backend.begin_image(self, image)
+        self.set_view(image.lower_left_x, image.lower_left_y,
+                      image.upper_right_x, image.upper_right_y,
+                      image_width, image_height)
+        self.origin_x = left
+        self.origin_y = top
+        if image.background_color is not None:
+            self.clear(image.background_color)
+        else:
+            self.clear("white")
+
+    def set_view(self, lower_left_x: float, lower_left_y: float,
+                 upper_right_x: float, upper_right_y: float,
+                 image_width: int = None, image_height: int = None):
+        """
+        Set the part of the world which is shown in the picture.
+
+        Parameters
+        ----------
+        lower_left_x : float
+            Left border of the picture in world coordinates.
+        lower_left_y : float
+            Lower border of the picture in world coordinates.
+        upper_right_x : float
+            Right border of the picture in world coordinates.
+        upper_right_y : float
+            Upper border of the picture in world coordinates.
+        image_width : int, optional
+            Width in pixels the world is stretched to. The default is the
+            width of the picture.
+        image_height : int, optional
+            Height in pixels the world is stretched to. The default is the
+            height of the picture.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.pixel_width is None:
+            self.pixel_width = max(1, round(upper_right_x - lower_left_x))
+        if self.pixel_height is None:
+            self.pixel_height = max(1, round(upper_right_y - lower_left_y))
+        if image_width is None:
+            image_width = self.pixel_width
+        if image_height is None:
+            image_height = self.pixel_height
+
+        self.scale_x = image_width / (upper_right_x - lower_left_x)
+        self.scale_y = image_height / (upper_right_y - lower_left_y)
+        self.offset_x = lower_left_x
+        self.offset_y = upper_right_y
+        self.origin_x = 0
+        self.origin_y = 0
+
+        self.__color = bytes(3)
+        self.__line_width = 1
+        self.__point = (0.0, 0.0)
+        self.__fill_path = None
+        self.__fill_lines = None
+
+    def clear(self, color: str):
+        """
+        Fill the whole picture with one color.
+
+        Parameters
+        ----------
+        color : str
+            Name of the color.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.pixels = bytearray(bytes(to_rgb(color))
+                                * (self.pixel_width * self.pixel_height))
+
+    def set_pen(self, color: str, width: float):
+        """
+        Set the style of the following lines.
+
+        Parameters
+        ----------
+        color : str
+            Name of the color.
+        width : float
+            Width of the pen.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__color = bytes(to_rgb(color))
+        # the pen grows with the picture, just like the shapes do
+        self.__line_width = width * (self.scale_x + self.scale_y) / 2
+
+    def move_to(self, x: float, y: float):
+        """
+        Move to the given position without drawing.
+
+        Parameters
+        ----------
+        x : float
+            Target x-coordinate.
+        y : float
+            Target y-coordinate.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__point = self.__to_pixel(x, y)
+        if self.__fill_path is not None:
+            self.__fill_path.append(self.__point)
+
+    def line_to(self, x: float, y: float):
+        """
+        Draw a straight line to the given position.
+
+        Parameters
+        ----------
+        x : float
+            Target x-coordinate.
+        y : float
+            Target y-coordinate.
+
+        Returns
+        -------
+        None.
+
+        """
+        start = self.__point
+        self.__point = self.__to_pixel(x, y)
+        if self.__fill_path is not None:
+            self.__fill_path.append(self.__point)
+            # the lines are drawn on top of the area once it is filled
+            self.__fill_lines.append((start, self.__point,
+                                      self.__color, self.__line_width))
+        else:
+            self.draw_line(start, self.__point,
+                           self.__color, self.__line_width)
+
+    def fill_begin(self, x: float, y: float):
+        """
+        Start an area which will be filled, starting at the given position.
+
+        Parameters
+        ----------
+        x : float
+            X-coordinate of the first point of the area.
+        y : float
+            Y-coordinate of the first point of the area.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__fill_path = [self.__to_pixel(x, y)]
+        self.__fill_lines = list()
+
+    def fill_end(self, color: str):
+        """
+        Fill the area started with fill_begin and draw its lines.
+
+        Parameters
+        ----------
+        color : str
+            Name of the color to fill with.
+
+        Returns
+        -------
+        None.
+
+        """
+        path = self.__fill_path
+        lines = self.__fill_lines
+        self.__fill_path = None
+        self.__fill_lines = None
+
+        if path is not None and len(path) > 2:
+            self.fill_polygon(path, bytes(to_rgb(color)))
+        for start, end, line_color, width in lines or ():
+            self.draw_line(start, end, line_color, width)
+
+    def __to_pixel(self, x: float, y: float):
+        """
+        Convert world coordinates into pixel coordinates.
+
+        Parameters
+        ----------
+        x : float
+            X-coordinate in the world.
+        y : float
+            Y-coordinate in the world.
+
+        Returns
+        -------
+        tuple
+            (x, y) in pixels, y is pointing downwards.
+
+        """
+        return ((x - self.offset_x) * self.scale_x,
+                (self.offset_y - y) * self.scale_y)
+
+    def fill_polygon(self, points: list, color: bytes):
+        """
+        Fill a polygon given in pixel coordinates of the whole picture.
+
+        Pixels are filled if their center lies inside of the polygon, using
+        the even-odd-rule.
+
+        Parameters
+        ----------
+        points : list
+            Corners of the polygon as (x, y).
+        color : bytes
+            RGB-values of the color.
+
+        Returns
+        -------
+        None.
+
+        """
+        edges = list()
+        for index, (x_0, y_0) in enumerate(points):
+            x_1, y_1 = points[index - 1]
+            if y_0 == y_1:
+                continue
+            if y_0 > y_1:
+                x_0, y_0, x_1, y_1 = x_1, y_1, x_0, y_0
+            edges.append((y_0, y_1, x_0, (x_1 - x_0) / (y_1 - y_0)))
+        if not edges:
+            return
+
+        # the coordinates are the same for all tiles of a picture, the
+        # tile is only cut out at the end
+        origin_x = self.origin_x
+        origin_y = self.origin_y
+        width = self.pixel_width
+        top = max(origin_y, math.ceil(min(edge[0] for edge in edges) - 0.5))
+        bottom = min(origin_y + self.pixel_height,
+                     math.ceil(max(edge[1] for edge in edges) - 0.5))
+        edges.sort()
+
+        pixels = self.pixels
+        active = list()
+        next_edge = 0
+        for row in range(top, bottom):
+            center = row + 0.5
+            while next_edge < len(edges) and edges[next_edge][0] <= center:
+                active.append(edges[next_edge])
+                next_edge += 1
+            active = [edge for edge in active if edge[1] > center]
+
+            crossings = sorted(x_0 + (center - y_0) * slope
+                               for y_0, _, x_0, slope in active)
+            row_start = (row - origin_y) * width - origin_x
+            for index in range(0, len(crossings) - 1, 2):
+                left = max(origin_x, math.ceil(crossings[index] - 0.5))
+                right = min(origin_x + width,
+                            math.ceil(crossings[index + 1] - 0.5))
+                if left < right:
+                    pixels[(row_start + left) * 3:
+                           (row_start + right) * 3] = color * (right - left)
+
+    def draw_line(self, start: tuple, end: tuple, color: bytes,
+                  width: float):
+        """
+        Draw a line given in pixel coordinates of the whole picture.
+
+        Parameters
+        ----------
+        start : tuple
+            Starting point as (x, y).
+        end : tuple
+            Ending point as (x, y).
+        color : bytes
+            RGB-values of the color.
+        width : float
+            Width of the line in pixels.
+
+        Returns
+        -------
+        None.
+
+        """
+        (x_0, y_0), (x_1, y_1) = start, end
+        if width > 1.5:
+            # wide lines are drawn as a rectangle around the line
+            length = math.hypot(x_1 - x_0, y_1 - y_0)
+            if length == 0:
+                return
+            normal_x = (y_0 - y_1) / length * width / 2
+            normal_y = (x_1 - x_0) / length * width / 2
+            self.fill_polygon([(x_0 + normal_x, y_0 + normal_y),
+                               (x_1 + normal_x, y_1 + normal_y),
+                               (x_1 - normal_x, y_1 - normal_y),
+                               (x_0 - normal_x, y_0 - normal_y)], color)
+            # round ends close the gaps between the lines of a curve
+            for x, y in (start, end):
+                self.fill_polygon([(x + math.cos(i * math.pi / 4) * width / 2,
+                                    y + math.sin(i * math.pi / 4) * width / 2)
+                                   for i in range(8)], color)
+            return
+
+        pixels = self.pixels
+        columns = self.pixel_width
+        rows = self.pixel_height
+        steps = max(1, math.ceil(max(abs(x_1 - x_0), abs(y_1 - y_0))))
+        step_x = (x_1 - x_0) / steps
+        step_y = (y_1 - y_0) / steps
+        for index in range(steps + 1):
+            column = math.floor(x_0 + step_x * index) - self.origin_x
+            row = math.floor(y_0 + step_y * index) - self.origin_y
+            if 0 <= column < columns and 0 <= row < rows:
+                position = (row * columns + column) * 3
+                pixels[position:position + 3] = color
+
+    def to_ppm(self):
+        """
+        Get the picture in the PPM-format.
+
+        Returns
+        -------
+        bytes
+            The content of a binary PPM-file.
+
+        """
+        header = f"P6\n{self.pixel_width} {self.pixel_height}\n255\n"
+        header = header.encode("ascii")
+        return header + bytes(self.pixels)
+
+    def to_png(self):
+        """
+        Get the picture in the PNG-format.
+
+        Returns
+        -------
+        bytes
+            The content of a PNG-file.
+
+        """
+        stride = self.pixel_width * 3
+        # every row starts with the filter-type 0, which means no filter
+        rows = b"".join(b"\x00" + self.pixels[row * stride:
+                                              (row + 1) * stride]
+                        for row in range(self.pixel_height))
+
+        header = struct.pack(">IIBBBBB",
+                             self.pixel_width, self.pixel_height,
+                             8, 2, 0, 0, 0)
+        return (b"\x89PNG\r\n\x1a\n"
+                + _png_chunk(b"IHDR", header)
+                + _png_chunk(b"IDAT", zlib.compress(rows))
+                + _png_chunk(b"IEND", b""))
+
+    def write(self, file, file_format: str = "png"):
+        """
+        Write the picture into a file or buffer opened in binary mode.
+
+        Parameters
+        ----------
+        file : file-object
+            Target of the picture.
+        file_format : str, optional
+            Either 'png' or 'ppm'. The default is 'png'.
+
+        Raises
+        ------
+        ValueError
+            If the format is not known.
+
+        Returns
+        -------
+        None.
+
+        """
+        file_format = file_format.strip().lower()
+        if file_format == "png":
+            file.write(self.to_png())
+        elif file_format == "ppm":
+            file.write(self.to_ppm())
+        else:
+            raise ValueError(f"unknown format '{file_format}'")
+
+    def save(self, file_path: str):
+        """
+        Save the picture, the format is chosen by the file extension.
+
+        Parameters
+        ----------
+        file_path : str
+            Path of the new file, ending with '.png' or '.ppm'.
+
+        Returns
+        -------
+        None.
+
+        """
+        with open(file_path, "wb") as file:
+            self.write(file, file_path.rsplit(".", 1)[-1])
+
+
+def _png_chunk(kind: bytes, data: bytes):
+    """
+    Pack data into a chunk of a PNG-file.
+
+    Parameters
+    ----------
+    kind : bytes
+        Type of the chunk, like b'IHDR'.
+    data : bytes
+        Content of the chunk.
+
+    Returns
+    -------
+    bytes
+        The chunk with its length and checksum.
+
+    """
+    return (struct.pack(">I", len(data)) + kind + data
+            + struct.pack(">I", zlib.crc32(kind + data)))
@@ -0,0 +1,366 @@
+"""
+Asynchronous reading and rendering of TML-files for asyncio-programs.
+
+Files are read in threads, parsing and rasterizing run in a bounded pool of
+processes, so the event loop is never blocked. A semaphore limits how many
+renders run at once, further requests wait without taking a process. Every
+request can be given a timeout and can be cancelled like any other
+coroutine; a request still waiting for its turn is then dropped at once. A
+request already running in the pool can not be stopped, it keeps its turn
+until it is finished, so max_renders limits the work actually running.
+
+    async with service.TmlService(max_renders=4) as tml:
+        picture = await tml.render_tml("samples/heart.tml", timeout=10)
+
+The turtle needs the main thread and a display, so it is not offered here.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import io
+import os
+
+import raster
+import spatial
+import svg
+import tml_binary
+import tml_parser
+
+
+def _read_text(file_path: str) -> str:
+    """
+    Read a text-file, called in a thread.
+
+    Parameters
+    ----------
+    file_path : str
+        Path of the file.
+
+    Returns
+    -------
+    str
+        The text of the file.
+
+    """
+    with open(file_path) as file:
+        return file.read()
+
+
+def _load(file_path: str, text: str):
+    """
+    Get the shapes of a file, called in a process of the pool.
+
+    Parameters
+    ----------
+    file_path : str
+        Path of the file, only used for .tmlc files.
+    text : str
+        Text of a .tml file or None for a .tmlc file.
+
+    Returns
+    -------
+    Shape
+        The root shape of the file.
+
+    """
+    if text is None:
+        with tml_binary.load(file_path) as scene:
+            return scene.read()
+    return tml_parser.parse(text)
+
+
+def _render(file_path: str, text: str, file_format: str, width: int,
+            height: int, region: tuple) -> bytes:
+    """
+    Parse and render a file, called in a process of the pool.
+
+    Only the finished picture is sent back, not the shapes.
+
+    Parameters
+    ----------
+    file_path : str
+        Path of the file, only used for .tmlc files.
+    text : str
+        Text of a .tml file or None for a .tmlc file.
+    file_format : str
+        Either 'png', 'ppm' or 'svg'.
+    width : int
+        Width of the picture in pixels or None.
+    height : int
+        Height of the picture in pixels or None.
+    region : tuple
+        Part of the image to render or None for the whole image.
+
+    Returns
+    -------
+    bytes
+        The picture, SVG-documents encoded as UTF-8.
+
+    """
+    image = _load(file_path, text)
+    if file_format == "svg":
+        file = io.StringIO()
+        backend = svg.SvgBackend(file)
+    else:
+        backend = raster.RasterBackend(width, height)
+
+    if region is not None:
+        spatial.SceneIndex(image).draw(backend, region)
+    else:
+        image.draw(backend)
+
+    if file_format == "svg":
+        return file.getvalue().encode()
+    file = io.BytesIO()
+    backend.write(file, file_format)
+    return file.getvalue()
+
+
+def _release_turn(loop, semaphore, job):
+    """
+    Give the turn of a finished job to the next request.
+
+    Called in the thread, which finished the job.
+
+    Parameters
+    ----------
+    loop : AbstractEventLoop
+        The loop of the request.
+    semaphore : Semaphore
+        The semaphore of the turns.
+    job : Future
+        The finished job.
+
+    Returns
+    -------
+    None.
+
+    """
+    try:
+        loop.call_soon_threadsafe(semaphore.release)
+    except RuntimeError:
+        # the loop is closed, nobody waits for a turn anymore
+        pass
+
+
+class TmlService():
+    """Reads and renders TML-files for coroutines."""
+
+    def __init__(self, max_workers: int = None, max_renders: int = None,
+                 timeout: float = None, executor=None):
+        """
+        Create a new service, its processes are started on the first use.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            Number of processes. The default is the number of processors.
+        max_renders : int, optional
+            Number of requests which are parsed or rendered at once, the
+            others wait for their turn. The default is twice max_workers,
+            so the pool is never idle.
+        timeout : float, optional
+            Seconds a request may take, including its time of waiting.
+            The default waits forever.
+        executor : Executor, optional
+            Executor for parsing and rendering, like a ThreadPoolExecutor.
+            It is not shut down by the service. The default is a pool of
+            max_workers processes.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.timeout = timeout
+        self.__own_executor = executor is None
+        if executor is None:
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers)
+        self.executor = executor
+        if max_renders is None:
+            max_renders = 2 * (max_workers or os.cpu_count() or 1)
+        self.max_renders = max_renders
+        # created on the first request, so it belongs to the running loop
+        self.__semaphore = None
+
+    async def __run(self, function, *arguments):
+        """
+        Run a function in the executor, once it is the turn of the request.
+
+        The turn ends when the function returns, even if the request stopped
+        waiting for it before.
+
+        Parameters
+        ----------
+        function : callable
+            Function run in the executor.
+        *arguments : object
+            Arguments of the function.
+
+        Returns
+        -------
+        object
+            The result of the function.
+
+        """
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.max_renders)
+        semaphore = self.__semaphore
+        await semaphore.acquire()
+        try:
+            job = self.executor.submit(function, *arguments)
+        except BaseException:
+            semaphore.release()
+            raise
+        job.add_done_callback(functools.partial(
+            _release_turn, asyncio.get_running_loop(), semaphore))
+        # a cancelled request cancels the job only if it did not start yet
+        return await asyncio.wrap_future(job)
+
+    async def __request(self, timeout: float, function, file_path: str,
+                        *arguments):
+        """
+        Read a file and hand it to a function in the executor.
+
+        Parameters
+        ----------
+        timeout : float
+            Seconds the request may take or None for the default.
+        function : callable
+            Function run in the executor, called with the path, the text
+            and the arguments.
+        file_path : str
+            Path of the .tml or .tmlc file.
+        *arguments : object
+            Further arguments of the function.
+
+        Raises
+        ------
+        TimeoutError
+            If the request took too long.
+
+        Returns
+        -------
+        object
+            The result of the function.
+
+        """
+        async def request():
+            text = None
+            if not file_path.endswith(".tmlc"):
+                text = await asyncio.to_thread(_read_text, file_path)
+            return await self.__run(function, file_path, text, *arguments)
+
+        if timeout is None:
+            timeout = self.timeout
+        return await asyncio.wait_for(request(), timeout)
+
+    async def load_tml(self, file_path: str, timeout: float = None):
+        """
+        Read and parse a file.
+
+        Parameters
+        ----------
+        file_path : str
+            Path of the .tml or .tmlc file.
+        timeout : float, optional
+            Seconds the request may take. The default is the timeout of the
+            service.
+
+        Raises
+        ------
+        TimeoutError
+            If the request took too long.
+        ValueError
+            If the file is not a valid TML.
+
+        Returns
+        -------
+        Shape
+            The root shape of the file.
+
+        """
+        return await self.__request(timeout, _load, file_path)
+
+    async def render_tml(self, file_path: str, file_format: str = "png",
+                         width: int = None, height: int = None,
+                         region: tuple = None, timeout: float = None):
+        """
+        Read, parse and render a file without a display.
+
+        Parameters
+        ----------
+        file_path : str
+            Path of the .tml or .tmlc file.
+        file_format : str, optional
+            Either 'png', 'ppm' or 'svg'. The default is 'png'.
+        width : int, optional
+            Width of the picture in pixels. The default is the width of the
+            image.
+        height : int, optional
+            Height of the picture in pixels. The default is the height of
+            the image.
+        region : tuple, optional
+            Part of the image to render as (lower left x, lower left y,
+            upper right x, upper right y). The default renders the whole
+            image.
+        timeout : float, optional
+            Seconds the request may take. The default is the timeout of the
+            service.
+
+        Raises
+        ------
+        TimeoutError
+            If the request took too long.
+        ValueError
+            If the file is not a valid TML or the format is not known.
+
+        Returns
+        -------
+        bytes
+            The picture, SVG-documents encoded as UTF-8.
+
+        """
+        file_format = file_format.strip().lower()
+        if file_format not in ("png", "ppm", "svg"):
+            raise ValueError(f"unknown format '{file_format}'")
+        return await self.__request(timeout, _render, file_path,
+                                    file_format, width, height, region)
+
+    def close(self):
+        """
+        Shut the pool of processes down, if it belongs to the service.
+
+        Requests which did not start yet are cancelled.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.__own_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        """
+        Use the service in an async with-statement.
+
+        Returns
+        -------
+        TmlService
+            The service itself.
+
+        """
+        return self
+
+    async def __aexit__(self, *exception):
+        """
+        Shut the service down at the end of the async with-statement.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.close()
@@ -2,13 +2,79 @@
 A Class containig all possible shapes and a function to access them easily.
 """
 
-import turtle
+import copy
+import logging
 import math
 
+import backends
+
+
+logger = logging.getLogger(__name__)
+
+
+class Attribute():
+    """Description of an attribute of a shape, which can be set by a tag."""
+
+    def __init__(self, name: str, converter=str, aliases: tuple = ()):
+        """
+        Describe a new attribute.
+
+        Parameters
+        ----------
+        name : str
+            Name of the attribute of the shape and of its tag.
+        converter : callable, optional
+            Converts the text of the tag into the value. The default is str.
+        aliases : tuple, optional
+            Other names of the tag, like 'llx'. The default is ().
+
+        Returns
+        -------
+        None.
+
+        """
+        self.name = name
+        self.converter = converter
+        self.aliases = aliases
+
+
+def _attribute_table(attributes: tuple) -> dict:
+    """
+    Build the table to look up attributes by the names of their tags.
+
+    Parameters
+    ----------
+    attributes : tuple
+        The attributes of a shape.
+
+    Returns
+    -------
+    dict
+        Every attribute by its name and aliases.
+
+    """
+    table = dict()
+    for attribute in attributes:
+        for name in (attribute.name,) + tuple(attribute.aliases):
+            table[name] = attribute
+    return table
+
 
 class Shape:
     """Baseclass for shapes, contains basic functionality."""
 
+    # shapes have no __dict__, which saves a lot of memory in big scenes
+    __slots__ = ("sub_shapes", "x_pos", "y_pos", "border_color",
+                 "border_width", "fill_color", "angle")
+
+    # all attributes which can be set by set_attribute
+    attributes = (Attribute("x_pos", int),
+                  Attribute("y_pos", int),
+                  Attribute("border_color", str),
+                  Attribute("border_width", int),
+                  Attribute("fill_color", str),
+                  Attribute("angle", int))
+
     def __init__(self):
         """
         Generate a new Baseshape.
@@ -21,7 +87,9 @@ class Shape:
         None
 
         """
-        self.sub_shapes = list()
+        # leaf shapes share one empty tuple, a list is only created when
+        # the first subshape is appended
+        self.sub_shapes = ()
         self.x_pos = None
         self.y_pos = None
         self.border_color = "black"
@@ -43,7 +111,45 @@ class Shape:
         None.
 
         """
-        self.sub_shapes.append(shape)
+        if self.sub_shapes:
+            self.sub_shapes.append(shape)
+        else:
+            self.sub_shapes = [shape]
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Build the table of attributes once for every new shape class.
+
+        Returns
+        -------
+        None.
+
+        """
+        super().__init_subclass__(**kwargs)
+        cls.attribute_table = _attribute_table(cls.attributes)
+        cls.logger = logging.getLogger(f"{__name__}.{cls.__name__}")
+
+    @classmethod
+    def find_attribute(cls, attribute: str):
+        """
+        Look up an attribute by the name of its tag.
+
+        Parameters
+        ----------
+        attribute : str
+            Name of the tag, upper case and surrounding spaces are ignored.
+
+        Returns
+        -------
+        Attribute
+            The attribute or None, if the shape has no such attribute.
+
+        """
+        table = cls.attribute_table
+        found = table.get(attribute)
+        if found is None:
+            found = table.get(attribute.strip().lower())
+        return found
 
     def set_attribute(self, attribute: str, value: str):
         """
@@ -66,30 +172,13 @@ class Shape:
         None.
 
         """
-        attribute = attribute.strip().lower()
-
-        if attribute in ("x_pos",):
-            self.x_pos = int(value)
-
-        elif attribute in ("y_pos",):
-            self.y_pos = int(value)
-
-        elif attribute in ("border_color",):
-            self.border_color = value
+        found = self.find_attribute(attribute)
+        if found is None:
+            raise ValueError(f"{type(self).__name__} has no attribute "
+                             f"'{attribute}'")
+        setattr(self, found.name, found.converter(value))
 
-        elif attribute in ("border_width",):
-            self.border_width = int(value)
-
-        elif attribute in ("fill_color",):
-            self.fill_color = value
-
-        elif attribute in ("angle",):
-            self.angle = int(value)
-
-        else:
-            raise ValueError
-
-    def prepare(self):
+    def prepare(self, backend):
         """
         Call this function before drawing a shape.
 
@@ -97,29 +186,47 @@ class Shape:
         set the fill_color, border_color and border_width.
         Additionally, the pen is lifted and set.
 
+        Parameters
+        ----------
+        backend : Backend
+            Backend to draw with.
+
         Returns
         -------
         None.
 
         """
-        turtle.penup()
-        turtle.setposition(self.x_pos, self.y_pos)
-        turtle.setheading(self.angle)
-        turtle.pencolor(self.border_color)
-        turtle.width(self.border_width)
-        turtle.pendown()
-
-    def draw(self):
+        backend.penup()
+        backend.setposition(self.x_pos, self.y_pos)
+        backend.setheading(self.angle)
+        backend.pencolor(self.border_color)
+        backend.width(self.border_width)
+        backend.pendown()
+
+    def draw(self, backend=None):
         """
         Standart draw call for calling all subshapes to draw.
 
+        Parameters
+        ----------
+        backend : Backend, optional
+            Backend to draw with. The default draws with the turtle.
+
         Returns
         -------
         None.
 
         """
+        if backend is None:
+            backend = backends.TurtleBackend()
         for shape in self.sub_shapes:
-            shape.draw()
+            shape.draw(backend)
+
+
+Shape.attribute_table = _attribute_table(Shape.attributes)
+# every shape class logs to a child of the logger of this module, like
+# 'shapes.Triangle', so its messages can be turned on one by one
+Shape.logger = logger
 
 
 class Image(Shape):
@@ -129,6 +236,15 @@ class Image(Shape):
     It refers to how big the image or which backgroundcolor should be used.
     """
 
+    __slots__ = ("lower_left_x", "lower_left_y", "upper_right_x",
+                 "upper_right_y", "background_color")
+
+    # the image has none of the attributes of the other shapes
+    attributes = (Attribute("lower_left_x", int, ("llx",)),
+                  Attribute("lower_left_y", int, ("lly",)),
+                  Attribute("upper_right_x", int, ("urx",)),
+                  Attribute("upper_right_y", int, ("ury",)))
+
     def __init__(self):
         """
         Generate an image and set the standard-configuration.
@@ -145,73 +261,34 @@ class Image(Shape):
         self.upper_right_y = 1000
         self.background_color = None
 
-    def set_attribute(self, attribute: str, value: str):
+    def draw(self, backend=None):
         """
-        Try to set a given attribute to a given value.
-
-        In such case of the function only some attributes are allowed to
-        be set, like 'lower_left_x'.
+        Draw the whole image with all shapes contained.
 
         Parameters
         ----------
-        attribute : str
-            If attribute changes, the name of a tag changes simutanously.
-        value : str
-            Value shall be set.
-
-        Raises
-        ------
-        ValueError
-            If there is no such attribute, a ValueError is raised.
+        backend : Backend, optional
+            Backend to draw with. The default draws with the turtle.
 
         Returns
         -------
         None.
 
         """
-        attribute = attribute.strip().lower()
-
-        if attribute in ("llx", "lower_left_x"):
-            self.lower_left_x = int(value)
-
-        elif attribute in ("lly", "lower_left_y"):
-            self.lower_left_y = int(value)
-
-        elif attribute in ("urx", "upper_right_x"):
-            self.upper_right_x = int(value)
-
-        elif attribute in ("ury", "upper_right_y"):
-            self.upper_right_y = int(value)
-
-        else:
-            raise ValueError
-
-    def draw(self):
-        """
-        Draw the whole image with all shapes contained.
-
-        Returns
-        -------
-        None.
-
-        """
-        turtle.setworldcoordinates(self.lower_left_x,
-                                   self.lower_left_y,
-                                   self.upper_right_x,
-                                   self.upper_right_y)
-
-        turtle.screensize(self.upper_right_y - self.lower_left_y,
-                          self.upper_right_x - self.lower_left_x)
-        if self.background_color is not None:
-            turtle.bgcolor(self.background_color)
-        super().draw()
-        turtle.done()
-        turtle.bye()
+        if backend is None:
+            backend = backends.TurtleBackend()
+        backend.begin_image(self)
+        super().draw(backend)
+        backend.end_image(self)
 
 
 class Circle(Shape):
     """A shape for a circle."""
 
+    __slots__ = ("radius",)
+
+    attributes = Shape.attributes + (Attribute("radius", int),)
+
     def __init__(self):
         """
         Generate a circle to draw with the image class.
@@ -224,66 +301,49 @@ class Circle(Shape):
         super().__init__()
         self.radius = None
 
-    def set_attribute(self, attribute: str, value: str):
+    def draw(self, backend=None):
         """
-        Try to set a given attribute to a given Value.
+        Draw this circle and all subshapes.
 
         Parameters
         ----------
-        attribute : str
-            Attribute to change. Should be the name of a Tag.
-        value : str
-            Value to set.
-
-        Raises
-        ------
-        ValueError
-            If there is no such Attribute, a ValueError is raised.
-
-        Returns
-        -------
-        None.
-
-        """
-        attribute = attribute.strip().lower()
-        if attribute in ("radius",):
-            self.radius = int(value)
-
-        else:
-            super().set_attribute(attribute, value)
-
-    def draw(self):
-        """
-        Draw this circle and all subshapes.
+        backend : Backend, optional
+            Backend to draw with. The default draws with the turtle.
 
         Returns
         -------
         None.
 
         """
-        self.prepare()
+        if backend is None:
+            backend = backends.TurtleBackend()
+        self.prepare(backend)
 
         # We have to move the turtle around, in order to position it correctly
         # The "normal" implementation would draw the circle to the right of
         # the turtle, but we want the "origitn" of the circle in the
         # lower-left-corner.
-        turtle.penup()
-        turtle.setposition(self.x_pos + self.radius, self.y_pos)
-        turtle.pendown()
+        backend.penup()
+        backend.setposition(self.x_pos + self.radius, self.y_pos)
+        backend.pendown()
 
         if self.fill_color is not None:
-            turtle.fillcolor(self.fill_color)
-            turtle.begin_fill()
-            turtle.circle(self.radius)
-            turtle.end_fill()
+            backend.fillcolor(self.fill_color)
+            backend.begin_fill()
+            backend.circle(self.radius)
+            backend.end_fill()
         else:
-            turtle.circle(self.radius)
-        super().draw()
+            backend.circle(self.radius)
+        super().draw(backend)
 
 
 class Line(Shape):
     """A simple Line which can be drawn by the turtle."""
 
+    __slots__ = ("length",)
+
+    attributes = Shape.attributes + (Attribute("length", int),)
+
     def __init__(self):
         """
         Generate a Line to draw inside the Image.
@@ -296,52 +356,35 @@ class Line(Shape):
         super().__init__()
         self.length = None
 
-    def set_attribute(self, attribute: str, value: str):
+    def draw(self, backend=None):
         """
-        Try to set a given attribute to a given Value.
+        Draw this Line and all subshapes.
 
         Parameters
         ----------
-        attribute : str
-            If attribute changes, the name of a tag changes simutanously.
-        value : str
-            Value shall be set.
-
-        Raises
-        ------
-        ValueError
-            If there is no such Attribute, a ValueError is raised.
+        backend : Backend, optional
+            Backend to draw with. The default draws with the turtle.
 
         Returns
         -------
         None.
 
         """
-        attribute = attribute.strip().lower()
-
-        if attribute in ("length",):
-            self.length = int(value)
-
-        else:
-            super().set_attribute(attribute, value)
-
-    def draw(self):
-        """
-        Draw this Line and all subshapes.
-
-        Returns
-        -------
-        None.
-
-        """
-        self.prepare()
-        turtle.forward(self.length)
-        super().draw()
+        if backend is None:
+            backend = backends.TurtleBackend()
+        self.prepare(backend)
+        backend.forward(self.length)
+        super().draw(backend)
 
 
 class Rectangle(Shape):
     """A simple rectangle-shape."""
 
+    __slots__ = ("height", "width")
+
+    attributes = Shape.attributes + (Attribute("height", int),
+                                     Attribute("width", int))
+
     def __init__(self):
         """
         Generate a rectangle to draw within the image class.
@@ -355,68 +398,49 @@ class Rectangle(Shape):
         self.height = None
         self.width = None
 
-    def set_attribute(self, attribute: str, value: str):
+    def draw(self, backend=None):
         """
-        Try to set a given attribute to a given value.
+        Draw this rectangle and all subshapes.
 
         Parameters
         ----------
-        attribute : str
-            If attribute changes, the name of a tag changes simutanously.
-        value : str
-            Value shall be set.
-
-        Raises
-        ------
-        ValueError
-            If there is no such attribute, a ValueError is raised.
-
-        Returns
-        -------
-        None.
-
-        """
-        attribute = attribute.strip().lower()
-
-        if attribute in ("height",):
-            self.height = int(value)
-
-        elif attribute in ("width",):
-            self.width = int(value)
-
-        else:
-            super().set_attribute(attribute, value)
-
-    def draw(self):
-        """
-        Draw this rectangle and all subshapes.
+        backend : Backend, optional
+            Backend to draw with. The default draws with the turtle.
 
         Returns
         -------
         None.
 
         """
-        self.prepare()
+        if backend is None:
+            backend = backends.TurtleBackend()
+        self.prepare(backend)
         if self.fill_color is not None:
-            turtle.fillcolor(self.fill_color)
-            turtle.begin_fill()
+            backend.fillcolor(self.fill_color)
+            backend.begin_fill()
 
         for _ in range(2):
-            turtle.forward(self.width)
+            backend.forward(self.width)
 
-            turtle.left(90)
-            turtle.forward(self.height)
+            backend.left(90)
+            backend.forward(self.height)
 
-            turtle.left(90)
+            backend.left(90)
 
         if self.fill_color is not None:
-            turtle.end_fill()
-        super().draw()
+            backend.end_fill()
+        super().draw(backend)
 
 
 class Balloon (Shape):
     """A circle filled with smaller circles and a thread below it."""
 
+    __slots__ = ("radius", "thread", "thread_angle")
+
+    attributes = Shape.attributes + (Attribute("radius", int),
+                                     Attribute("thread", int),
+                                     Attribute("thread_angle", int))
+
     def __init__(self):
         """
         Generate a balloon.
@@ -431,70 +455,49 @@ class Balloon (Shape):
         self.thread = None
         self.thread_angle = None
 
-    def set_attribute(self, attribute: str, value: str):
+    def draw(self, backend=None):
         """
-        Try to set a given attribute to a given value.
+        Draw this Balloon and all subshapes.
 
         Parameters
         ----------
-        attribute : str
-            If attribute changes, the name of a tag changes simutanously.
-        value : str
-            Value shall be set
-
-        Raises
-        ------
-        ValueError
-            If there is no such attribute, a ValueError is raised.
+        backend : Backend, optional
+            Backend to draw with. The default draws with the turtle.
 
         Returns
         -------
         None.
 
         """
-        print(attribute, value)
-        attribute = attribute.strip().lower()
-        if attribute in ("radius",):
-            self.radius = int(value)
-
-        elif attribute in ("thread",):
-            self.thread = int(value)
-
-        elif attribute in ("thread_angle",):
-            self.thread_angle = int(value)
-
-        else:
-            super().set_attribute(attribute, value)
-
-    def draw(self):
-        """
-        Draw this Balloon and all subshapes.
-
-        Returns
-        -------
-        None.
-
-        """
-        self.prepare()
+        if backend is None:
+            backend = backends.TurtleBackend()
+        self.prepare(backend)
 
         for i in range(4):
             if self.fill_color is not None:
-                turtle.fillcolor(self.fill_color)
-                turtle.begin_fill()
+                backend.fillcolor(self.fill_color)
+                backend.begin_fill()
 
-            turtle.circle(self.radius-15 * i)
+            backend.circle(self.radius-15 * i)
 
             if self.fill_color is not None:
-                turtle.end_fill()
+                backend.end_fill()
 
-        turtle.right(self.thread_angle)
-        turtle.forward(self.thread)
-        super().draw()
+        backend.right(self.thread_angle)
+        backend.forward(self.thread)
+        super().draw(backend)
 
 
 class RoseAndHeart(Shape):
     """A Rose with a heart below it."""
 
+    __slots__ = ("radius", "petal_color", "leaf_color", "heart_color")
+
+    attributes = Shape.attributes + (Attribute("radius", int),
+                                     Attribute("petal_color", str),
+                                     Attribute("leaf_color", str),
+                                     Attribute("heart_color", str))
+
     def __init__(self):
         """
         Generate a rose and a heart.
@@ -512,160 +515,136 @@ class RoseAndHeart(Shape):
         self.leaf_color = None
         self.heart_color = None
 
-    def set_attribute(self, attribute: str, value: str):
+    def draw(self, backend=None):
         """
-        Try to set an given attribute to an given Value.
+        Draw this rose and heart and all subshapes.
 
         Parameters
         ----------
-        attribute : str
-            If attribute changes, the name of a tag changes simutanously.
-        value : str
-            Value shall be set.
-
-        Raises
-        ------
-        ValueError
-            If there is no such attribute, a ValueError is raised.
-
-        Returns
-        -------
-        None.
-
-        """
-        attribute = attribute.strip().lower()
-        if attribute in ("radius",):
-            self.radius = int(value)
-
-        elif attribute in ("petal_color",):
-            self.petal_color = value
-
-        elif attribute in ("leaf_color",):
-            self.leaf_color = value
-
-        elif attribute in ("heart_color",):
-            self.heart_color = value
-        else:
-            super().set_attribute(attribute, value)
-
-    def draw(self):
-        """
-        Draw this rose and heart and all subshapes.
+        backend : Backend, optional
+            Backend to draw with. The default draws with the turtle.
 
         Returns
         -------
         None.
 
         """
-        self.prepare()
+        if backend is None:
+            backend = backends.TurtleBackend()
+        self.prepare(backend)
 
         # Rosen und Herzballon
 
         # Blumen Basis
 
-        turtle.fillcolor(self.petal_color)
-        turtle.begin_fill()
-
-        turtle.circle(9, 175)
-        turtle.circle(24, 111)
-        turtle.left(49)
-        turtle.circle(61, 44)
-        turtle.circle(21, 171)
-        turtle.right(25)
-        turtle.forward(31)
-        turtle.left(11)
-        turtle.circle(31, 111)
-        turtle.forward(21)
-        turtle.left(41)
-        turtle.circle(91, 71)
-        turtle.circle(31, 151)
-        turtle.right(31)
-        turtle.forward(16)
-        turtle.circle(81, 91)
-        turtle.left(16)
-        turtle.forward(46)
-        turtle.right(166)
-        turtle.forward(21)
-        turtle.left(156)
-        turtle.circle(151, 81)
-        turtle.left(51)
-        turtle.circle(151, 91)
-        turtle.end_fill()
+        backend.fillcolor(self.petal_color)
+        backend.begin_fill()
+
+        backend.circle(9, 175)
+        backend.circle(24, 111)
+        backend.left(49)
+        backend.circle(61, 44)
+        backend.circle(21, 171)
+        backend.right(25)
+        backend.forward(31)
+        backend.left(11)
+        backend.circle(31, 111)
+        backend.forward(21)
+        backend.left(41)
+        backend.circle(91, 71)
+        backend.circle(31, 151)
+        backend.right(31)
+        backend.forward(16)
+        backend.circle(81, 91)
+        backend.left(16)
+        backend.forward(46)
+        backend.right(166)
+        backend.forward(21)
+        backend.left(156)
+        backend.circle(151, 81)
+        backend.left(51)
+        backend.circle(151, 91)
+        backend.end_fill()
 
         # Blütenblatt 1
-        turtle.left(149)
-        turtle.circle(-89, 69)
-        turtle.left(21)
-        turtle.circle(76, 106)
-        turtle.setheading(61)
-        turtle.circle(80, 97)
-        turtle.circle(-90, 41)
+        backend.left(149)
+        backend.circle(-89, 69)
+        backend.left(21)
+        backend.circle(76, 106)
+        backend.setheading(61)
+        backend.circle(80, 97)
+        backend.circle(-90, 41)
 
         # Blütenblatt 2
-        turtle.left(181)
-        turtle.circle(90, 41)
-        turtle.circle(-80, 97)
-        turtle.setheading(-82)
+        backend.left(181)
+        backend.circle(90, 41)
+        backend.circle(-80, 97)
+        backend.setheading(-82)
 
         # Grünblatt 1
-        turtle.forward(30.5)
-        turtle.left(90.5)
-        turtle.forward(25.6)
-        turtle.left(44)
-        turtle.fillcolor(self.leaf_color)
-        turtle.begin_fill()
-        turtle.circle(-81, 91)
-        turtle.right(89)
-        turtle.circle(-81, 91)
-        turtle.end_fill()
-        turtle.right(136)
-        turtle.forward(61)
-        turtle.left(181)
-        turtle.forward(86)
-        turtle.left(91)
-        turtle.forward(81)
+        backend.forward(30.5)
+        backend.left(90.5)
+        backend.forward(25.6)
+        backend.left(44)
+        backend.fillcolor(self.leaf_color)
+        backend.begin_fill()
+        backend.circle(-81, 91)
+        backend.right(89)
+        backend.circle(-81, 91)
+        backend.end_fill()
+        backend.right(136)
+        backend.forward(61)
+        backend.left(181)
+        backend.forward(86)
+        backend.left(91)
+        backend.forward(81)
 
         # Grünblatt  2
-        turtle.right(91)
-        turtle.right(44)
-        turtle.fillcolor(self.leaf_color)
-        turtle.begin_fill()
-        turtle.circle(81, 91)
-        turtle.left(89)
-        turtle.circle(81, 91)
-        turtle.end_fill()
-        turtle.left(136)
-        turtle.forward(61)
-        turtle.left(181)
-        turtle.forward(61)
-        turtle.right(91)
-        turtle.circle(201, 59)
+        backend.right(91)
+        backend.right(44)
+        backend.fillcolor(self.leaf_color)
+        backend.begin_fill()
+        backend.circle(81, 91)
+        backend.left(89)
+        backend.circle(81, 91)
+        backend.end_fill()
+        backend.left(136)
+        backend.forward(61)
+        backend.left(181)
+        backend.forward(61)
+        backend.right(91)
+        backend.circle(201, 59)
 
         # Ballon in Herzform
-        turtle.fillcolor(self.heart_color)
-        turtle.begin_fill()
-        turtle.left(140)
-        turtle.forward(111.65)
+        backend.fillcolor(self.heart_color)
+        backend.begin_fill()
+        backend.left(140)
+        backend.forward(111.65)
         for i in range(200):
-            turtle.right(1)
-            turtle.forward(1)
-        turtle.left(120)
+            backend.right(1)
+            backend.forward(1)
+        backend.left(120)
         for i in range(200):
-            turtle.right(1)
-            turtle.forward(1)
-        turtle.forward(111.65)
-        turtle.right(40)
+            backend.right(1)
+            backend.forward(1)
+        backend.forward(111.65)
+        backend.right(40)
 
         # Ballongriff in Rundform
-        turtle.circle(self.radius)
+        backend.circle(self.radius)
 
-        turtle.end_fill()
-        super().draw()
+        backend.end_fill()
+        super().draw(backend)
 
 
 class Triangle(Shape):
     """A isosceles triangle."""
 
+    __slots__ = ("length", "height")
+
+    attributes = Shape.attributes + (Attribute("length", int),
+                                     Attribute("height", int))
+
     def __init__(self):
         """
         Generate a triangle.
@@ -679,71 +658,54 @@ class Triangle(Shape):
         self.length = None
         self.height = None
 
-    def set_attribute(self, attribute: str, value: str):
+    def draw(self, backend=None):
         """
-        Try to set a given attribute to a given value.
+        Draw this triangle and all subshapes.
 
         Parameters
         ----------
-        attribute : str
-            If attribute changes, the name of a tag changes simutanously.
-        value : str
-            Value shall be set.
-
-        Raises
-        ------
-        ValueError
-            If there is no such attribute, a ValueError is raised.
+        backend : Backend, optional
+            Backend to draw with. The default draws with the turtle.
 
         Returns
         -------
         None.
 
         """
-        attribute = attribute.strip().lower()
-        print(value)
-        if attribute in ("length",):
-            self.length = int(value)
-        elif attribute in ("height",):
-            self.height = int(value)
-        else:
-            super().set_attribute(attribute, value)
-
-    def draw(self):
-        """
-        Draw this triangle and all subshapes.
-
-        Returns
-        -------
-        None.
-
-        """
-        self.prepare()
+        if backend is None:
+            backend = backends.TurtleBackend()
+        self.prepare(backend)
         if self.fill_color is not None:
-            turtle.fillcolor(self.fill_color)
-            turtle.begin_fill()
+            backend.fillcolor(self.fill_color)
+            backend.begin_fill()
         angle_right_corner = math.atan(self.height / (self.length/2))
         angle_right_corner = math.degrees(angle_right_corner)
         angle_top_corner = 2 * angle_right_corner
         angle_right_corner = 180 - angle_right_corner
         side_length = math.sqrt((self.length/2)**2 + (self.height**2))
-        turtle.forward(self.length)
-        turtle.left(angle_right_corner)
-        turtle.forward(side_length)
-        turtle.left(angle_top_corner)
-        turtle.forward(side_length)
+        backend.forward(self.length)
+        backend.left(angle_right_corner)
+        backend.forward(side_length)
+        backend.left(angle_top_corner)
+        backend.forward(side_length)
 
         if self.fill_color is not None:
-            turtle.end_fill()
-        print(angle_right_corner)
-        print(angle_top_corner)
+            backend.end_fill()
+        self.logger.debug("corner angles %.3f (right) and %.3f (top)",
+                          angle_right_corner, angle_top_corner)
 
-        super().draw()
+        super().draw(backend)
 
 
 class Parallelogram (Shape):
     """A paralellogram shape."""
 
+    __slots__ = ("length", "side_length", "lower_right_angle")
+
+    attributes = Shape.attributes + (Attribute("length", int),
+                                     Attribute("side_length", int),
+                                     Attribute("lower_right_angle", int))
+
     def __init__(self):
         """
         Generate a paralellogram.
@@ -758,63 +720,303 @@ class Parallelogram (Shape):
         self.side_length = None
         self.lower_right_angle = None
 
+    def draw(self, backend=None):
+        """
+        Draw this paralellogram and all subshapes.
+
+        Parameters
+        ----------
+        backend : Backend, optional
+            Backend to draw with. The default draws with the turtle.
+
+        Returns
+        -------
+        None.
+
+        """
+        if backend is None:
+            backend = backends.TurtleBackend()
+        self.prepare(backend)
+        if self.fill_color is not None:
+            backend.fillcolor(self.fill_color)
+            backend.begin_fill()
+        for _ in range(2):
+            backend.forward(self.length)
+            backend.left(self.lower_right_angle)
+            backend.forward(self.side_length)
+            backend.left(180-self.lower_right_angle)
+
+        if self.fill_color is not None:
+            backend.end_fill()
+        super().draw(backend)
+
+
+class Definition(Shape):
+    """
+    A named shape, which is drawn by its instances instead of itself.
+
+    The definition contains exactly one shape, which is parsed once and
+    shared by all <use>-tags naming it.
+    """
+
+    __slots__ = ("name",)
+
+    attributes = (Attribute("name", str),)
+
+    def __init__(self):
+        """
+        Generate an empty definition.
+
+        Returns
+        -------
+        None.
+
+        """
+        super().__init__()
+        self.name = None
+
+    @property
+    def shape(self):
+        """
+        The defined shape.
+
+        Returns
+        -------
+        Shape
+            The only shape inside of the definition.
+
+        """
+        return self.sub_shapes[0]
+
+    def draw(self, backend=None):
+        """
+        Draw nothing, the defined shape is only drawn by its instances.
+
+        Parameters
+        ----------
+        backend : Backend, optional
+            Not used.
+
+        Returns
+        -------
+        None.
+
+        """
+
+
+class Use(Shape):
+    """
+    An instance of a definition with some attributes replaced.
+
+    All instances share the shape of their definition, only the replaced
+    attributes are kept by the instance itself.
+    """
+
+    __slots__ = ("name", "definition", "overrides")
+
+    attributes = (Attribute("name", str),)
+
+    def __init__(self):
+        """
+        Generate an instance, which does not refer to a definition yet.
+
+        Returns
+        -------
+        None.
+
+        """
+        super().__init__()
+        self.name = None
+        self.definition = None
+        # pairs of (attribute, value), the values are text until the
+        # instance is linked to its definition
+        self.overrides = ()
+
+    @classmethod
+    def find_attribute(cls, attribute: str):
+        """
+        Look up an attribute, which may belong to any shape.
+
+        The attributes replaced by an instance are only checked against its
+        definition when they are linked.
+
+        Parameters
+        ----------
+        attribute : str
+            Name of the tag, upper case and surrounding spaces are ignored.
+
+        Returns
+        -------
+        Attribute
+            The attribute or None, if no shape has such an attribute.
+
+        """
+        found = super().find_attribute(attribute)
+        if found is None:
+            for shape_class in SHAPES.values():
+                if shape_class is not cls:
+                    found = shape_class.find_attribute(attribute)
+                    if found is not None:
+                        break
+        return found
+
     def set_attribute(self, attribute: str, value: str):
         """
-        Try to set a given attribute to a given value.
+        Set the name of the definition or remember a replaced attribute.
 
         Parameters
         ----------
         attribute : str
-            If attribute changes, the name of a tag changes simutanously.
+            Name of the tag.
         value : str
             Value shall be set.
 
         Raises
         ------
         ValueError
-            If there is no such attribute, a ValueError is raised.
+            If no shape has such an attribute.
 
         Returns
         -------
         None.
 
         """
-        attribute = attribute.strip().lower()
+        if self.attribute_table.get(attribute.strip().lower()) is not None:
+            super().set_attribute(attribute, value)
+        elif self.find_attribute(attribute) is None:
+            raise ValueError(f"{type(self).__name__} has no attribute "
+                             f"'{attribute}'")
+        else:
+            self.overrides += ((attribute, value),)
 
-        if attribute in ("length",):
-            self.length = int(value)
+    def link(self, definitions: dict):
+        """
+        Find the definition of this instance and convert the attributes.
 
-        elif attribute in ("side_length",):
-            self.side_length = int(value)
+        Parameters
+        ----------
+        definitions : dict
+            All definitions read so far by their name.
 
-        elif attribute in ("lower_right_angle",):
-            self.lower_right_angle = int(value)
+        Raises
+        ------
+        ValueError
+            If the definition is not known or has no such attributes.
 
-        else:
-            super().set_attribute(attribute, value)
+        Returns
+        -------
+        None.
 
-    def draw(self):
         """
-        Draw this paralellogram and all subshapes.
+        definition = definitions.get(self.name)
+        if definition is None:
+            raise ValueError(f"there is no definition '{self.name}'")
+        shape = definition.shape
+        overrides = list()
+        for attribute, value in self.overrides:
+            found = shape.find_attribute(attribute)
+            if found is None:
+                raise ValueError(f"{type(shape).__name__} has no attribute "
+                                 f"'{attribute}'")
+            overrides.append((found.name, found.converter(value)))
+        self.definition = definition
+        self.overrides = tuple(overrides)
+
+    def expand(self):
+        """
+        Get a shape of its own, which looks exactly like this instance.
+
+        Returns
+        -------
+        Shape
+            A copy of the defined shape with the attributes replaced, its
+            subshapes are still shared.
+
+        """
+        shape = copy.copy(self.definition.shape)
+        for name, value in self.overrides:
+            setattr(shape, name, value)
+        return shape
+
+    def draw(self, backend=None):
+        """
+        Draw the defined shape with the attributes of this instance.
+
+        The attributes are replaced on a copy of the shape, so the shared
+        definition is never changed and instances can be drawn by several
+        threads at once.
+
+        Parameters
+        ----------
+        backend : Backend, optional
+            Backend to draw with. The default draws with the turtle.
 
         Returns
         -------
         None.
 
         """
-        self.prepare()
-        if self.fill_color is not None:
-            turtle.fillcolor(self.fill_color)
-            turtle.begin_fill()
-        for _ in range(2):
-            turtle.forward(self.length)
-            turtle.left(self.lower_right_angle)
-            turtle.forward(self.side_length)
-            turtle.left(180-self.lower_right_angle)
+        if backend is None:
+            backend = backends.TurtleBackend()
+        if self.overrides:
+            self.expand().draw(backend)
+        else:
+            self.definition.shape.draw(backend)
 
-        if self.fill_color is not None:
-            turtle.end_fill()
-        super().draw()
+
+# all shapes by the name of their tag
+SHAPES = {
+    "circle": Circle,
+    "rectangle": Rectangle,
+    "line": Line,
+    "balloon": Balloon,
+    "rose_and_heart": RoseAndHeart,
+    "triangle": Triangle,
+    "parallelogram": Parallelogram,
+    "image": Image,
+    "define": Definition,
+    "use": Use,
+}
+
+
+def register_shape(shape_name: str, shape_class: type):
+    """
+    Make a new shape available by the name of its tag.
+
+    Parameters
+    ----------
+    shape_name : str
+        Name of the tag of the shape.
+    shape_class : type
+        Subclass of Shape, which lists its attributes in 'attributes'.
+
+    Returns
+    -------
+    None.
+
+    """
+    SHAPES[shape_name.lower()] = shape_class
+
+
+def get_shape_class(shape_name: str):
+    """
+    Get the class of the shape named as variable, without creating a shape.
+
+    Parameters
+    ----------
+    shape_name : str
+        Name of the shape, like in its tag.
+
+    Returns
+    -------
+    type
+        The class of the shape or None, if there is no matching shape.
+
+    """
+    shape_class = SHAPES.get(shape_name)
+    if shape_class is None:
+        shape_class = SHAPES.get(shape_name.lower())
+    return shape_class
 
 
 def get_shape(shape_name: str):
@@ -824,36 +1026,120 @@ def get_shape(shape_name: str):
     Parameters
     ----------
     shape_name : str
-        DESCRIPTION.
+        Name of the shape, like in its tag.
 
     Returns
     -------
-    TYPE
-        A shape comes none, if there is no matching shape.
+    Shape
+        A new shape or None, if there is no matching shape.
 
     """
-    if shape_name.lower() == "circle":
-        return Circle()
+    shape_class = get_shape_class(shape_name)
+    if shape_class is None:
+        return None
+    return shape_class()
 
-    if shape_name.lower() == "rectangle":
-        return Rectangle()
 
-    if shape_name.lower() == "line":
-        return Line()
+def __traced_set_attribute(shape_class: type, set_attribute):
+    """
+    Wrap set_attribute of a shape class, logging every attribute set.
 
-    if shape_name.lower() == "balloon":
-        return Balloon()
+    Parameters
+    ----------
+    shape_class : type
+        The traced shape class.
+    set_attribute : callable
+        The method which is wrapped.
 
-    if shape_name.lower() == "rose_and_heart":
-        return RoseAndHeart()
+    Returns
+    -------
+    callable
+        The logging method.
 
-    if shape_name.lower() == "triangle":
-        return Triangle()
+    """
+    class_logger = shape_class.logger
+
+    def traced(self, attribute: str, value: str):
+        set_attribute(self, attribute, value)
+        class_logger.debug("%s: %s = %r", type(self).__name__, attribute,
+                           value)
+    return traced
+
+
+def __traced_draw(shape_class: type, draw):
+    """
+    Wrap draw of a shape class, logging the geometry of every shape drawn.
+
+    Parameters
+    ----------
+    shape_class : type
+        The traced shape class.
+    draw : callable
+        The method which is wrapped.
+
+    Returns
+    -------
+    callable
+        The logging method.
+
+    """
+    class_logger = shape_class.logger
 
-    if shape_name.lower() == "parallelogram":
-        return Parallelogram()
+    def traced(self, backend=None):
+        class_logger.debug(
+            "draw %s %s", type(self).__name__,
+            {attribute.name: getattr(self, attribute.name)
+             for attribute in type(self).attributes})
+        draw(self, backend)
+    return traced
 
-    if shape_name.lower() == "image":
-        return Image()
 
-    return None
+def trace_shape(shape_name: str, enabled: bool = True):
+    """
+    Turn the debug messages of a type of shape on or off.
+
+    While a type is traced, every attribute set and the geometry of every
+    shape drawn is logged to its logger, like 'shapes.Triangle', on the
+    DEBUG level. The methods of types which are not traced are left alone,
+    so they cost nothing. The messages are only shown, if logging is set up,
+    e.g. by logging.basicConfig().
+
+    Parameters
+    ----------
+    shape_name : str
+        Name of the shape, like in its tag.
+    enabled : bool, optional
+        If False, the tracing is turned off again. The default is True.
+
+    Raises
+    ------
+    ValueError
+        If there is no such shape.
+
+    Returns
+    -------
+    None.
+
+    """
+    shape_class = get_shape_class(shape_name)
+    if shape_class is None:
+        raise ValueError(f"there is no shape '{shape_name}'")
+
+    for name, wrap in (("set_attribute", __traced_set_attribute),
+                       ("draw", __traced_draw)):
+        current = shape_class.__dict__.get(name)
+        # the traced method remembers the one it replaced, None if the
+        # method was inherited
+        traced = current is not None and hasattr(current, "replaced")
+        if enabled and not traced:
+            method = wrap(shape_class, getattr(shape_class, name))
+            method.replaced = current
+            setattr(shape_class, name, method)
+        elif not enabled and traced:
+            if current.replaced is None:
+                delattr(shape_class, name)
+            else:
+                setattr(shape_class, name, current.replaced)
+
+    shape_class.logger.setLevel(logging.DEBUG if enabled
+                                else logging.NOTSET)
@@ -0,0 +1,682 @@
+"""
+Bounding boxes of shapes and a grid index to find the shapes of a region.
+
+The boxes of the simple shapes are calculated from their corners, the same
+way the backends walk along them. All other shapes are drawn into a backend,
+which only remembers the smallest and largest coordinates, so it works for
+every shape class. The boxes of the shapes of an image are put into a uniform
+grid. Drawing a region only draws the shapes whose boxes intersect it, all
+others are skipped without calculating anything.
+
+Boxes are tuples of (lower left x, lower left y, upper right x,
+upper right y).
+"""
+
+import copy
+import itertools
+import math
+
+import backends
+import shapes
+
+
+class BoundsBackend(backends.Backend):
+    """Backend remembering the area covered by everything drawn."""
+
+    def __init__(self):
+        """
+        Generate a new backend, which has not seen anything yet.
+
+        Returns
+        -------
+        None.
+
+        """
+        super().__init__()
+        self.box = None
+        self.__margin = 0.0
+        # the primitives keep their own position, so they can be replayed
+        # from a display list without the commands of the turtle
+        self.__point = (0.0, 0.0)
+        self.__filling = False
+
+    def add_point(self, x: float, y: float, margin: float = 0.0):
+        """
+        Grow the box to contain a point.
+
+        Parameters
+        ----------
+        x : float
+            X-coordinate of the point.
+        y : float
+            Y-coordinate of the point.
+        margin : float, optional
+            Distance around the point, which is covered as well.
+            The default is 0.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.box is None:
+            self.box = (x - margin, y - margin, x + margin, y + margin)
+        else:
+            self.box = (min(self.box[0], x - margin),
+                        min(self.box[1], y - margin),
+                        max(self.box[2], x + margin),
+                        max(self.box[3], y + margin))
+
+    def set_pen(self, color: str, width: float):
+        """
+        Remember the width of the pen, lines cover half of it on each side.
+
+        Parameters
+        ----------
+        color : str
+            Name of the color.
+        width : float
+            Width of the pen.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__margin = width / 2
+
+    def move_to(self, x: float, y: float):
+        """
+        Move without drawing, which only counts for filled areas.
+
+        Parameters
+        ----------
+        x : float
+            Target x-coordinate.
+        y : float
+            Target y-coordinate.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.__filling:
+            self.add_point(*self.__point)
+            self.add_point(x, y)
+        self.__point = (x, y)
+
+    def line_to(self, x: float, y: float):
+        """
+        Add a straight line.
+
+        Parameters
+        ----------
+        x : float
+            Target x-coordinate.
+        y : float
+            Target y-coordinate.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.add_point(*self.__point, self.__margin)
+        self.add_point(x, y, self.__margin)
+        self.__point = (x, y)
+
+    def arc_to(self, center_x: float, center_y: float, radius: float,
+               start: float, sweep: float, x: float, y: float):
+        """
+        Add an arc, including the points where it is farthest out.
+
+        Parameters
+        ----------
+        center_x : float
+            X-coordinate of the center.
+        center_y : float
+            Y-coordinate of the center.
+        radius : float
+            Radius of the arc, always positive.
+        start : float
+            Angle in degrees from the center to the current position.
+        sweep : float
+            Angle in degrees the arc covers, positive is counterclockwise.
+        x : float
+            X-coordinate of the end of the arc.
+        y : float
+            Y-coordinate of the end of the arc.
+
+        Returns
+        -------
+        None.
+
+        """
+        margin = self.__margin
+        self.add_point(*self.__point, margin)
+        self.add_point(x, y, margin)
+        self.__point = (x, y)
+
+        # the arc reaches out farthest at the multiples of 90 degrees
+        low = min(start, start + sweep)
+        high = max(start, start + sweep)
+        quarter = math.ceil(low / 90)
+        while quarter * 90 <= high and quarter * 90 - low < 360:
+            angle = math.radians(quarter * 90)
+            self.add_point(center_x + radius * math.cos(angle),
+                           center_y + radius * math.sin(angle), margin)
+            quarter += 1
+
+    def fill_begin(self, x: float, y: float):
+        """
+        Start a filled area.
+
+        Parameters
+        ----------
+        x : float
+            X-coordinate of the first point of the area.
+        y : float
+            Y-coordinate of the first point of the area.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.add_point(x, y)
+        self.__point = (x, y)
+        self.__filling = True
+
+    def fill_end(self, color: str):
+        """
+        End a filled area, which never reaches beyond its outline.
+
+        Parameters
+        ----------
+        color : str
+            Name of the color to fill with.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__filling = False
+
+
+def shape_bounds(shape, sub_shapes: bool = True):
+    """
+    Get the bounding box of a shape.
+
+    Parameters
+    ----------
+    shape : Shape
+        The shape.
+    sub_shapes : bool, optional
+        If True, the box contains the subshapes as well. The default is True.
+
+    Returns
+    -------
+    tuple
+        The box or None, if the shape draws nothing.
+
+    """
+    function = BOUNDS.get(type(shape))
+    if function is None:
+        if not sub_shapes and shape.sub_shapes:
+            shape = _without_sub_shapes(shape)
+        backend = BoundsBackend()
+        shape.draw(backend)
+        return backend.box
+
+    box = function(shape)
+    if sub_shapes:
+        for sub_shape in shape.sub_shapes:
+            box = union(box, shape_bounds(sub_shape))
+    return box
+
+
+def union(box, other):
+    """
+    Get the smallest box containing two boxes.
+
+    Parameters
+    ----------
+    box : tuple
+        The first box or None.
+    other : tuple
+        The second box or None.
+
+    Returns
+    -------
+    tuple
+        The box containing both or None, if both are None.
+
+    """
+    if box is None:
+        return other
+    if other is None:
+        return box
+    return (min(box[0], other[0]), min(box[1], other[1]),
+            max(box[2], other[2]), max(box[3], other[3]))
+
+
+def __walk_bounds(shape, steps) -> tuple:
+    """
+    Get the box of a shape drawn with straight lines only.
+
+    The turtle starts at the position of the shape with its heading, the
+    corners are calculated like the backends do.
+
+    Parameters
+    ----------
+    shape : Shape
+        The shape.
+    steps : list
+        (distance forward, angle to turn left afterwards) of every line.
+
+    Returns
+    -------
+    tuple
+        The box, including half the width of the border.
+
+    """
+    x = low_x = high_x = shape.x_pos
+    y = low_y = high_y = shape.y_pos
+    heading = shape.angle % 360
+    for distance, turn in steps:
+        direction = math.radians(heading)
+        x = x + distance * math.cos(direction)
+        y = y + distance * math.sin(direction)
+        low_x = min(low_x, x)
+        low_y = min(low_y, y)
+        high_x = max(high_x, x)
+        high_y = max(high_y, y)
+        heading = (heading + turn) % 360
+    margin = shape.border_width / 2
+    return (low_x - margin, low_y - margin, high_x + margin, high_y + margin)
+
+
+def __circle_bounds(shape) -> tuple:
+    """
+    Get the box of a circle.
+
+    Parameters
+    ----------
+    shape : Circle
+        The circle.
+
+    Returns
+    -------
+    tuple
+        The box or None, if the circle draws nothing.
+
+    """
+    radius = shape.radius
+    if radius == 0:
+        # only a filled circle covers its starting point
+        if shape.fill_color is None:
+            return None
+        return (shape.x_pos, shape.y_pos, shape.x_pos, shape.y_pos)
+    # the turtle starts right of the position, the center lies left of it
+    heading = math.radians(shape.angle % 360)
+    center_x = shape.x_pos + radius - radius * math.sin(heading)
+    center_y = shape.y_pos + radius * math.cos(heading)
+    reach = abs(radius) + shape.border_width / 2
+    return (center_x - reach, center_y - reach,
+            center_x + reach, center_y + reach)
+
+
+def __line_bounds(shape) -> tuple:
+    """
+    Get the box of a line.
+
+    Parameters
+    ----------
+    shape : Line
+        The line.
+
+    Returns
+    -------
+    tuple
+        The box.
+
+    """
+    return __walk_bounds(shape, ((shape.length, 0),))
+
+
+def __rectangle_bounds(shape) -> tuple:
+    """
+    Get the box of a rectangle.
+
+    Parameters
+    ----------
+    shape : Rectangle
+        The rectangle.
+
+    Returns
+    -------
+    tuple
+        The box.
+
+    """
+    return __walk_bounds(shape, ((shape.width, 90), (shape.height, 90)) * 2)
+
+
+def __triangle_bounds(shape) -> tuple:
+    """
+    Get the box of a triangle.
+
+    Parameters
+    ----------
+    shape : Triangle
+        The triangle.
+
+    Returns
+    -------
+    tuple
+        The box.
+
+    """
+    # the same angles as in the draw-method of the triangle
+    angle_right_corner = math.degrees(math.atan(shape.height
+                                                / (shape.length / 2)))
+    angle_top_corner = 2 * angle_right_corner
+    angle_right_corner = 180 - angle_right_corner
+    side_length = math.sqrt((shape.length / 2)**2 + (shape.height**2))
+    return __walk_bounds(shape, ((shape.length, angle_right_corner),
+                                 (side_length, angle_top_corner),
+                                 (side_length, 0)))
+
+
+def __parallelogram_bounds(shape) -> tuple:
+    """
+    Get the box of a parallelogram.
+
+    Parameters
+    ----------
+    shape : Parallelogram
+        The parallelogram.
+
+    Returns
+    -------
+    tuple
+        The box.
+
+    """
+    return __walk_bounds(shape, ((shape.length, shape.lower_right_angle),
+                                 (shape.side_length,
+                                  180 - shape.lower_right_angle)) * 2)
+
+
+# shapes with boxes calculated from their attributes, all others are drawn
+BOUNDS = {
+    shapes.Circle: __circle_bounds,
+    shapes.Line: __line_bounds,
+    shapes.Rectangle: __rectangle_bounds,
+    shapes.Triangle: __triangle_bounds,
+    shapes.Parallelogram: __parallelogram_bounds,
+}
+
+
+def _without_sub_shapes(shape):
+    """
+    Get a copy of a shape without its subshapes.
+
+    Parameters
+    ----------
+    shape : Shape
+        The shape.
+
+    Returns
+    -------
+    Shape
+        A copy sharing all other attributes.
+
+    """
+    alone = copy.copy(shape)
+    alone.sub_shapes = ()
+    return alone
+
+
+def intersects(box, other) -> bool:
+    """
+    Check if two boxes overlap.
+
+    Parameters
+    ----------
+    box : tuple
+        The first box.
+    other : tuple
+        The second box.
+
+    Returns
+    -------
+    bool
+        True if the boxes share at least one point.
+
+    """
+    return (box[0] <= other[2] and other[0] <= box[2]
+            and box[1] <= other[3] and other[1] <= box[3])
+
+
+def image_box(image) -> tuple:
+    """
+    Get the world coordinates of an image as a box.
+
+    Parameters
+    ----------
+    image : Image
+        The image.
+
+    Returns
+    -------
+    tuple
+        The visible area of the image.
+
+    """
+    return (image.lower_left_x, image.lower_left_y,
+            image.upper_right_x, image.upper_right_y)
+
+
+class GridIndex():
+    """
+    A uniform grid of cells, every cell knows the boxes overlapping it.
+
+    A query only looks at the cells overlapping the area asked for, so its
+    time depends on the size of this area and not on the number of boxes.
+    Boxes covering more than max_cells cells are not put into the cells,
+    they are kept in a list, which every query checks.
+    """
+
+    def __init__(self, cell_size: float, max_cells: int = 256):
+        """
+        Create a new, empty index.
+
+        Parameters
+        ----------
+        cell_size : float
+            Width and height of every cell.
+        max_cells : int, optional
+            Largest number of cells a box is put into. The default is 256.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.cell_size = cell_size
+        self.max_cells = max_cells
+        self.boxes = dict()
+        self.cells = dict()
+        # keys of the boxes too big for the cells
+        self.large = list()
+
+    def __cell_range(self, box):
+        """
+        Get the cells overlapping a box.
+
+        Parameters
+        ----------
+        box : tuple
+            The box.
+
+        Returns
+        -------
+        tuple
+            (first column, first row, last column, last row).
+
+        """
+        size = self.cell_size
+        return (math.floor(box[0] / size), math.floor(box[1] / size),
+                math.floor(box[2] / size), math.floor(box[3] / size))
+
+    def insert(self, key, box):
+        """
+        Add a box.
+
+        Parameters
+        ----------
+        key : hashable
+            Key returned by queries, like the index of a shape.
+        box : tuple
+            The box.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.boxes[key] = box
+        first_column, first_row, last_column, last_row = (
+            self.__cell_range(box))
+        if ((last_column - first_column + 1) * (last_row - first_row + 1)
+                > self.max_cells):
+            self.large.append(key)
+            return
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                self.cells.setdefault((column, row), list()).append(key)
+
+    def query(self, box) -> list:
+        """
+        Find all boxes intersecting an area.
+
+        Parameters
+        ----------
+        box : tuple
+            The area.
+
+        Returns
+        -------
+        list
+            Keys of the boxes found, sorted.
+
+        """
+        first_column, first_row, last_column, last_row = (
+            self.__cell_range(box))
+        cells = self.cells
+        # a wide area would mostly look at empty cells
+        if ((last_column - first_column + 1) * (last_row - first_row + 1)
+                > len(cells)):
+            candidates = (key for cell in cells.values() for key in cell)
+        else:
+            candidates = (key
+                          for column in range(first_column, last_column + 1)
+                          for row in range(first_row, last_row + 1)
+                          for key in cells.get((column, row), ()))
+        boxes = self.boxes
+        return sorted({key for key in itertools.chain(candidates, self.large)
+                       if intersects(boxes[key], box)})
+
+
+class SceneIndex():
+    """
+    The shapes of an image with their bounding boxes in a grid index.
+
+    The index is built once and can be used to draw any region of the image,
+    like tiles or zoomed views.
+    """
+
+    def __init__(self, image, cell_size: float = None):
+        """
+        Find the bounding boxes of all shapes directly below the image.
+
+        Parameters
+        ----------
+        image : Image
+            The image.
+        cell_size : float, optional
+            Width and height of the cells of the grid. The default is the
+            median size of the boxes, so a few huge boxes do not make the
+            cells of all others too big.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.image = image
+        boxes = [shape_bounds(shape) for shape in image.sub_shapes]
+        found = [box for box in boxes if box is not None]
+
+        if cell_size is None:
+            cell_size = 1.0
+            if found:
+                sizes = sorted(max(box[2] - box[0], box[3] - box[1])
+                               for box in found)
+                cell_size = max(1.0, sizes[len(sizes) // 2])
+        self.grid = GridIndex(cell_size)
+        for index, box in enumerate(boxes):
+            if box is not None:
+                self.grid.insert(index, box)
+
+    def visible_shapes(self, region=None) -> list:
+        """
+        Get the shapes which are at least partly inside of a region.
+
+        Parameters
+        ----------
+        region : tuple, optional
+            The region as a box. The default is the whole image.
+
+        Returns
+        -------
+        list
+            The shapes in the order they are drawn.
+
+        """
+        if region is None:
+            region = image_box(self.image)
+        sub_shapes = self.image.sub_shapes
+        return [sub_shapes[index] for index in self.grid.query(region)]
+
+    def draw(self, backend=None, region=None):
+        """
+        Draw a region of the image, skipping all shapes outside of it.
+
+        Parameters
+        ----------
+        backend : Backend, optional
+            Backend to draw with. The default draws with the turtle.
+        region : tuple, optional
+            The region as a box, which is drawn instead of the whole image.
+            The default is the whole image.
+
+        Returns
+        -------
+        None.
+
+        """
+        if backend is None:
+            backend = backends.TurtleBackend()
+        view = _without_sub_shapes(self.image)
+        if region is not None:
+            (view.lower_left_x, view.lower_left_y,
+             view.upper_right_x, view.upper_right_y) = region
+
+        backend.begin_image(view)
+        for shape in self.visible_shapes(image_box(view)):
+            shape.draw(backend)
+        backend.end_image(view)
@@ -0,0 +1,336 @@
+"""
+Backend exporting the shapes as a SVG-document (Scalable Vector Graphics).
+
+The moves of the turtle are written as path-segments and arcs. Every path is
+written into the file as soon as it is finished, so the whole document is
+never kept in memory.
+"""
+
+import html
+import math
+
+import backends
+
+
+def _number(value: float):
+    """
+    Format a coordinate for the SVG-document.
+
+    Parameters
+    ----------
+    value : float
+        The coordinate.
+
+    Returns
+    -------
+    str
+        The coordinate, rounded to three decimal places.
+
+    """
+    return f"{round(value, 3):g}"
+
+
+class SvgBackend(backends.Backend):
+    """Backend writing a SVG-document into a text-file."""
+
+    def __init__(self, file, max_segments: int = 1000):
+        """
+        Generate a new SVG-backend.
+
+        Parameters
+        ----------
+        file : file-object
+            File or buffer opened in text mode, the document is written to.
+        max_segments : int, optional
+            Number of segments after which a path is written, even if it
+            could be continued. The default is 1000.
+
+        Returns
+        -------
+        None.
+
+        """
+        super().__init__()
+        self.file = file
+        self.max_segments = max_segments
+
+        self.__style = ""
+        self.__stroke = list()
+        self.__needs_move = True
+        self.__point = (0.0, 0.0)
+        self.__fill = None
+        self.__fill_strokes = None
+
+    def begin_image(self, image):
+        """
+        Write the head of the document.
+
+        Parameters
+        ----------
+        image : Image
+            The image which will be drawn.
+
+        Returns
+        -------
+        None.
+
+        """
+        super().begin_image(image)
+        width = image.upper_right_x - image.lower_left_x
+        height = image.upper_right_y - image.lower_left_y
+
+        # the y-axis of SVG points downwards, so everything is mirrored
+        self.file.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" '
+            f'width="{_number(width)}" height="{_number(height)}" '
+            f'viewBox="{_number(image.lower_left_x)} '
+            f'{_number(-image.upper_right_y)} '
+            f'{_number(width)} {_number(height)}">\n')
+        if image.background_color is not None:
+            self.file.write(
+                f'<rect x="{_number(image.lower_left_x)}" '
+                f'y="{_number(-image.upper_right_y)}" '
+                f'width="{_number(width)}" height="{_number(height)}" '
+                f'fill="{html.escape(image.background_color)}"/>\n')
+        self.file.write('<g transform="scale(1,-1)" fill="none" '
+                        'stroke-linecap="round" stroke-linejoin="round">\n')
+
+    def end_image(self, image):
+        """
+        Write the rest of the document.
+
+        Parameters
+        ----------
+        image : Image
+            The image which was drawn.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.fill_end(None)
+        self.__write_stroke()
+        self.file.write("</g>\n</svg>\n")
+
+    def set_pen(self, color: str, width: float):
+        """
+        Set the style of the following lines and arcs.
+
+        Parameters
+        ----------
+        color : str
+            Name of the color.
+        width : float
+            Width of the pen.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.__fill is None:
+            self.__write_stroke()
+        else:
+            self.__end_stroke()
+        self.__style = (f'stroke="{html.escape(color)}" '
+                        f'stroke-width="{_number(width)}"')
+
+    def move_to(self, x: float, y: float):
+        """
+        Move to the given position without drawing.
+
+        Parameters
+        ----------
+        x : float
+            Target x-coordinate.
+        y : float
+            Target y-coordinate.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__point = (x, y)
+        self.__needs_move = True
+        if self.__fill is not None:
+            self.__fill.append(f"L{_number(x)} {_number(y)}")
+
+    def line_to(self, x: float, y: float):
+        """
+        Draw a straight line to the given position.
+
+        Parameters
+        ----------
+        x : float
+            Target x-coordinate.
+        y : float
+            Target y-coordinate.
+
+        Returns
+        -------
+        None.
+
+        """
+        segment = f"L{_number(x)} {_number(y)}"
+        self.__add_segment(segment)
+        self.__point = (x, y)
+        if self.__fill is not None:
+            self.__fill.append(segment)
+
+    def arc_to(self, center_x: float, center_y: float, radius: float,
+               start: float, sweep: float, x: float, y: float):
+        """
+        Draw an arc from the current position.
+
+        Parameters
+        ----------
+        center_x : float
+            X-coordinate of the center.
+        center_y : float
+            Y-coordinate of the center.
+        radius : float
+            Radius of the arc, always positive.
+        start : float
+            Angle in degrees from the center to the current position.
+        sweep : float
+            Angle in degrees the arc covers, positive is counterclockwise.
+        x : float
+            X-coordinate of the end of the arc.
+        y : float
+            Y-coordinate of the end of the arc.
+
+        Returns
+        -------
+        None.
+
+        """
+        # an arc in SVG can not end where it starts, so it is split in halves
+        if abs(sweep) > 180:
+            middle = math.radians(start + sweep / 2)
+            self.arc_to(center_x, center_y, radius, start, sweep / 2,
+                        center_x + radius * math.cos(middle),
+                        center_y + radius * math.sin(middle))
+            self.arc_to(center_x, center_y, radius, start + sweep / 2,
+                        sweep / 2, x, y)
+            return
+
+        segment = (f"A{_number(radius)} {_number(radius)} 0 0 "
+                   f"{1 if sweep > 0 else 0} {_number(x)} {_number(y)}")
+        self.__add_segment(segment)
+        self.__point = (x, y)
+        if self.__fill is not None:
+            self.__fill.append(segment)
+
+    def fill_begin(self, x: float, y: float):
+        """
+        Start an area which will be filled, starting at the given position.
+
+        Parameters
+        ----------
+        x : float
+            X-coordinate of the first point of the area.
+        y : float
+            Y-coordinate of the first point of the area.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__write_stroke()
+        self.__fill = [f"M{_number(x)} {_number(y)}"]
+        self.__fill_strokes = list()
+
+    def fill_end(self, color: str):
+        """
+        Write the filled area followed by the lines drawn meanwhile.
+
+        Parameters
+        ----------
+        color : str
+            Name of the color to fill with.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.__fill is None:
+            return
+        self.__end_stroke()
+        if color is not None and len(self.__fill) > 1:
+            self.file.write(f'<path d="{"".join(self.__fill)}Z" '
+                            f'fill="{html.escape(color)}" '
+                            f'fill-rule="evenodd" stroke="none"/>\n')
+        for stroke in self.__fill_strokes:
+            self.file.write(stroke)
+        self.__fill = None
+        self.__fill_strokes = None
+
+    def __add_segment(self, segment: str):
+        """
+        Add a segment to the current line.
+
+        Parameters
+        ----------
+        segment : str
+            The path-segment.
+
+        Returns
+        -------
+        None.
+
+        """
+        if len(self.__stroke) >= self.max_segments:
+            self.__end_stroke()
+        if self.__needs_move:
+            self.__needs_move = False
+            self.__stroke.append(f"M{_number(self.__point[0])} "
+                                 f"{_number(self.__point[1])}")
+        self.__stroke.append(segment)
+
+    def __end_stroke(self):
+        """
+        Finish the current line, while an area is filled.
+
+        The line is kept until the area is written.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.__fill is None:
+            self.__write_stroke()
+        elif self.__stroke:
+            self.__fill_strokes.append(self.__stroke_element())
+            self.__stroke = list()
+            self.__needs_move = True
+
+    def __write_stroke(self):
+        """
+        Write the current line into the file.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.__stroke:
+            self.file.write(self.__stroke_element())
+            self.__stroke = list()
+            self.__needs_move = True
+
+    def __stroke_element(self):
+        """
+        Get the current line as an element of the document.
+
+        Returns
+        -------
+        str
+            The path-element.
+
+        """
+        return f'<path d="{"".join(self.__stroke)}" {self.__style}/>\n'
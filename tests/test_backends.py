@@ -0,0 +1,225 @@
+"""
+Tests of the turtle-backends without a display.
+
+The turtle-module is replaced by a stand-in, which raises a Terminator after
+the window was closed, just like the real one.
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import backends  # noqa: E402
+import shapes  # noqa: E402
+
+
+class FakeTurtleModule():
+    """Stand-in for the turtle-module, counting the windows opened."""
+
+    class Terminator(Exception):
+        """Raised once, when the turtle is used after the window closed."""
+
+    def __init__(self):
+        """
+        Start without a window.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.running = True
+        self.window = None
+        self.windows_opened = 0
+
+    def getscreen(self):
+        """
+        Get the screen, opening a window if there is none.
+
+        Raises
+        ------
+        Terminator
+            Once after the window was closed.
+
+        Returns
+        -------
+        FakeWindow
+            The window.
+
+        """
+        if self.window is None:
+            if not self.running:
+                self.running = True
+                raise self.Terminator
+            self.window = FakeWindow()
+            self.windows_opened += 1
+        return self.window
+
+    def getturtle(self):
+        """
+        Get the turtle of the window.
+
+        Returns
+        -------
+        FakeWindow
+            The window, which draws as well.
+
+        """
+        return self.getscreen()
+
+    def done(self):
+        """
+        Wait for the user, which the stand-in does not.
+
+        Returns
+        -------
+        None.
+
+        """
+
+    def bye(self):
+        """
+        Close the window.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.getscreen().closed = True
+        self.window = None
+        self.running = False
+
+
+class FakeWindow():
+    """Screen and turtle of the stand-in, accepting every command."""
+
+    def __init__(self):
+        """
+        Open the window.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.closed = False
+        self.commands = list()
+
+    def __getattr__(self, name):
+        """
+        Get any command of the screen or the turtle.
+
+        Parameters
+        ----------
+        name : str
+            Name of the command.
+
+        Returns
+        -------
+        function
+            A function doing nothing, which fails on a closed window.
+
+        """
+        def command(*arguments, **keywords):
+            if self.closed:
+                raise RuntimeError(f"{name} called on a closed window")
+            self.commands.append(name)
+        return command
+
+
+class TurtleTestCase(unittest.TestCase):
+    """Baseclass of tests drawing with the stand-in of the turtle."""
+
+    def setUp(self):
+        """
+        Replace the turtle-module.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.turtle = FakeTurtleModule()
+        self.original = backends.turtle
+        backends.turtle = self.turtle
+
+    def tearDown(self):
+        """
+        Put the turtle-module back.
+
+        Returns
+        -------
+        None.
+
+        """
+        backends.turtle = self.original
+
+
+class TurtleBackendTest(TurtleTestCase):
+    """Tests of the turtle-backend."""
+
+    def test_shape_without_backend(self):
+        """
+        Draw a shape without a backend and without an image.
+
+        Returns
+        -------
+        None.
+
+        """
+        circle = shapes.Circle()
+        circle.x_pos = 5
+        circle.y_pos = 5
+        circle.radius = 10
+        circle.fill_color = "red"
+        circle.draw()
+        self.assertEqual(self.turtle.windows_opened, 1)
+        self.assertIn("circle", self.turtle.window.commands)
+        self.assertIn("end_fill", self.turtle.window.commands)
+
+
+class TurtleRendererTest(TurtleTestCase):
+    """Tests of the reusable turtle-renderer."""
+
+    def test_reopen(self):
+        """
+        Open, close and open a renderer again.
+
+        Returns
+        -------
+        None.
+
+        """
+        image = shapes.Image()
+        renderer = backends.TurtleRenderer()
+        renderer.open()
+        renderer.render(image)
+        renderer.close()
+
+        renderer.open()
+        renderer.render(image)
+        renderer.close()
+        self.assertEqual(self.turtle.windows_opened, 2)
+
+    def test_other_renderer_after_close(self):
+        """
+        Draw with a new renderer after another one was closed.
+
+        Returns
+        -------
+        None.
+
+        """
+        image = shapes.Image()
+        with backends.TurtleRenderer() as renderer:
+            renderer.render(image)
+        with backends.TurtleRenderer(fast=False) as renderer:
+            renderer.render(image)
+        self.assertEqual(self.turtle.windows_opened, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
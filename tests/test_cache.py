@@ -0,0 +1,118 @@
+"""Tests of the cache of parsed files."""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import cache  # noqa: E402
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "samples",
+                      "sample.tml")
+
+
+class SceneCacheTest(unittest.TestCase):
+    """Tests of the pickled shapes of a scene-cache."""
+
+    def setUp(self):
+        """
+        Create an empty directory for the pickled shapes.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.temporary = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temporary.name, "cache")
+
+    def tearDown(self):
+        """
+        Remove the directory.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.temporary.cleanup()
+
+    def test_shape_not_pickled(self):
+        """
+        Read a file, whose shapes are nested too deep to be pickled.
+
+        Returns
+        -------
+        None.
+
+        """
+        file_path = os.path.join(self.temporary.name, "deep.tml")
+        with open(file_path, "w") as file:
+            file.write("<image>"
+                       + "<circle><radius>1</radius>" * 3000
+                       + "</circle>" * 3000
+                       + "</image>")
+        scene_cache = cache.SceneCache(directory=self.directory)
+        image = scene_cache.read_tml(file_path)
+        self.assertEqual(len(image.sub_shapes), 1)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_threads_storing_one_file(self):
+        """
+        Store the shapes of the same file from many threads at once.
+
+        Returns
+        -------
+        None.
+
+        """
+        failures = list()
+
+        def read():
+            try:
+                cache.SceneCache(directory=self.directory).read_tml(SAMPLE)
+            except Exception as error:
+                failures.append(error)
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(failures, [])
+        files = os.listdir(self.directory)
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].endswith(".pickle"))
+
+        scene_cache = cache.SceneCache(directory=self.directory)
+        scene_cache.read_tml(SAMPLE)
+        self.assertEqual(scene_cache.disk_hits, 1)
+
+    def test_damaged_file(self):
+        """
+        Parse a file again, if its pickled shapes are damaged.
+
+        Returns
+        -------
+        None.
+
+        """
+        cache.SceneCache(directory=self.directory).read_tml(SAMPLE)
+        [name] = os.listdir(self.directory)
+        with open(os.path.join(self.directory, name), "wb") as file:
+            file.write(b"cbuiltins\nint\n(S'x'\ntR.")
+        scene_cache = cache.SceneCache(directory=self.directory)
+        scene_cache.read_tml(SAMPLE)
+        self.assertEqual(scene_cache.misses, 1)
+
+        scene_cache = cache.SceneCache(directory=self.directory)
+        scene_cache.read_tml(SAMPLE)
+        self.assertEqual(scene_cache.disk_hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
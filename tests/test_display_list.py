@@ -0,0 +1,68 @@
+"""Tests of compiled display lists, drawn without a display."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import cache  # noqa: E402
+import display_list  # noqa: E402
+import raster  # noqa: E402
+import tml_parser  # noqa: E402
+
+
+def circle(color: str, x_pos: int) -> str:
+    """
+    Get the text of a filled circle.
+
+    Parameters
+    ----------
+    color : str
+        Color to fill with.
+    x_pos : int
+        X-coordinate of the circle.
+
+    Returns
+    -------
+    str
+        The tag of the circle.
+
+    """
+    return (f"<circle><x_pos>{x_pos}</x_pos><y_pos>10</y_pos>"
+            f"<radius>8</radius><fill_color>{color}</fill_color></circle>")
+
+
+class PaletteTest(unittest.TestCase):
+    """Tests of the palettes of display lists."""
+
+    def test_palette_of_every_image(self):
+        """
+        Share a compiled shape between images with palettes of their own.
+
+        Returns
+        -------
+        None.
+
+        """
+        fragments = cache.LruCache(maxsize=16)
+        first = tml_parser.parse("<image>" + circle("red", 10) + "</image>")
+        second = tml_parser.parse("<image>" + circle("blue", 40)
+                                  + circle("red", 10) + "</image>")
+        display_list.compile_image(first, fragments)
+        compiled = display_list.compile_image(second, fragments)
+        self.assertEqual(len(fragments), 2)
+
+        self.assertNotIn("red", display_list.DisplayList().palette.values)
+        self.assertEqual([value for value in compiled.palette.values
+                          if isinstance(value, str)], ["blue", "red"])
+
+        drawn = raster.RasterBackend(100, 100)
+        second.draw(drawn)
+        replayed = raster.RasterBackend(100, 100)
+        compiled.draw(replayed)
+        self.assertEqual(replayed.pixels, drawn.pixels)
+
+
+if __name__ == "__main__":
+    unittest.main()
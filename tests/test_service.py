@@ -0,0 +1,93 @@
+"""Tests of the asynchronous service, running its jobs in threads."""
+
+import asyncio
+import concurrent.futures
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import service  # noqa: E402
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "samples",
+                      "sample.tml")
+
+
+class TurnTest(unittest.IsolatedAsyncioTestCase):
+    """Tests of the number of jobs running at once."""
+
+    def setUp(self):
+        """
+        Replace the parsing of the service by a job waiting for an event.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.started = 0
+        self.finish = threading.Event()
+        self.original = service._load
+        service._load = self.job
+        self.executor = concurrent.futures.ThreadPoolExecutor(2)
+
+    def tearDown(self):
+        """
+        Finish all jobs and put the parsing back.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.finish.set()
+        self.executor.shutdown()
+        service._load = self.original
+
+    def job(self, file_path: str, text: str):
+        """
+        Count the start of a job and wait until the jobs may finish.
+
+        Parameters
+        ----------
+        file_path : str
+            Path of the file.
+        text : str
+            Text of the file.
+
+        Returns
+        -------
+        int
+            Number of jobs started so far.
+
+        """
+        self.started += 1
+        self.finish.wait(10)
+        return self.started
+
+    async def test_timeout_keeps_turn(self):
+        """
+        Start no further job while a job, which timed out, still runs.
+
+        Returns
+        -------
+        None.
+
+        """
+        tml = service.TmlService(max_renders=1, executor=self.executor)
+        with self.assertRaises(asyncio.TimeoutError):
+            await tml.load_tml(SAMPLE, timeout=0.1)
+        waiting = asyncio.create_task(tml.load_tml(SAMPLE))
+        await asyncio.sleep(0.2)
+        self.assertEqual(self.started, 1)
+        self.assertFalse(waiting.done())
+
+        self.finish.set()
+        self.assertEqual(await asyncio.wait_for(waiting, 5), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Tests of the shapes, which are drawn into backends without a display."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import backends  # noqa: E402
+import spatial  # noqa: E402
+import tml_parser  # noqa: E402
+
+
+class WatchingBackend(backends.Backend):
+    """Backend checking a shape every time something is drawn."""
+
+    def __init__(self, shape):
+        """
+        Generate a backend watching a shape.
+
+        Parameters
+        ----------
+        shape : Shape
+            The shape, its position is remembered while drawing.
+
+        Returns
+        -------
+        None.
+
+        """
+        super().__init__()
+        self.shape = shape
+        self.positions = list()
+
+    def __watch(self, *arguments):
+        """
+        Remember the position of the shape.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.positions.append((self.shape.x_pos, self.shape.y_pos))
+
+    set_pen = move_to = line_to = arc_to = fill_begin = fill_end = __watch
+
+
+class UseTest(unittest.TestCase):
+    """Tests of the instances of definitions."""
+
+    TEXT = ("<image><define><name>dot</name><circle><x_pos>1</x_pos>"
+            "<y_pos>2</y_pos><radius>3</radius></circle></define>"
+            "<use><name>dot</name><x_pos>50</x_pos></use></image>")
+
+    def test_draw_keeps_definition(self):
+        """
+        Draw an instance without changing the shared shape, even meanwhile.
+
+        Returns
+        -------
+        None.
+
+        """
+        image = tml_parser.parse(self.TEXT)
+        definition, instance = image.sub_shapes
+        backend = WatchingBackend(definition.shape)
+        instance.draw(backend)
+        self.assertTrue(backend.positions)
+        self.assertEqual(set(backend.positions), {(1, 2)})
+
+    def test_draw_replaces_attributes(self):
+        """
+        Draw an instance at its own position.
+
+        Returns
+        -------
+        None.
+
+        """
+        image = tml_parser.parse(self.TEXT)
+        definition, instance = image.sub_shapes
+        self.assertEqual(spatial.shape_bounds(instance),
+                         (49.5, 1.5, 56.5, 8.5))
+        self.assertEqual(spatial.shape_bounds(definition.shape),
+                         (0.5, 1.5, 7.5, 8.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
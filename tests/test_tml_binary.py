@@ -0,0 +1,67 @@
+"""Tests of the compiled binary form of TML-files."""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import tml_binary  # noqa: E402
+
+
+class CompileTest(unittest.TestCase):
+    """Tests of compiling and loading files."""
+
+    def compile(self, x_pos: int):
+        """
+        Compile and load a file with a single circle.
+
+        Parameters
+        ----------
+        x_pos : int
+            X-coordinate of the circle.
+
+        Returns
+        -------
+        Shape
+            The circle loaded from the compiled file.
+
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "circle.tml")
+            output_path = os.path.join(directory, "circle.tmlc")
+            with open(file_path, "w") as file:
+                file.write(f"<image><circle><x_pos>{x_pos}</x_pos>"
+                           f"<y_pos>0</y_pos><radius>1</radius></circle>"
+                           f"</image>")
+            tml_binary.compile_file(file_path, output_path)
+            with tml_binary.load(output_path) as scene:
+                return scene.read().sub_shapes[0]
+
+    def test_largest_integer(self):
+        """
+        Load the largest integer stored exactly.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.assertEqual(self.compile(-2**53).x_pos, -2**53)
+
+    def test_integer_too_big(self):
+        """
+        Refuse an integer, which would change when it is loaded.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self.assertRaisesRegex(ValueError, "2\\*\\*53"):
+            self.compile(2**53 + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
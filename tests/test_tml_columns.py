@@ -0,0 +1,75 @@
+"""Tests of reading the attributes of shapes into NumPy-columns."""
+
+import os
+import sys
+import unittest
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import tml_columns  # noqa: E402
+import tml_parser  # noqa: E402
+
+
+@unittest.skipIf(tml_columns.numpy is None, "NumPy is not installed")
+class IntegerTest(unittest.TestCase):
+    """Tests of the conversion of integer attributes."""
+
+    # the upper case tag is read by the parser, not by the columns
+    TEXTS = ("<image><circle><x_pos>{}</x_pos><y_pos> +3 </y_pos>"
+             "<radius>1_0</radius></circle></image>",
+             "<image><CIRCLE><x_pos>{}</x_pos><y_pos> +3 </y_pos>"
+             "<radius>1_0</radius></CIRCLE></image>")
+
+    def test_like_parser(self):
+        """
+        Read the integers the parser accepts, without a deprecated call.
+
+        Returns
+        -------
+        None.
+
+        """
+        for text in self.TEXTS:
+            text = text.format(-2**53)
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                circle = tml_columns.ColumnarScene(text).read().sub_shapes[0]
+            parsed = tml_parser.parse(text).sub_shapes[0]
+            self.assertEqual((circle.x_pos, circle.y_pos, circle.radius),
+                             (parsed.x_pos, parsed.y_pos, parsed.radius))
+
+    def test_integer_too_big(self):
+        """
+        Refuse integers, which would change as float64.
+
+        Returns
+        -------
+        None.
+
+        """
+        for text in self.TEXTS:
+            for value in (2**53 + 1, 2**70):
+                with self.assertRaisesRegex(ValueError, "2\\*\\*53"):
+                    tml_columns.ColumnarScene(text.format(value))
+
+    def test_invalid_integer(self):
+        """
+        Report an invalid integer like the parser.
+
+        Returns
+        -------
+        None.
+
+        """
+        for value in ("", "1 2", "-", "5.5"):
+            text = self.TEXTS[0].format(value)
+            with self.assertRaises(ValueError) as parsed:
+                tml_parser.parse(text)
+            with self.assertRaises(ValueError) as read:
+                tml_columns.ColumnarScene(text)
+            self.assertEqual(str(read.exception), str(parsed.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
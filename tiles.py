@@ -0,0 +1,259 @@
+"""
+Rasterization of a single big picture in tiles on all processors.
+
+The image is compiled into a display list once. Its arrays and the finished
+picture are kept in shared memory, so the worker processes neither receive
+the shapes nor send back any pixels. Every worker draws the shapes
+overlapping its tile, found by their bounding boxes, and copies the tile
+straight into the shared picture. Only the drawing is parallel, the finished
+picture is encoded into a file by the calling process alone.
+"""
+
+import array
+import concurrent.futures
+from multiprocessing import shared_memory
+
+import display_list
+import raster
+import spatial
+
+
+def _share(data: bytes):
+    """
+    Copy data into a new block of shared memory.
+
+    Parameters
+    ----------
+    data : bytes
+        The data, like the bytes of an array.
+
+    Returns
+    -------
+    SharedMemory
+        The block, which has to be closed and unlinked by the caller.
+
+    """
+    block = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+    block.buf[:len(data)] = data
+    return block
+
+
+def _fill(buffer, pattern: bytes, size: int):
+    """
+    Repeat a pattern over the start of a buffer without building it first.
+
+    The part already filled is copied behind itself, so only a few copies
+    are needed.
+
+    Parameters
+    ----------
+    buffer : memoryview
+        The buffer, like the memory of a shared block.
+    pattern : bytes
+        The pattern, size has to be a multiple of its length.
+    size : int
+        Number of bytes to fill.
+
+    Returns
+    -------
+    None.
+
+    """
+    filled = min(len(pattern), size)
+    buffer[:filled] = pattern[:filled]
+    while filled < size:
+        count = min(filled, size - filled)
+        buffer[filled:filled + count] = buffer[:count]
+        filled += count
+
+
+# state of a worker process, set once by __start_worker
+__worker = None
+
+
+def __start_worker(names: dict, palette_values: list, view,
+                   image_width: int, image_height: int):
+    """
+    Attach a worker process to the shared memory.
+
+    Parameters
+    ----------
+    names : dict
+        (name of the block of shared memory, number of bytes used) by the
+        array it holds. A block can be bigger than asked for.
+    palette_values : list
+        Colors and pens of the display list.
+    view : Image
+        Image without shapes, which describes the area drawn.
+    image_width : int
+        Width of the whole picture in pixels.
+    image_height : int
+        Height of the whole picture in pixels.
+
+    Returns
+    -------
+    None.
+
+    """
+    global __worker
+    blocks = {name: shared_memory.SharedMemory(name=block_name)
+              for name, (block_name, size) in names.items()}
+    views = {name: blocks[name].buf[:size]
+             for name, (block_name, size) in names.items()}
+
+    palette = display_list.Palette()
+    for value in palette_values:
+        palette.intern(value)
+    compiled = display_list.DisplayList(palette)
+    compiled.operations = views["operations"].cast("B")
+    compiled.arguments = views["arguments"].cast("d")
+    compiled.shape_operations = views["shape_operations"].cast("q")
+    compiled.shape_arguments = views["shape_arguments"].cast("q")
+
+    # the blocks are kept, so the memory stays attached
+    __worker = (blocks, compiled, view, image_width, image_height)
+
+
+def __draw_tile(tile: tuple, shape_indices: bytes):
+    """
+    Draw a tile and copy it into the shared picture.
+
+    Parameters
+    ----------
+    tile : tuple
+        (left, top, right, bottom) of the tile in pixels.
+    shape_indices : bytes
+        Indices of the shapes overlapping the tile, as array of int64.
+
+    Returns
+    -------
+    None.
+
+    """
+    blocks, compiled, view, image_width, image_height = __worker
+    left, top, right, bottom = tile
+    columns = right - left
+
+    backend = raster.RasterBackend(columns, bottom - top)
+    backend.begin_tile(view, image_width, image_height, left, top)
+    for index in array.array("q", shape_indices):
+        compiled.replay_shape(backend, index)
+    backend.end_image(view)
+
+    picture = blocks["picture"].buf
+    pixels = memoryview(backend.pixels)
+    for row in range(bottom - top):
+        start = ((top + row) * image_width + left) * 3
+        picture[start:start + columns * 3] = (
+            pixels[row * columns * 3:(row + 1) * columns * 3])
+
+
+def render_tiled(image, width: int = None, height: int = None,
+                 tile_size: int = 1024, workers: int = None,
+                 region: tuple = None):
+    """
+    Rasterize an image in tiles in parallel processes.
+
+    Parameters
+    ----------
+    image : Image
+        The image to draw.
+    width : int, optional
+        Width of the picture in pixels. The default is the width of the
+        image in world coordinates.
+    height : int, optional
+        Height of the picture in pixels. The default is the height of the
+        image in world coordinates.
+    tile_size : int, optional
+        Width and height of every tile in pixels. The default is 1024.
+    workers : int, optional
+        Number of processes. The default is the number of processors.
+    region : tuple, optional
+        Part of the image to draw as (lower left x, lower left y,
+        upper right x, upper right y). The default is the whole image.
+
+    Returns
+    -------
+    RasterBackend
+        The backend holding the whole picture, which can be written into a
+        file. Encoding it, like with write, runs in this process only.
+
+    """
+    compiled = display_list.compile_image(image)
+    view = compiled.image
+    if region is not None:
+        (view.lower_left_x, view.lower_left_y,
+         view.upper_right_x, view.upper_right_y) = region
+    if width is None:
+        width = max(1, round(view.upper_right_x - view.lower_left_x))
+    if height is None:
+        height = max(1, round(view.upper_right_y - view.lower_left_y))
+    scale_x = width / (view.upper_right_x - view.lower_left_x)
+    scale_y = height / (view.upper_right_y - view.lower_left_y)
+
+    # the bounding boxes are found from the display list, so the geometry
+    # of the shapes is not calculated again
+    grid = None
+    for index in range(len(compiled.shape_operations)):
+        bounds = spatial.BoundsBackend()
+        compiled.replay_shape(bounds, index)
+        if bounds.box is None:
+            continue
+        if grid is None:
+            grid = spatial.GridIndex(tile_size / min(scale_x, scale_y))
+        grid.insert(index, bounds.box)
+
+    tasks = list()
+    for top in range(0, height, tile_size):
+        for left in range(0, width, tile_size):
+            tile = (left, top, min(width, left + tile_size),
+                    min(height, top + tile_size))
+            # one more pixel around the tile catches rounding at the borders
+            box = (view.lower_left_x + (tile[0] - 1) / scale_x,
+                   view.upper_right_y - (tile[3] + 1) / scale_y,
+                   view.lower_left_x + (tile[2] + 1) / scale_x,
+                   view.upper_right_y - (tile[1] - 1) / scale_y)
+            indices = grid.query(box) if grid is not None else []
+            tasks.append((tile, array.array("q", indices).tobytes()))
+
+    background = raster.to_rgb(view.background_color or "white")
+    blocks = dict()
+    try:
+        blocks["operations"] = _share(compiled.operations.tobytes())
+        blocks["arguments"] = _share(compiled.arguments.tobytes())
+        blocks["shape_operations"] = _share(
+            compiled.shape_operations.tobytes())
+        blocks["shape_arguments"] = _share(
+            compiled.shape_arguments.tobytes())
+        size = width * height * 3
+        blocks["picture"] = shared_memory.SharedMemory(create=True,
+                                                       size=size)
+        _fill(blocks["picture"].buf, bytes(background), size)
+        sizes = {name: len(values) * values.itemsize
+                 for name, values in (("operations", compiled.operations),
+                                      ("arguments", compiled.arguments),
+                                      ("shape_operations",
+                                       compiled.shape_operations),
+                                      ("shape_arguments",
+                                       compiled.shape_arguments))}
+        sizes["picture"] = size
+        names = {name: (block.name, sizes[name])
+                 for name, block in blocks.items()}
+
+        with concurrent.futures.ProcessPoolExecutor(
+                workers, initializer=__start_worker,
+                initargs=(names, compiled.palette.values, view, width,
+                          height)) as executor:
+            for future in [executor.submit(__draw_tile, *task)
+                           for task in tasks]:
+                future.result()
+
+        # the picture is handed over with a single copy, the shared block
+        # can not outlive this function
+        backend = raster.RasterBackend(width, height)
+        backend.pixels = bytearray(blocks["picture"].buf[:size])
+    finally:
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+    return backend
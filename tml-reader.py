@@ -4,234 +4,230 @@ TML-Reader-Module (Turtle-Markup-File).
 https://github.com/Johannes-Walter/tml-reader
 """
 
+import argparse
+import concurrent.futures
+import glob
+import logging
+import os
+import sys
+import time
+
+import backends
+import cache
+import display_list
+import profiling
+import raster
 import shapes
+import spatial
+import svg
+import tiles
+import tml_binary
+import tml_index
+import tml_parser
+import validator
+import watch
+
+
+def __read_tml(file_path: str, scene_cache: cache.SceneCache = None,
+               workers: int = 1):
+    """
+    Read the given TML.
 
+    The text is walked through only once by the tokenizer of the
+    tml_parser-module, which builds the shapes while reading.
 
-class Tag():
-    """
-    A Class which reads tag-pairs.
+    Parameters
+    ----------
+    file_path : str
+        Path to the File.
+    scene_cache : SceneCache, optional
+        Cache of parsed files, unchanged files are not parsed again.
+        The default parses the file every time.
+    workers : int, optional
+        Number of processes parsing a big file without a cache.
+        The default parses it in this process.
+
+    Returns
+    -------
+    Shape
+        The root shape of the file.
 
-    This class saves the position of the tags in a given text with their
-    starting/endig position and the name of the tag.
     """
+    if scene_cache is not None:
+        return scene_cache.read_tml(file_path)
+    return tml_parser.read_tml(file_path, workers)
 
-    def __init__(self):
-        """
-        Create a new tag.
-
-        Returns
-        -------
-        None.
-
-        """
-        self.opening_tag_start = None
-        self.opening_tag_end = None
-
-        self.tag_name = None
-
-        self.closing_tag_start = None
-        self.closing_tag_end = None
-
-    def find_tag(text: str, start: int, end: int):
-        """
-        Find the first tag-pair in the given text.
-
-        Parameters
-        ----------
-        text : str
-            Text which will be searched in.
-        start : int
-            Start index of the search.
-        end : int
-            Ending index of the search.
-
-        Returns
-        -------
-        tag : Tag
-            A tag-object containing all information or
-            None, if no tag is found.
-        """
-        # check if the end is after the beginnig
-        assert start <= end
-
-        tag = Tag()
-
-        # if there is no opening tag, there will be an error
-        # we will pass an "none" for no tag
-        try:
-            tag.__find_opening_tag(text, start, end)
-        except ValueError:
-            return None
-
-        tag.__find_closing_tag(text, tag.opening_tag_end, end)
-        if (tag.closing_tag_start is not None
-                and tag.closing_tag_end is not None):
-            return tag
-        else:
-            return None
-
-    def __find_opening_tag(self, text: str, start: int, end: int):
-        """
-        Find the first Tag in the Text.
-
-        Parameters
-        ----------
-        text : str
-            Text which will be searched in.
-        start : int
-            Start index of the search.
-        end : int
-            Ending index of the search.
-
-        Returns
-        -------
-        Tag
-            The tag which was worked on.
-
-        """
-        # find the index of the starting and closing tag and save them
-        self.opening_tag_start = text.index("<", start, end)
-        self.opening_tag_end = text.index(">", self.opening_tag_start, end)
-
-        # tag_name is saved without the tags ('<', '>')
-        self.tag_name = text[self.opening_tag_start + 1:
-                             self.opening_tag_end]
-        return self
-
-    def __find_closing_tag(self, text: str, start: int, end: int):
-        """
-        Find the closing tag in the given text.
-
-        Parameters
-        ----------
-        text : str
-            Text which will be searched in.
-        start : int
-            Start index of the search.
-        end : int
-            Ending index of the search.
-
-        Returns
-        -------
-        Tag
-            Returns the tag which was worked on.
-
-        """
-        assert self.tag_name != ""
-        opening_tag = f"<{self.tag_name}>"
-        closing_tag = f"</{self.tag_name}>"
-
-        level = 0
-        # scrutinize the text, looking for opening and closing tags
-        # if an opening tag is found, the level will increase to 1
-        # if it is a closing tag, the level will decrease
-        for index in range(start, end):
-            if text.startswith(opening_tag, index):
-                level += 1
-            if text.startswith(closing_tag, index):
-                # we found our tag if the level is 0, thus leaving the loop
-                if level == 0:
-                    self.closing_tag_start = index
-                    self.closing_tag_end = index + len(closing_tag)
-                    break
-                else:
-                    level -= 1
-        return self
-
-
-def __read_tml(file_path: str):
+
+def __load_image(file_path: str, scene_cache: cache.SceneCache = None,
+                 workers: int = 1):
     """
-    Read the given TML.
+    Get all shapes of a .tml file or of a compiled .tmlc file.
 
     Parameters
     ----------
     file_path : str
-        Path to the File.
+        Path of the file.
+    scene_cache : SceneCache, optional
+        Cache of parsed files. The default parses the file every time.
+    workers : int, optional
+        Number of processes parsing a big .tml file.
+        The default parses it in this process.
 
     Returns
     -------
-    None.
+    Shape
+        The root shape of the file.
 
     """
-    # open file with file reader
-    with open(file_path) as file:
-        text = file.read()
-        tag = Tag.find_tag(text, start=0, end=len(text))
+    if file_path.endswith(".tmlc"):
+        with tml_binary.load(file_path) as scene:
+            return scene.read()
+    return __read_tml(file_path, scene_cache, workers)
 
-        shape = shapes.get_shape(tag.tag_name)
 
-        # delegate everything else in the file to the find_elements-function
-        # to find all children in the code
-        __find_elements(text,
-                        shape,
-                        tag.opening_tag_end,
-                        tag.closing_tag_start)
-    return shape
-
-
-def __find_elements(text: str, shape, start: int, end: int):
+def draw_tml(file_path: str, backend=None,
+             scene_cache: cache.SceneCache = None, region: tuple = None,
+             workers: int = 1):
     """
-    Find all tags in the given text and append everything to the tag.
+    Draw the image contained in the given file.
 
     Parameters
     ----------
-    text : str
-        Text to search through.
-    shape : TYPE
-        Shape which will have all subshapes appended to.
-    start : int
-        Start index of the search.
-    end : int
-        Ending index of the search.
+    file_path : str
+        Path of the .tml file or of a compiled .tmlc file.
+    backend : Backend, optional
+        Backend to draw with. The default draws with the turtle.
+    scene_cache : SceneCache, optional
+        Cache of parsed files. The default parses the file every time.
+    region : tuple, optional
+        Part of the image to draw as (lower left x, lower left y,
+        upper right x, upper right y), shapes outside of it are skipped.
+        The default draws the whole image.
+    workers : int, optional
+        Number of processes parsing a big .tml file, None uses all
+        processors. The default parses it in this process.
 
     Returns
     -------
     None.
 
     """
-    tag = Tag.find_tag(text, start, end)
-    while tag:
-        # get the shape from the possible shapes
-        sub_shape = shapes.get_shape(tag.tag_name)
-        if sub_shape is not None:
-            shape.append_shape(sub_shape)
-        # if there is no shape, try to check the tag as attribute which belongs to shape
-        # this may appear an error, if the found tag is not valid
-        else:
-            shape.set_attribute(tag.tag_name,
-                                text[tag.opening_tag_end + 1:
-                                     tag.closing_tag_start])
+    profiler = profiling.ACTIVE
+    if profiler is not None and backend is None:
+        backend = backends.TurtleBackend()
+
+    if region is not None:
+        index = spatial.SceneIndex(__load_image(file_path, scene_cache,
+                                                 workers))
+        with profiling.drawing(backend):
+            index.draw(backend, region)
+    elif file_path.endswith(".tmlc"):
+        with tml_binary.load(file_path) as scene, profiling.drawing(backend):
+            scene.draw(backend)
+    elif profiler is not None:
+        profiler.draw(__read_tml(file_path, scene_cache, workers), backend)
+    else:
+        __read_tml(file_path, scene_cache, workers).draw(backend)
+
+
+def render_tml(file_path: str, file, file_format: str = "png",
+               width: int = None, height: int = None,
+               scene_cache: cache.SceneCache = None, region: tuple = None,
+               tile_size: int = None, workers: int = None):
+    """
+    Render the image contained in the given file without a display.
 
-        # find the next tag, start to search at the end of the current tag
-        __find_elements(text,
-                        sub_shape,
-                        tag.opening_tag_end,
-                        tag.closing_tag_start)
-        tag = Tag.find_tag(text, tag.closing_tag_end, end)
+    Without a region, the image is compiled into a display list and
+    replayed, the compiled shapes are kept in the cache of the
+    display_list-module.
+
+    Parameters
+    ----------
+    file_path : str
+        Path of the .tml file.
+    file : file-object
+        File or buffer opened in binary mode, the picture is written to.
+    file_format : str, optional
+        Either 'png' or 'ppm'. The default is 'png'.
+    width : int, optional
+        Width of the picture in pixels. The default is the width of the image.
+    height : int, optional
+        Height of the picture in pixels. The default is the height of the
+        image.
+    scene_cache : SceneCache, optional
+        Cache of parsed files. The default parses the file every time.
+    region : tuple, optional
+        Part of the image to render as (lower left x, lower left y,
+        upper right x, upper right y), shapes outside of it are skipped.
+        The default renders the whole image.
+    tile_size : int, optional
+        If given, the picture is split into tiles of this size in pixels,
+        which are rendered in parallel processes. The default renders the
+        whole picture in this process.
+    workers : int, optional
+        Number of processes for the tiles. The default is the number of
+        processors.
 
+    Returns
+    -------
+    None.
 
-def draw_tml(file_path: str):
     """
-    Draw the image contained in the given file.
+    if tile_size is not None:
+        image = __load_image(file_path, scene_cache)
+        with profiling.phase("draw/tiles", "draw"):
+            backend = tiles.render_tiled(image, width, height, tile_size,
+                                         workers, region)
+    elif region is None and profiling.ACTIVE is None:
+        # shapes compiled before, in this file or another one, are only
+        # replayed instead of calculated again
+        compiled = display_list.compile_image(
+            __load_image(file_path, scene_cache))
+        backend = raster.RasterBackend(width, height)
+        compiled.draw(backend)
+    else:
+        # regions skip the shapes outside and the profiler measures every
+        # shape, both need the shapes themselves
+        backend = raster.RasterBackend(width, height)
+        draw_tml(file_path, backend, scene_cache, region)
+    with profiling.phase("write"):
+        backend.write(file, file_format)
+
+
+def export_svg(file_path: str, file, scene_cache: cache.SceneCache = None,
+               region: tuple = None):
+    """
+    Export the image contained in the given file as SVG.
+
+    The document is written piece by piece while the shapes are drawn.
 
     Parameters
     ----------
     file_path : str
         Path of the .tml file.
+    file : file-object
+        File or buffer opened in text mode, the document is written to.
+    scene_cache : SceneCache, optional
+        Cache of parsed files. The default parses the file every time.
+    region : tuple, optional
+        Part of the image to export, shapes outside of it are skipped.
+        The default exports the whole image.
 
     Returns
     -------
     None.
 
     """
-    image = __read_tml(file_path)
-    image.draw()
+    draw_tml(file_path, svg.SvgBackend(file), scene_cache, region)
 
 
 def is_file_valid(file_path: str) -> bool:
     """
     Check if the given file should be readable by this parser and valid.
 
+    The file is only checked, no shapes are created. Use the validator-module
+    to find out what is wrong with an invalid file.
+
     Parameters
     ----------
     file_path : str
@@ -244,17 +240,491 @@ def is_file_valid(file_path: str) -> bool:
     """
     if not file_path.endswith(".tml"):
         return False
+    return not validator.validate_file(file_path)
+
+
+def find_files(patterns: list) -> list:
+    """
+    Find all .tml files matching the given paths.
+
+    Parameters
+    ----------
+    patterns : list
+        Paths of files or directories or glob-patterns. Directories are
+        searched recursively.
+
+    Returns
+    -------
+    list
+        Paths of all .tml files found, sorted and without duplicates.
+
+    """
+    file_paths = set()
+    for pattern in patterns:
+        for path in glob.glob(pattern, recursive=True) or [pattern]:
+            if os.path.isdir(path):
+                file_paths.update(glob.glob(os.path.join(path, "**", "*.tml"),
+                                            recursive=True))
+            else:
+                file_paths.add(path)
+    return sorted(file_paths)
+
+
+def __output_path(file_path: str, output_dir: str, file_format: str):
+    """
+    Get the path of the picture for the given file.
+
+    Parameters
+    ----------
+    file_path : str
+        Path of the .tml file.
+    output_dir : str
+        Directory for the picture or None, to put it next to the file.
+    file_format : str
+        Format of the picture, used as file extension.
+
+    Returns
+    -------
+    str
+        Path of the picture.
+
+    """
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    if output_dir is None:
+        output_dir = os.path.dirname(file_path)
+    return os.path.join(output_dir, f"{name}.{file_format}")
+
+
+# the turtle-window of this process, which is reused for all files
+__turtle_renderer = None
+
+
+def __get_turtle_renderer():
+    """
+    Get the turtle-renderer of this process, it is opened on the first use.
+
+    Returns
+    -------
+    TurtleRenderer
+        The renderer.
+
+    """
+    global __turtle_renderer
+    if __turtle_renderer is None:
+        __turtle_renderer = backends.TurtleRenderer()
+    return __turtle_renderer
+
+
+def __render_file(file_path: str, output_path: str, file_format: str,
+                  width: int, height: int, cache_dir: str = None,
+                  region: tuple = None, tile_size: int = None,
+                  workers: int = None, profile: bool = False):
+    """
+    Render a single file, catching all errors.
+
+    Parameters
+    ----------
+    file_path : str
+        Path of the .tml file.
+    output_path : str
+        Path of the picture.
+    file_format : str
+        Either 'png', 'ppm', 'svg' or 'ps'.
+    width : int
+        Width of the picture in pixels or None.
+    height : int
+        Height of the picture in pixels or None.
+    cache_dir : str, optional
+        Directory of a scene cache shared by all processes or None.
+    region : tuple, optional
+        Part of the images to render or None for the whole images. It is
+        not used for PostScript.
+    tile_size : int, optional
+        Size of the tiles rendered in parallel or None, to render the
+        picture in this process. Only used for PNG and PPM.
+    workers : int, optional
+        Number of processes for the tiles or None for all processors.
+    profile : bool, optional
+        If True, the rendering is measured by a profiler of its own.
+        The default measures nothing.
+
+    Returns
+    -------
+    tuple
+        (seconds needed, error message or None, measurements of the
+        profiler or None).
 
+    """
+    start = time.perf_counter()
+    profiler = profiling.enable() if profile else None
+    error = None
     try:
-        __read_tml(file_path)
-    except:
-        return False
-    return True
+        scene_cache = None
+        if cache_dir is not None:
+            scene_cache = cache.SceneCache(directory=cache_dir)
+        if file_format == "svg":
+            with open(output_path, "w") as file:
+                export_svg(file_path, file, scene_cache, region)
+        elif file_format == "ps":
+            renderer = __get_turtle_renderer()
+            if file_path.endswith(".tmlc"):
+                with tml_binary.load(file_path) as scene:
+                    renderer.render(scene, output_path)
+            else:
+                renderer.render(__read_tml(file_path, scene_cache),
+                                output_path)
+        else:
+            with open(output_path, "wb") as file:
+                render_tml(file_path, file, file_format, width, height,
+                           scene_cache, region, tile_size, workers)
+    except Exception as exception:
+        # a half written picture would look like a valid result
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        error = f"{type(exception).__name__}: {exception}"
+    seconds = time.perf_counter() - start
+
+    measurements = None
+    if profiler is not None:
+        profiling.disable()
+        measurements = profiler.to_dict()
+    return seconds, error, measurements
+
+
+def render_files(file_paths: list, output_dir: str = None,
+                 file_format: str = "png", workers: int = None,
+                 width: int = None, height: int = None,
+                 cache_dir: str = None, region: tuple = None,
+                 tile_size: int = None, profiler=None):
+    """
+    Render many files in parallel processes.
+
+    A file which can not be rendered does not stop the others. For very big
+    pictures, the files can be rendered one after another instead, each of
+    them split into tiles rendered in parallel.
+
+    Parameters
+    ----------
+    file_paths : list
+        Paths of the .tml files.
+    output_dir : str, optional
+        Directory for the pictures. The default puts every picture next to
+        its file.
+    file_format : str, optional
+        Either 'png', 'ppm', 'svg' or 'ps'. The default is 'png'. PostScript
+        is drawn by the turtle, every process reuses its window for all
+        files, but a display is needed.
+    workers : int, optional
+        Number of processes. The default is the number of processors.
+    width : int, optional
+        Width of the pictures in pixels. The default is the width of the
+        images.
+    height : int, optional
+        Height of the pictures in pixels. The default is the height of the
+        images.
+    cache_dir : str, optional
+        Directory of a scene cache, so files which did not change since the
+        last run are not parsed again. The default parses all files.
+    region : tuple, optional
+        Part of the images to render as (lower left x, lower left y,
+        upper right x, upper right y), shapes outside of it are skipped.
+        It is not used for PostScript. The default renders the whole
+        images.
+    tile_size : int, optional
+        If given, every PNG or PPM picture is split into tiles of this size
+        in pixels, which are rendered in parallel. The default renders every
+        picture in a single process.
+    profiler : Profiler, optional
+        If given, every file is measured and the measurements of all
+        processes are added to this profiler. The default measures nothing.
+
+    Yields
+    ------
+    tuple
+        (file path, path of the picture, seconds needed, error message or
+        None) for every file, in the order they are finished.
+
+    """
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    profile = profiler is not None
+    if tile_size is not None:
+        for file_path in file_paths:
+            output_path = __output_path(file_path, output_dir, file_format)
+            seconds, error, measurements = __render_file(
+                file_path, output_path, file_format, width, height,
+                cache_dir, region, tile_size, workers, profile)
+            if measurements is not None:
+                profiler.merge(measurements)
+            yield file_path, output_path, seconds, error
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        futures = dict()
+        for file_path in file_paths:
+            output_path = __output_path(file_path, output_dir, file_format)
+            future = executor.submit(__render_file, file_path, output_path,
+                                     file_format, width, height, cache_dir,
+                                     region, profile=profile)
+            futures[future] = (file_path, output_path)
+
+        for future in concurrent.futures.as_completed(futures):
+            file_path, output_path = futures[future]
+            try:
+                seconds, error, measurements = future.result()
+            except Exception as error:
+                # the process itself failed, e.g. because it was killed
+                seconds, error = 0.0, f"{type(error).__name__}: {error}"
+                measurements = None
+            if measurements is not None:
+                profiler.merge(measurements)
+            yield file_path, output_path, seconds, error
+
+
+def main(arguments: list = None) -> int:
+    """
+    Run the command line interface.
+
+    Parameters
+    ----------
+    arguments : list, optional
+        Command line arguments. The default are the arguments of the program.
+
+    Returns
+    -------
+    int
+        Exit code, 0 if everything worked.
+
+    """
+    argument_parser = argparse.ArgumentParser(
+        prog="tml-reader.py",
+        description="Draw and render TML-files (Turtle-Markup-File).")
+    argument_parser.add_argument(
+        "-v", "--verbose", action="store_true",
+        help="print the debug messages of all modules")
+    argument_parser.add_argument(
+        "--trace", action="append", default=[], metavar="SHAPE",
+        help="print every attribute set and the geometry of every shape "
+             "drawn of this type, can be given several times")
+    commands = argument_parser.add_subparsers(dest="command", required=True)
+
+    draw_command = commands.add_parser(
+        "draw", help="draw a file with turtle inside of a window")
+    draw_command.add_argument("file", help="path of the .tml file")
+    draw_command.add_argument(
+        "--fast", action="store_true",
+        help="turn off the animation and show the drawing at once")
+    draw_command.add_argument(
+        "--update-every", type=int, default=0,
+        help="with --fast, update the window every COUNT primitives")
+    draw_command.add_argument(
+        "--postscript",
+        help="save the drawing into a PostScript-file and close the window")
+    draw_command.add_argument(
+        "-j", "--workers", type=int, default=1,
+        help="parse a big file in this many processes, 0 uses all "
+             "processors, default is 1")
+    draw_command.add_argument(
+        "--profile", metavar="FILE",
+        help="write counters and timings into FILE, as a Chrome-trace if "
+             "it ends with .trace.json")
+
+    render_command = commands.add_parser(
+        "render", help="render many files in parallel without a display")
+    render_command.add_argument(
+        "paths", nargs="+",
+        help="files, directories or glob-patterns of .tml files")
+    render_command.add_argument(
+        "-o", "--output-dir",
+        help="directory for the pictures, default is next to the files")
+    render_command.add_argument(
+        "-f", "--format", choices=("png", "ppm", "svg", "ps"), default="png",
+        help="format of the pictures, default is png")
+    render_command.add_argument(
+        "-j", "--workers", type=int,
+        help="number of processes, default is the number of processors")
+    render_command.add_argument("--width", type=int,
+                                help="width of the pictures in pixels")
+    render_command.add_argument("--height", type=int,
+                                help="height of the pictures in pixels")
+    render_command.add_argument(
+        "--region", nargs=4, type=float,
+        metavar=("LLX", "LLY", "URX", "URY"),
+        help="render only this part of the images, skipping all shapes "
+             "outside of it")
+    render_command.add_argument(
+        "--tile-size", type=int,
+        help="split every picture into tiles of this size in pixels, "
+             "which are rendered in parallel")
+    render_command.add_argument(
+        "--cache-dir",
+        help="directory caching the parsed files between runs")
+    render_command.add_argument(
+        "--profile", metavar="FILE",
+        help="write counters and timings into FILE, as a Chrome-trace if "
+             "it ends with .trace.json")
+
+    compile_command = commands.add_parser(
+        "compile",
+        help="compile files into .tmlc files, which are loaded without "
+             "parsing")
+    compile_command.add_argument(
+        "paths", nargs="+",
+        help="files, directories or glob-patterns of .tml files")
+    compile_command.add_argument(
+        "-o", "--output-dir",
+        help="directory for the compiled files, default is next to the files")
+
+    validate_command = commands.add_parser(
+        "validate",
+        help="check many files in parallel without creating shapes")
+    validate_command.add_argument(
+        "paths", nargs="+",
+        help="files, directories or glob-patterns of .tml files")
+    validate_command.add_argument(
+        "-j", "--workers", type=int,
+        help="number of processes, default is the number of processors")
+
+    count_command = commands.add_parser(
+        "count",
+        help="count the tags of files by their type without building the "
+             "shapes")
+    count_command.add_argument(
+        "paths", nargs="+",
+        help="files, directories or glob-patterns of .tml files")
+
+    watch_command = commands.add_parser(
+        "watch",
+        help="render a file again whenever it changes, drawing only the "
+             "changed parts")
+    watch_command.add_argument("file", help="path of the .tml file")
+    watch_command.add_argument(
+        "-o", "--output",
+        help="path of the picture, default is a .png next to the file")
+    watch_command.add_argument("--width", type=int,
+                               help="width of the picture in pixels")
+    watch_command.add_argument("--height", type=int,
+                               help="height of the picture in pixels")
+    watch_command.add_argument(
+        "--interval", type=float, default=0.1,
+        help="seconds between two looks at the file, default is 0.1")
+
+    arguments = argument_parser.parse_args(arguments)
+
+    if arguments.verbose or arguments.trace:
+        logging.basicConfig(
+            level=logging.DEBUG if arguments.verbose else logging.WARNING,
+            format="%(name)s: %(message)s")
+    for shape_name in arguments.trace:
+        try:
+            shapes.trace_shape(shape_name)
+        except ValueError as error:
+            argument_parser.error(str(error))
+
+    if arguments.command == "draw":
+        profiler = None
+        if arguments.profile is not None:
+            profiler = profiling.enable()
+        try:
+            draw_tml(arguments.file,
+                     backends.TurtleBackend(arguments.fast,
+                                            arguments.update_every,
+                                            arguments.postscript),
+                     workers=arguments.workers or None)
+        finally:
+            if profiler is not None:
+                profiling.disable()
+                profiler.write(arguments.profile)
+        return 0
+
+    if arguments.command == "watch":
+        output_path = arguments.output
+        if output_path is None:
+            output_path = __output_path(arguments.file, None, "png")
+
+        def report(areas, seconds):
+            if areas is None:
+                print(f"{arguments.file} FAILED {seconds}")
+            else:
+                print(f"{seconds * 1000:8.1f}ms  {len(areas)} areas drawn "
+                      f"-> {output_path}")
+        try:
+            watch.watch(arguments.file, output_path, arguments.width,
+                        arguments.height, arguments.interval, report)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    file_paths = find_files(arguments.paths)
+    failed = 0
+
+    if arguments.command == "validate":
+        for file_path, diagnostics in validator.validate_files(
+                file_paths, arguments.workers):
+            if diagnostics:
+                failed += 1
+            for diagnostic in diagnostics:
+                print(f"{file_path}:{diagnostic}")
+        print(f"{len(file_paths) - failed} of {len(file_paths)} files "
+              f"are valid")
+        return 1 if failed else 0
+
+    if arguments.command == "count":
+        for file_path in file_paths:
+            try:
+                counts = tml_index.read_tml(file_path).counts()
+            except (OSError, ValueError) as error:
+                failed += 1
+                print(f"{file_path} FAILED {type(error).__name__}: {error}")
+                continue
+            tags = sum(counts.values())
+            # the root and the definitions and instances only hold shapes
+            holders = 1 + sum(number for tag, number in counts.items()
+                              if shapes.get_shape_class(tag)
+                              in (shapes.Definition, shapes.Use))
+            print(f"{file_path}: {tags} tags, {tags - holders} shapes")
+            for tag, number in sorted(counts.items()):
+                print(f"{number:10d}  {tag}")
+        return 1 if failed else 0
+
+    if arguments.command == "compile":
+        if arguments.output_dir is not None:
+            os.makedirs(arguments.output_dir, exist_ok=True)
+        for file_path in file_paths:
+            output_path = __output_path(file_path, arguments.output_dir,
+                                        "tmlc")
+            try:
+                tml_binary.compile_file(file_path, output_path)
+            except (OSError, ValueError) as error:
+                failed += 1
+                print(f"{file_path} FAILED {type(error).__name__}: {error}")
+            else:
+                print(f"{file_path} -> {output_path}")
+        print(f"compiled {len(file_paths) - failed} of {len(file_paths)} "
+              f"files")
+        return 1 if failed else 0
+
+    profiler = None
+    if arguments.profile is not None:
+        profiler = profiling.Profiler()
+    start = time.perf_counter()
+    for file_path, output_path, seconds, error in render_files(
+            file_paths, arguments.output_dir, arguments.format,
+            arguments.workers, arguments.width, arguments.height,
+            arguments.cache_dir, arguments.region, arguments.tile_size,
+            profiler):
+        if error is None:
+            print(f"{seconds:8.3f}s  {file_path} -> {output_path}")
+        else:
+            failed += 1
+            print(f"{seconds:8.3f}s  {file_path} FAILED {error}")
+    print(f"rendered {len(file_paths) - failed} of {len(file_paths)} files "
+          f"in {time.perf_counter() - start:.3f}s")
+    if profiler is not None:
+        profiler.write(arguments.profile)
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
-    #draw_tml("samples//lotus.tml")
-    #draw_tml("samples//sample.tml")
-    #draw_tml("samples//heart.tml")
-    #draw_tml("samples//house.tml")
-    draw_tml("samples//triangle.tml")
+    sys.exit(main())
@@ -0,0 +1,613 @@
+"""
+Pre-compiled binary form of TML-files, which is loaded without parsing.
+
+A compiled file contains the parsed shapes as flat arrays, so loading it only
+maps the file into memory. Shapes are built from the arrays when they are
+needed. All numbers are stored little-endian, the file is made of these
+sections, each starting at a multiple of 8 bytes:
+
+- header: magic, version and the sizes of the other sections
+- type table: for every shape type its tag and its attributes with their
+  kind, encoded as JSON
+- types: index into the type table for every shape (uint16)
+- ends: index after the last subshape for every shape (uint64)
+- value starts: index of the first attribute value for every shape (uint64)
+- values: the attributes of all shapes as float64, NaN for None, strings as
+  index into the string table. Integers are only stored up to 2**53, larger
+  ones would change.
+- string offsets and string data: the interned texts, like colors, in UTF-8
+
+The shapes are stored in the order of the file, every shape is followed by
+its subshapes. The root is the first shape.
+"""
+
+import array
+import json
+import math
+import mmap
+import struct
+import sys
+
+import backends
+import shapes
+import tml_parser
+
+
+MAGIC = b"TMLC"
+FORMAT_VERSION = 1
+
+# magic, version, shapes, values, bytes of the type table, strings,
+# bytes of the string data
+HEADER = struct.Struct("<4sHxxQQQQQ")
+
+# kinds of attributes by their converter
+KINDS = {int: "i", float: "f", str: "s"}
+
+# largest integer, which is stored exactly as float64
+MAX_INTEGER = 2**53
+
+
+def _padding(size: int) -> bytes:
+    """
+    Get the bytes needed after a section to start the next one aligned.
+
+    Parameters
+    ----------
+    size : int
+        Size of the section in bytes.
+
+    Returns
+    -------
+    bytes
+        Zero bytes up to the next multiple of 8.
+
+    """
+    return bytes(-size % 8)
+
+
+def _little_endian(values: array.array) -> array.array:
+    """
+    Get an array in little-endian byte order.
+
+    Parameters
+    ----------
+    values : array
+        Array in the byte order of the machine.
+
+    Returns
+    -------
+    array
+        The array itself or a swapped copy.
+
+    """
+    if sys.byteorder == "big":
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+class Writer():
+    """Collects shapes into the arrays of a compiled file."""
+
+    def __init__(self):
+        """
+        Create a new writer without any shapes.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.type_table = list()
+        self.types = array.array("H")
+        self.ends = array.array("Q")
+        self.value_starts = array.array("Q")
+        self.values = array.array("d")
+        self.strings = list()
+        self.__type_indices = dict()
+        self.__string_indices = dict()
+
+    def __type_index(self, shape_class: type) -> int:
+        """
+        Get the index of a shape type, adding it to the table if it is new.
+
+        Parameters
+        ----------
+        shape_class : type
+            Class of the shape.
+
+        Raises
+        ------
+        ValueError
+            If the shape is not registered or has an attribute, which can not
+            be stored.
+
+        Returns
+        -------
+        int
+            Index into the type table.
+
+        """
+        index = self.__type_indices.get(shape_class)
+        if index is not None:
+            return index
+
+        tag = next((name for name, registered in shapes.SHAPES.items()
+                    if registered is shape_class), None)
+        if tag is None:
+            raise ValueError(f"{shape_class.__name__} is not registered")
+        attributes = list()
+        for attribute in shape_class.attributes:
+            kind = KINDS.get(attribute.converter)
+            if kind is None:
+                raise ValueError(f"attribute '{attribute.name}' of "
+                                 f"{shape_class.__name__} can not be stored")
+            attributes.append((attribute.name, kind))
+
+        index = len(self.type_table)
+        self.type_table.append((tag, attributes))
+        self.__type_indices[shape_class] = index
+        return index
+
+    def __string_index(self, text: str) -> int:
+        """
+        Get the index of a text, adding it to the string table if it is new.
+
+        Parameters
+        ----------
+        text : str
+            The text.
+
+        Returns
+        -------
+        int
+            Index into the string table.
+
+        """
+        index = self.__string_indices.get(text)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(text)
+            self.__string_indices[text] = index
+        return index
+
+    def add(self, shape):
+        """
+        Add a shape with its subshapes.
+
+        Parameters
+        ----------
+        shape : Shape
+            The shape to add.
+
+        Raises
+        ------
+        ValueError
+            If the shape can not be stored.
+
+        Returns
+        -------
+        int
+            Index of the shape.
+
+        """
+        if isinstance(shape, shapes.Use):
+            # the format has no references, every instance is stored as a
+            # shape of its own
+            shape = shape.expand()
+        index = len(self.types)
+        self.types.append(0)
+        self.ends.append(0)
+        self.value_starts.append(0)
+        for sub_shape in shape.sub_shapes:
+            self.add(sub_shape)
+        self.set_values(index, shape)
+        self.ends[index] = len(self.types)
+        return index
+
+    def set_values(self, index: int, shape):
+        """
+        Store the type and the attributes of a shape already added.
+
+        Parameters
+        ----------
+        index : int
+            Index of the shape.
+        shape : Shape
+            The shape, its subshapes are not looked at.
+
+        Raises
+        ------
+        ValueError
+            If an integer is too big to be stored exactly.
+
+        Returns
+        -------
+        None.
+
+        """
+        type_index = self.__type_index(type(shape))
+        self.types[index] = type_index
+        self.value_starts[index] = len(self.values)
+        for name, kind in self.type_table[type_index][1]:
+            value = getattr(shape, name, None)
+            if value is None:
+                self.values.append(math.nan)
+            elif kind == "s":
+                self.values.append(self.__string_index(value))
+            else:
+                if kind == "i" and abs(value) > MAX_INTEGER:
+                    raise ValueError(f"{type(shape).__name__}: {name} "
+                                     f"{value} is larger than 2**53 and "
+                                     f"can not be stored exactly")
+                self.values.append(value)
+
+    def write(self, file):
+        """
+        Write the compiled file.
+
+        Parameters
+        ----------
+        file : file-object
+            File opened in binary mode.
+
+        Returns
+        -------
+        None.
+
+        """
+        type_table = json.dumps(self.type_table,
+                                separators=(",", ":")).encode()
+        string_data = bytearray()
+        string_offsets = array.array("Q", [0])
+        for text in self.strings:
+            string_data += text.encode()
+            string_offsets.append(len(string_data))
+
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(self.types),
+                               len(self.values), len(type_table),
+                               len(self.strings), len(string_data)))
+        for section in (type_table, self.types, self.ends, self.value_starts,
+                        self.values, string_offsets, string_data):
+            if isinstance(section, array.array):
+                section = _little_endian(section).tobytes()
+            file.write(section)
+            file.write(_padding(len(section)))
+
+
+def compile_file(file_path: str, output_path: str,
+                 chunk_size: int = 65536):
+    """
+    Parse a TML-file and write its compiled form.
+
+    The file is read piece by piece, only the arrays are kept in memory.
+
+    Parameters
+    ----------
+    file_path : str
+        Path of the .tml file.
+    output_path : str
+        Path of the compiled file.
+    chunk_size : int, optional
+        Number of characters to read at once. The default is 65536.
+
+    Raises
+    ------
+    ValueError
+        If the text is not a valid TML or can not be compiled.
+
+    Returns
+    -------
+    None.
+
+    """
+    writer = Writer()
+    parser = tml_parser.StreamParser()
+    # the root comes first, but its attributes may follow its subshapes,
+    # so they are only stored at the end
+    writer.types.append(0)
+    writer.ends.append(0)
+    writer.value_starts.append(0)
+    with open(file_path) as file:
+        for shape in parser.read(file, chunk_size):
+            writer.add(shape)
+    writer.set_values(0, parser.root)
+    writer.ends[0] = len(writer.types)
+
+    with open(output_path, "wb") as file:
+        writer.write(file)
+
+
+class CompiledScene():
+    """
+    A compiled file mapped into memory.
+
+    The arrays can be used directly, like types, ends and values. They are
+    memoryviews of the file, so they are not copied. Shapes are only built
+    when they are asked for.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        Map a compiled file into memory.
+
+        Parameters
+        ----------
+        file_path : str
+            Path of the compiled file.
+
+        Raises
+        ------
+        ValueError
+            If the file is no compiled TML or of another version.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__views = ()
+        with open(file_path, "rb") as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.__read_sections()
+        except (ValueError, TypeError, struct.error):
+            self.close()
+            raise
+
+    def __read_sections(self):
+        """
+        Find the sections of the file.
+
+        Raises
+        ------
+        ValueError
+            If the file is no compiled TML or of another version.
+
+        Returns
+        -------
+        None.
+
+        """
+        (magic, version, shape_count, value_count, type_table_size,
+         string_count, string_size) = HEADER.unpack_from(self.__map)
+        if magic != MAGIC:
+            raise ValueError("file is no compiled TML")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"compiled TML of version {version} can not "
+                             f"be read")
+        if sys.byteorder == "big":
+            raise ValueError("compiled TML can only be mapped on "
+                             "little-endian machines")
+
+        view = memoryview(self.__map)
+        position = HEADER.size
+
+        def section(size, typecode=None):
+            nonlocal position
+            part = view[position:position + size]
+            if len(part) != size:
+                raise ValueError("compiled TML is cut off")
+            position += size + (-size % 8)
+            return part if typecode is None else part.cast(typecode)
+
+        type_table = json.loads(bytes(section(type_table_size)))
+        self.types = section(2 * shape_count, "H")
+        self.ends = section(8 * shape_count, "Q")
+        self.value_starts = section(8 * shape_count, "Q")
+        self.values = section(8 * value_count, "d")
+        self.__string_offsets = section(8 * (string_count + 1), "Q")
+        self.__string_data = section(string_size)
+        self.__views = (view, self.types, self.ends, self.value_starts,
+                        self.values, self.__string_offsets,
+                        self.__string_data)
+
+        # the classes and attributes as (name, kind) for every type
+        self.type_table = list()
+        for tag, attributes in type_table:
+            shape_class = shapes.get_shape_class(tag)
+            if shape_class is None:
+                raise ValueError(f"shape <{tag}> is not known")
+            self.type_table.append((shape_class, attributes))
+        self.__strings = [None] * string_count
+
+    def close(self):
+        """
+        Release the memory map, no shapes can be built afterwards.
+
+        Returns
+        -------
+        None.
+
+        """
+        for view in self.__views:
+            view.release()
+        self.__views = ()
+        self.__map.close()
+
+    def __enter__(self):
+        """
+        Use the scene in a with-statement, which closes it at the end.
+
+        Returns
+        -------
+        CompiledScene
+            The scene itself.
+
+        """
+        return self
+
+    def __exit__(self, *exception):
+        """
+        Close the scene at the end of a with-statement.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.close()
+
+    def __len__(self):
+        """
+        Get the number of shapes, including the root.
+
+        Returns
+        -------
+        int
+            Number of shapes.
+
+        """
+        return len(self.types)
+
+    def string(self, index: int) -> str:
+        """
+        Get a text of the string table.
+
+        Parameters
+        ----------
+        index : int
+            Index into the string table.
+
+        Returns
+        -------
+        str
+            The text.
+
+        """
+        text = self.__strings[index]
+        if text is None:
+            offsets = self.__string_offsets
+            text = str(self.__string_data[offsets[index]:offsets[index + 1]],
+                       "utf-8")
+            self.__strings[index] = text
+        return text
+
+    def children(self, index: int):
+        """
+        Get the indices of the shapes directly below a shape.
+
+        Parameters
+        ----------
+        index : int
+            Index of the shape.
+
+        Yields
+        ------
+        int
+            Index of every subshape, without their subshapes.
+
+        """
+        ends = self.ends
+        child = index + 1
+        end = ends[index]
+        while child < end:
+            yield child
+            child = ends[child]
+
+    def shape(self, index: int, sub_shapes: bool = True):
+        """
+        Build a shape from the arrays.
+
+        Parameters
+        ----------
+        index : int
+            Index of the shape, 0 is the root.
+        sub_shapes : bool, optional
+            If False, the subshapes are not built. The default is True.
+
+        Returns
+        -------
+        Shape
+            The new shape.
+
+        """
+        shape_class, attributes = self.type_table[self.types[index]]
+        shape = shape_class()
+        values = self.values
+        position = self.value_starts[index]
+        for name, kind in attributes:
+            value = values[position]
+            position += 1
+            if value != value:
+                # NaN stands for None
+                value = None
+            elif kind == "i":
+                value = int(value)
+            elif kind == "s":
+                value = self.string(int(value))
+            setattr(shape, name, value)
+
+        if sub_shapes:
+            for child in self.children(index):
+                shape.append_shape(self.shape(child))
+        return shape
+
+    def iter_shapes(self):
+        """
+        Build the shapes directly below the root one after another.
+
+        Yields
+        ------
+        Shape
+            Every shape below the root with its subshapes.
+
+        """
+        for child in self.children(0):
+            yield self.shape(child)
+
+    def read(self):
+        """
+        Build all shapes.
+
+        Returns
+        -------
+        Shape
+            The root shape with all its subshapes.
+
+        """
+        return self.shape(0)
+
+    def draw(self, backend=None):
+        """
+        Draw the scene, building only one shape below the root at a time.
+
+        Parameters
+        ----------
+        backend : Backend, optional
+            Backend to draw with. The default draws with the turtle.
+
+        Returns
+        -------
+        None.
+
+        """
+        root = self.shape(0, sub_shapes=False)
+        if not isinstance(root, shapes.Image):
+            self.read().draw(backend)
+            return
+
+        if backend is None:
+            backend = backends.TurtleBackend()
+        backend.begin_image(root)
+        for shape in self.iter_shapes():
+            shape.draw(backend)
+        backend.end_image(root)
+
+
+def load(file_path: str) -> CompiledScene:
+    """
+    Map a compiled file into memory.
+
+    Parameters
+    ----------
+    file_path : str
+        Path of the compiled file.
+
+    Returns
+    -------
+    CompiledScene
+        The scene, its shapes are built when needed.
+
+    """
+    return CompiledScene(file_path)
@@ -0,0 +1,523 @@
+"""
+Attributes of all shapes of a TML-text as columns, converted with NumPy.
+
+Instead of building a shape for every tag and converting every attribute on
+its own, the values of every attribute tag are collected from the whole
+text by one regular expression, assigned to the shapes owning them and
+converted column by column in one call. The result is one table per type of
+shape with a NumPy-array for every attribute:
+
+    scene = tml_columns.read_tml("stars.tml")
+    circles = scene.tables["circle"]
+    circles.columns["radius"].mean()
+
+Numbers are stored as float64, NaN stands for None like in compiled .tmlc
+files. Integers larger than 2**53 would change, so they are refused with a
+ValueError, like when compiling a .tmlc file. Texts are stored in arrays of
+objects. The shapes can still be built from the columns with read.
+
+Texts with tags in unusual spelling, definitions, instances or errors are
+read by tml_parser and copied into the columns, so every text is read just
+like by the parser and every error is reported the same way.
+
+NumPy is needed by all functions of this module.
+"""
+
+import re
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import shapes
+import tml_parser
+
+
+# largest integer, which is stored exactly as float64
+MAX_INTEGER = 2**53
+
+
+def _require_numpy():
+    """
+    Make sure NumPy can be used.
+
+    Raises
+    ------
+    ImportError
+        If NumPy is not installed.
+
+    Returns
+    -------
+    None.
+
+    """
+    if numpy is None:
+        raise ImportError("the tml_columns-module needs NumPy, which is "
+                          "missing")
+
+
+def _check_integers(low: int, high: int):
+    """
+    Make sure the integers between two values are stored exactly.
+
+    Parameters
+    ----------
+    low : int
+        The smallest integer.
+    high : int
+        The largest integer.
+
+    Raises
+    ------
+    ValueError
+        If one of them is larger than 2**53.
+
+    Returns
+    -------
+    None.
+
+    """
+    for value in (low, high):
+        if abs(value) > MAX_INTEGER:
+            raise ValueError(f"integer {value} is larger than 2**53 and can "
+                             f"not be stored exactly")
+
+
+def _integers(values) -> "numpy.ndarray":
+    """
+    Convert the texts of an integer attribute in one call.
+
+    NumPy converts every text just like int, so it accepts and refuses
+    exactly the same texts as the parser.
+
+    Parameters
+    ----------
+    values : list
+        The texts of the values.
+
+    Raises
+    ------
+    ValueError
+        If a text is no integer or the integer is larger than 2**53.
+
+    Returns
+    -------
+    ndarray
+        The values as floats.
+
+    """
+    try:
+        column = numpy.array(values, dtype=numpy.int64)
+    except (ValueError, OverflowError):
+        # int reports the first invalid text like the parser, the others
+        # are too big for int64
+        column = [int(value) for value in values]
+    if len(values):
+        _check_integers(numpy.min(column), numpy.max(column))
+    return numpy.array(column, dtype=float)
+
+
+def _convert(converter, values) -> "numpy.ndarray":
+    """
+    Convert the texts of an attribute into a column.
+
+    Parameters
+    ----------
+    converter : callable
+        Converter of the attribute, like int.
+    values : list
+        The texts of the values.
+
+    Raises
+    ------
+    ValueError
+        If a text can not be converted.
+
+    Returns
+    -------
+    ndarray
+        The values, floats for numbers and objects for texts.
+
+    """
+    if converter is int:
+        return _integers(values)
+    if converter is str:
+        return numpy.array(values, dtype=object)
+    return numpy.array([converter(value) for value in values], dtype=float)
+
+
+class ShapeColumns():
+    """The attributes of all shapes of one type as columns."""
+
+    def __init__(self, shape_class: type, indices):
+        """
+        Create columns holding the default values of the attributes.
+
+        Parameters
+        ----------
+        shape_class : type
+            Class of the shapes.
+        indices : array_like
+            Index of every shape in the scene, in the order of the text.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.shape_class = shape_class
+        self.indices = numpy.asarray(indices, dtype=numpy.int64)
+        self.columns = dict()
+        defaults = shape_class()
+        for attribute in shape_class.attributes:
+            default = getattr(defaults, attribute.name)
+            if attribute.converter is str:
+                column = numpy.full(len(self.indices), default, dtype=object)
+            else:
+                column = numpy.full(len(self.indices),
+                                    numpy.nan if default is None else default,
+                                    dtype=float)
+            self.columns[attribute.name] = column
+
+    def __len__(self):
+        """
+        Get the number of shapes.
+
+        Returns
+        -------
+        int
+            Number of shapes.
+
+        """
+        return len(self.indices)
+
+    def shape(self, row: int):
+        """
+        Build one of the shapes, without its subshapes.
+
+        Parameters
+        ----------
+        row : int
+            Index of the shape in the columns.
+
+        Returns
+        -------
+        Shape
+            The new shape.
+
+        """
+        shape = self.shape_class()
+        for attribute in self.shape_class.attributes:
+            value = self.columns[attribute.name][row]
+            if attribute.converter is not str:
+                if value != value:
+                    # NaN stands for None
+                    value = None
+                elif attribute.converter is int:
+                    value = int(value)
+            setattr(shape, attribute.name, value)
+        return shape
+
+
+class ColumnarScene():
+    """
+    The shapes of a TML-text as one table of columns for every type.
+
+    The arrays types and parents describe the tree: for every shape in the
+    order of the text the index of its tag in tag_names and the index of the
+    shape it is inside of, -1 for the root. tables holds the columns of all
+    shapes by their tag, definitions and instances have none.
+    """
+
+    # shapes without columns, they can only be built by the parser
+    LINKED = (shapes.Definition, shapes.Use)
+
+    def __init__(self, text: str):
+        """
+        Read all attributes of a text into columns.
+
+        Parameters
+        ----------
+        text : str
+            The TML-text.
+
+        Raises
+        ------
+        ImportError
+            If NumPy is not installed.
+        ValueError
+            If the text is not a valid TML.
+
+        Returns
+        -------
+        None.
+
+        """
+        _require_numpy()
+        self.text = text
+        self.tag_names = list()
+        self.types = None
+        self.parents = None
+        self.tables = dict()
+        # the parsed shapes, if the text could not be read into columns
+        self.__root = None
+        if not self.__read_columns():
+            self.__read_shapes()
+
+    def __read_columns(self) -> bool:
+        """
+        Read the text into columns without building any shape.
+
+        Returns
+        -------
+        bool
+            False, if the text has to be read by the parser instead.
+
+        """
+        text = self.text
+        tag_pattern = re.compile("<(/?)(" + "|".join(
+            re.escape(name) for name in shapes.SHAPES) + ")>")
+
+        # the shapes, only their tags are looked at one by one
+        tag_names = self.tag_names
+        name_indices = dict()
+        types = list()
+        starts = list()
+        stops = list()
+        parents = list()
+        stack = list()
+        first = text.find("<")
+        end = None
+        for match in tag_pattern.finditer(text):
+            closing, name = match.groups()
+            if not stack and (types or closing or match.start() != first):
+                return False
+            if closing:
+                index = stack.pop()
+                if tag_names[types[index]] != name:
+                    return False
+                stops[index] = match.start()
+                if not stack:
+                    end = match.end()
+                    break
+                continue
+            name_index = name_indices.get(name)
+            if name_index is None:
+                if issubclass(shapes.SHAPES[name], self.LINKED):
+                    return False
+                name_index = name_indices[name] = len(tag_names)
+                tag_names.append(name)
+            parents.append(stack[-1] if stack else -1)
+            stack.append(len(types))
+            types.append(name_index)
+            starts.append(match.end())
+            stops.append(-1)
+        if end is None:
+            return False
+
+        self.types = numpy.array(types, dtype=numpy.int64)
+        self.parents = numpy.array(parents, dtype=numpy.int64)
+        starts = numpy.array(starts, dtype=numpy.int64)
+        stops = numpy.array(stops, dtype=numpy.int64)
+        shape_classes = [shapes.SHAPES[name] for name in tag_names]
+        # index of every shape inside of the table of its type
+        rows = numpy.zeros(len(types), dtype=numpy.int64)
+        for name_index, name in enumerate(tag_names):
+            indices = numpy.flatnonzero(self.types == name_index)
+            rows[indices] = numpy.arange(len(indices))
+            self.tables[name] = ShapeColumns(shape_classes[name_index],
+                                             indices)
+
+        # every tag found has to be a shape or an attribute, otherwise the
+        # parser has to find the error
+        tags = 2 * len(types)
+        found = dict()
+        for tag in set().union(*(shape_class.attribute_table
+                                 for shape_class in shape_classes)):
+            if text.find(f"<{tag}>", first, end) == -1:
+                continue
+            pattern = re.compile(f"<{re.escape(tag)}>([^<]*)"
+                                 f"</{re.escape(tag)}>")
+            values = numpy.array(pattern.findall(text, first, end),
+                                 dtype=object)
+            positions = numpy.fromiter(
+                map(re.Match.start, pattern.finditer(text, first, end)),
+                dtype=numpy.int64, count=len(values))
+            tags += 2 * len(values)
+
+            # the owner is the last shape opened before the attribute, or
+            # the one it is inside of, if it was closed already
+            owners = numpy.searchsorted(starts, positions, "right") - 1
+            if len(owners) and owners.min() < 0:
+                return False
+            closed = stops[owners] < positions
+            while closed.any():
+                owners[closed] = self.parents[owners[closed]]
+                if owners.min() < 0:
+                    return False
+                closed = stops[owners] < positions
+
+            owner_types = self.types[owners]
+            for name_index in numpy.unique(owner_types):
+                attribute = shape_classes[name_index].attribute_table.get(tag)
+                if attribute is None:
+                    return False
+                selected = owner_types == name_index
+                found.setdefault((name_index, attribute), list()).append(
+                    (positions[selected], rows[owners[selected]],
+                     values[selected]))
+        if tags != text.count("<", first, end):
+            return False
+
+        for (name_index, attribute), parts in found.items():
+            positions, owner_rows, values = (
+                numpy.concatenate(part) for part in zip(*parts))
+            # a value set later replaces an earlier one of the same shape,
+            # like by its alias
+            order = numpy.argsort(positions, kind="stable")
+            column = self.tables[tag_names[name_index]].columns[
+                attribute.name]
+            column[owner_rows[order]] = _convert(attribute.converter,
+                                                 list(values[order]))
+        return True
+
+    def __read_shapes(self):
+        """
+        Parse the text and copy the attributes of the shapes into columns.
+
+        Raises
+        ------
+        ValueError
+            If the text is not a valid TML.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.tag_names.clear()
+        self.tables.clear()
+        root = tml_parser.parse(self.text)
+
+        # the shapes in the order of the text, every shape followed by its
+        # subshapes
+        found = list()
+        parents = list()
+        pending = [(root, -1)]
+        while pending:
+            shape, parent = pending.pop()
+            parents.append(parent)
+            found.append(shape)
+            index = len(found) - 1
+            pending.extend((sub_shape, index)
+                           for sub_shape in reversed(shape.sub_shapes))
+
+        # the tags of the shapes are not kept, the one of their class is used
+        class_names = {shape_class: name
+                       for name, shape_class in shapes.SHAPES.items()}
+        name_indices = dict()
+        types = list()
+        for shape in found:
+            name = class_names[type(shape)]
+            name_index = name_indices.get(name)
+            if name_index is None:
+                name_index = name_indices[name] = len(self.tag_names)
+                self.tag_names.append(name)
+            types.append(name_index)
+        self.types = numpy.array(types, dtype=numpy.int64)
+        self.parents = numpy.array(parents, dtype=numpy.int64)
+
+        for name_index, name in enumerate(self.tag_names):
+            indices = numpy.flatnonzero(self.types == name_index)
+            shape_class = type(found[indices[0]])
+            if issubclass(shape_class, self.LINKED):
+                continue
+            table = ShapeColumns(shape_class, indices)
+            for attribute in shape_class.attributes:
+                values = [getattr(found[index], attribute.name)
+                          for index in indices]
+                if attribute.converter is str:
+                    table.columns[attribute.name][:] = values
+                    continue
+                if attribute.converter is int:
+                    integers = [value for value in values
+                                if value is not None]
+                    if integers:
+                        _check_integers(min(integers), max(integers))
+                table.columns[attribute.name][:] = [
+                    numpy.nan if value is None else value
+                    for value in values]
+            self.tables[name] = table
+        self.__root = root
+
+    def __len__(self):
+        """
+        Get the number of shapes, including the root.
+
+        Returns
+        -------
+        int
+            Number of shapes.
+
+        """
+        return len(self.types)
+
+    def counts(self) -> dict:
+        """
+        Count the shapes by their tag.
+
+        Returns
+        -------
+        dict
+            Number of shapes by their tag, including the root.
+
+        """
+        numbers = numpy.bincount(self.types, minlength=len(self.tag_names))
+        return dict(zip(self.tag_names, numbers.tolist()))
+
+    def read(self):
+        """
+        Build all shapes from the columns.
+
+        Texts, which could not be read into columns, are not built again,
+        the shapes of the parser are returned.
+
+        Returns
+        -------
+        Shape
+            The root shape with all its subshapes.
+
+        """
+        if self.__root is not None:
+            return self.__root
+        tables = [self.tables[name] for name in self.tag_names]
+        rows = [0] * len(tables)
+        built = list()
+        for name_index, parent in zip(self.types.tolist(),
+                                      self.parents.tolist()):
+            shape = tables[name_index].shape(rows[name_index])
+            rows[name_index] += 1
+            if parent != -1:
+                built[parent].append_shape(shape)
+            built.append(shape)
+        return built[0]
+
+
+def read_tml(file_path: str) -> ColumnarScene:
+    """
+    Read the given TML-file into columns.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the File.
+
+    Returns
+    -------
+    ColumnarScene
+        The columns of all shapes.
+
+    """
+    with open(file_path) as file:
+        return ColumnarScene(file.read())
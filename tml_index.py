@@ -0,0 +1,470 @@
+"""
+Lazy shape tree of a TML-text, backed by an index of its tags.
+
+Reading the text only builds a compact index: for every shape the position
+of its tag in a table, the start and end of its content, its parent and the
+index after its last subshape. Attributes are not indexed, they are found
+in the text around the subshapes, when their shape is built. Shapes are only
+built when they are asked for, so counting the shapes of a big file or
+drawing a few of them does not build all the others.
+
+The shapes are stored in the order of the text, every shape is followed by
+its subshapes. The root is the first shape. As the values of the attributes
+are not looked at while reading, an invalid value is only reported when the
+shape owning it is built.
+"""
+
+import array
+import itertools
+import re
+
+import backends
+import shapes
+import spatial
+
+
+# opening or closing tag, the name reaching to the next '>' like in the
+# tokenizer of the tml_parser-module
+TAG = re.compile(r"<([^>]*)>")
+
+
+class IndexedScene():
+    """
+    The index of the shapes of a TML-text.
+
+    The arrays can be used directly: names holds the index into the table
+    of tag names, starts and stops enclose the content of every shape,
+    parents the index of the enclosing shape (-1 for the root) and ends the
+    index after its last subshape.
+    """
+
+    def __init__(self, text: str):
+        """
+        Index all tags of a text.
+
+        Parameters
+        ----------
+        text : str
+            The TML-text.
+
+        Raises
+        ------
+        ValueError
+            If the tags are not balanced, a tag is not closed with a '>' or
+            a tag is not allowed at its position.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.text = text
+        # tags of the shapes and their classes
+        self.tag_names = list()
+        self.shape_classes = list()
+        self.names = array.array("H")
+        self.starts = array.array("q")
+        self.stops = array.array("q")
+        self.parents = array.array("q")
+        self.ends = array.array("q")
+        self.__definitions = None
+        self.__index()
+
+    def __index(self):
+        """
+        Walk through the text once and fill the arrays.
+
+        Raises
+        ------
+        ValueError
+            If the text is not a valid TML.
+
+        Returns
+        -------
+        None.
+
+        """
+        text = self.text
+        name_indices = dict()
+        tag_names = self.tag_names
+        shape_classes = self.shape_classes
+        names = self.names
+        starts = self.starts
+        stops = self.stops
+        parents = self.parents
+        ends = self.ends
+        # name of every open tag and the index of its shape or -1
+        stack = list()
+        # the shape the next tags are inside of
+        parent = -1
+        attribute = None
+        position = 0
+        # the name of a shape is looked up once, attributes are not known
+        # from their name alone
+        get_shape_class = shapes.get_shape_class
+
+        for match in TAG.finditer(text):
+            name = match.group(1)
+            position = match.end()
+            if name.startswith("/"):
+                name = name[1:]
+                tag_start = match.start()
+                if not stack:
+                    raise ValueError(f"closing tag </{name}> at index "
+                                     f"{tag_start} was never opened")
+                tag_name, index = stack.pop()
+                if tag_name != name:
+                    raise ValueError(f"closing tag </{name}> at index "
+                                     f"{tag_start} does not match "
+                                     f"<{tag_name}>")
+                if index == -1:
+                    attribute = None
+                    continue
+                stops[index] = tag_start
+                ends[index] = len(names)
+                parent = parents[index]
+                if not stack:
+                    break
+                continue
+
+            if name == "":
+                raise ValueError(f"empty tag before index {position}")
+            if attribute is not None:
+                raise ValueError(f"tag <{name}> before index {position} "
+                                 f"is inside the attribute <{attribute}>")
+            name_index = name_indices.get(name)
+            if name_index is None:
+                shape_class = get_shape_class(name)
+                if shape_class is None:
+                    if not stack:
+                        raise ValueError(f"root tag <{name}> is no shape")
+                    # an attribute of the shape on top of the stack
+                    stack.append((name, -1))
+                    attribute = name
+                    continue
+                name_index = name_indices[name] = len(tag_names)
+                tag_names.append(name)
+                shape_classes.append(shape_class)
+            if not stack and names:
+                raise ValueError(f"second root tag <{name}> "
+                                 f"before index {position}")
+
+            stack.append((name, len(names)))
+            names.append(name_index)
+            starts.append(position)
+            stops.append(-1)
+            parents.append(parent)
+            ends.append(-1)
+            parent = len(names) - 1
+
+        if stack:
+            # a '<' after the last tag found has no '>'
+            tag_start = text.find("<", position)
+            if tag_start != -1:
+                raise ValueError(f"tag at index {tag_start} is not closed")
+            raise ValueError(f"tag <{stack[-1][0]}> is never closed")
+        if not names:
+            raise ValueError("no tag found")
+
+    def __len__(self):
+        """
+        Get the number of shapes, including the root.
+
+        Returns
+        -------
+        int
+            Number of shapes.
+
+        """
+        return len(self.names)
+
+    def tag(self, index: int) -> str:
+        """
+        Get the tag of a shape.
+
+        Parameters
+        ----------
+        index : int
+            Index of the shape.
+
+        Returns
+        -------
+        str
+            The name.
+
+        """
+        return self.tag_names[self.names[index]]
+
+    def children(self, index: int):
+        """
+        Get the indices of the shapes directly below a shape.
+
+        Parameters
+        ----------
+        index : int
+            Index of the shape, 0 is the root.
+
+        Yields
+        ------
+        int
+            Index of every subshape, without their subshapes.
+
+        """
+        ends = self.ends
+        child = index + 1
+        end = ends[index]
+        while child < end:
+            yield child
+            child = ends[child]
+
+    def find(self, tag: str) -> list:
+        """
+        Find all shapes with a tag, without building them.
+
+        Parameters
+        ----------
+        tag : str
+            Name of the shapes, like 'circle'.
+
+        Returns
+        -------
+        list
+            Index of every shape in the order of the text.
+
+        """
+        if tag not in self.tag_names:
+            return list()
+        name_index = self.tag_names.index(tag)
+        return [index for index, name in enumerate(self.names)
+                if name == name_index]
+
+    def counts(self) -> dict:
+        """
+        Count the shapes by their tag, without building them.
+
+        Returns
+        -------
+        dict
+            Number of shapes by their tag, including the root.
+
+        """
+        numbers = [0] * len(self.tag_names)
+        for name in self.names:
+            numbers[name] += 1
+        return dict(zip(self.tag_names, numbers))
+
+    def attributes(self, index: int) -> list:
+        """
+        Get the attributes of a shape, without converting them.
+
+        Only the text around the subshapes is searched.
+
+        Parameters
+        ----------
+        index : int
+            Index of the shape, 0 is the root.
+
+        Returns
+        -------
+        list
+            (name, text between the tags) of every attribute, in the order
+            of the text.
+
+        """
+        text = self.text
+        found = list()
+        start = self.starts[index]
+        for child in itertools.chain(self.children(index), (None,)):
+            if child is None:
+                end = self.stops[index]
+            else:
+                end = self.starts[child] - len(self.tag(child)) - 2
+            for match in TAG.finditer(text, start, end):
+                name = match.group(1)
+                if not name.startswith("/"):
+                    value_start = match.end()
+                else:
+                    found.append((name[1:], text[value_start:match.start()]))
+            if child is not None:
+                start = self.stops[child] + len(self.tag(child)) + 3
+        return found
+
+    def shape(self, index: int, sub_shapes: bool = True):
+        """
+        Build a shape and convert its attributes.
+
+        Parameters
+        ----------
+        index : int
+            Index of the shape, 0 is the root.
+        sub_shapes : bool, optional
+            If False, the subshapes are not built. The default is True.
+
+        Raises
+        ------
+        ValueError
+            If the value of an attribute is not valid or an instance refers
+            to an unknown definition.
+
+        Returns
+        -------
+        Shape
+            The new shape.
+
+        """
+        shape = self.shape_classes[self.names[index]]()
+        for name, value in self.attributes(index):
+            shape.set_attribute(name, value)
+        if sub_shapes:
+            for child in self.children(index):
+                shape.append_shape(self.shape(child))
+
+        if isinstance(shape, shapes.Use):
+            try:
+                shape.link(self.__definitions_before(index))
+            except ValueError as error:
+                raise ValueError(f"<use> closed at index "
+                                 f"{self.stops[index]}: {error}") from None
+        return shape
+
+    def __definitions_before(self, index: int) -> dict:
+        """
+        Get the definitions, an instance can refer to.
+
+        All definitions are built once, when the first instance is built.
+
+        Parameters
+        ----------
+        index : int
+            Index of the instance.
+
+        Raises
+        ------
+        ValueError
+            If a definition is not valid.
+
+        Returns
+        -------
+        dict
+            The definitions before the instance by their name.
+
+        """
+        if self.__definitions is None:
+            self.__definitions = dict()
+            for definition_index in self.find("define"):
+                definition = self.shape(definition_index)
+                stop = self.stops[definition_index]
+                if definition.name is None:
+                    raise ValueError(f"<define> closed at index {stop} "
+                                     f"has no name")
+                if len(definition.sub_shapes) != 1:
+                    raise ValueError(f"<define> closed at index {stop} "
+                                     f"does not contain exactly one shape")
+                if definition.name in self.__definitions:
+                    raise ValueError(f"<define> closed at index {stop}: "
+                                     f"'{definition.name}' is defined "
+                                     f"twice")
+                self.__definitions[definition.name] = (definition_index,
+                                                       definition)
+        return {name: definition
+                for name, (definition_index, definition)
+                in self.__definitions.items() if definition_index < index}
+
+    def bounds(self, index: int):
+        """
+        Get the bounding box of a shape, which is not kept afterwards.
+
+        Parameters
+        ----------
+        index : int
+            Index of the shape, 0 is the root.
+
+        Returns
+        -------
+        tuple
+            The box or None, if the shape draws nothing.
+
+        """
+        return spatial.shape_bounds(self.shape(index))
+
+    def iter_shapes(self):
+        """
+        Build the shapes directly below the root one after another.
+
+        Yields
+        ------
+        Shape
+            Every shape below the root with its subshapes.
+
+        """
+        for child in self.children(0):
+            yield self.shape(child)
+
+    def read(self):
+        """
+        Build all shapes.
+
+        Returns
+        -------
+        Shape
+            The root shape with all its subshapes.
+
+        """
+        return self.shape(0)
+
+    def draw(self, backend=None, region=None):
+        """
+        Draw the scene, building only one shape below the root at a time.
+
+        Parameters
+        ----------
+        backend : Backend, optional
+            Backend to draw with. The default draws with the turtle.
+        region : tuple, optional
+            Part of the image to draw as (lower left x, lower left y,
+            upper right x, upper right y), which is drawn instead of the
+            whole image. Shapes outside of it are skipped. The default is
+            the whole image.
+
+        Returns
+        -------
+        None.
+
+        """
+        root = self.shape(0, sub_shapes=False)
+        if not isinstance(root, shapes.Image):
+            self.read().draw(backend)
+            return
+
+        if backend is None:
+            backend = backends.TurtleBackend()
+        if region is not None:
+            (root.lower_left_x, root.lower_left_y,
+             root.upper_right_x, root.upper_right_y) = region
+        backend.begin_image(root)
+        for shape in self.iter_shapes():
+            if region is not None:
+                box = spatial.shape_bounds(shape)
+                if box is None or not spatial.intersects(box, region):
+                    continue
+            shape.draw(backend)
+        backend.end_image(root)
+
+
+def read_tml(file_path: str) -> IndexedScene:
+    """
+    Read the given TML-file into an index, without building its shapes.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the File.
+
+    Returns
+    -------
+    IndexedScene
+        The index, its shapes are built when needed.
+
+    """
+    with open(file_path) as file:
+        return IndexedScene(file.read())
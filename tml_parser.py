@@ -0,0 +1,816 @@
+"""
+Single-pass tokenizer and tree builder for TML-files (Turtle-Markup-File).
+
+The tokenizer walks the text exactly once and emits events for every opening
+tag, closing tag and piece of text it finds. The tree builder keeps a stack of
+the currently open tags and turns these events into shapes, so the time needed
+to read a file only grows linearly with its size.
+"""
+
+import concurrent.futures
+import logging
+import os
+
+import profiling
+import shapes
+
+
+logger = logging.getLogger(__name__)
+
+
+# version of the parser, cached shapes of an older version are not used
+PARSER_VERSION = 1
+
+# texts shorter than this number of characters are always parsed in one
+# process, starting the processes would take longer than parsing
+PARALLEL_MIN_SIZE = 1 << 20
+
+# kinds of events emitted by the tokenizer
+OPEN = 0
+CLOSE = 1
+TEXT = 2
+
+
+def tokenize(text: str, start: int = 0, end: int = None, final: bool = True):
+    """
+    Walk through the text once and yield all tags and texts found.
+
+    Every event is a tuple of (kind, name, start, end). For tags, start is the
+    index of the '<' and end the index after the '>'. For text events the name
+    is None and start/end enclose the text. Texts only containing whitespace
+    are skipped.
+
+    Parameters
+    ----------
+    text : str
+        Text which will be searched in.
+    start : int, optional
+        Start index of the search. The default is 0.
+    end : int, optional
+        Ending index of the search. The default is the end of the text.
+    final : bool, optional
+        If False, the text may be continued later on. The search then stops
+        silently at a tag without a '>' instead of raising an error and
+        trailing text is not reported. The default is True.
+
+    Raises
+    ------
+    ValueError
+        If a tag is not closed with a '>'.
+
+    Yields
+    ------
+    tuple
+        (kind, name, start, end) of every event found.
+
+    """
+    if end is None:
+        end = len(text)
+    find = text.find
+
+    position = start
+    while position < end:
+        tag_start = find("<", position, end)
+        if tag_start == -1:
+            if final and not text[position:end].isspace():
+                yield (TEXT, None, position, end)
+            return
+
+        if tag_start > position and not text[position:tag_start].isspace():
+            yield (TEXT, None, position, tag_start)
+
+        tag_end = find(">", tag_start, end)
+        if tag_end == -1:
+            if final:
+                raise ValueError(f"tag at index {tag_start} is not closed")
+            return
+
+        # a tag without a name is reported as an opening tag with an empty
+        # name, the tree builder will then decide what to do with it
+        if text.startswith("/", tag_start + 1):
+            yield (CLOSE, text[tag_start + 2:tag_end], tag_start, tag_end + 1)
+        else:
+            yield (OPEN, text[tag_start + 1:tag_end], tag_start, tag_end + 1)
+        position = tag_end + 1
+
+
+class TreeBuilder():
+    """
+    Build the shape-tree from the events of the tokenizer.
+
+    Every opened tag is put onto a stack together with its shape and the
+    position where its content starts. Tags which are no shapes are handed to
+    the shape they are contained in as attributes once they are closed.
+    """
+
+    def __init__(self, keep_children: bool = True):
+        """
+        Create a new, empty tree builder.
+
+        Parameters
+        ----------
+        keep_children : bool, optional
+            If False, the shapes directly below the root are not appended to
+            it, so they can be handed out and forgotten once they are closed.
+            The default is True.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.root = None
+        self.stack = list()
+        self.keep_children = keep_children
+        # all <define>-tags read so far by their name
+        self.definitions = dict()
+
+    def start_tag(self, name: str, position: int):
+        """
+        Open a new tag.
+
+        Parameters
+        ----------
+        name : str
+            Name of the tag.
+        position : int
+            Index directly after the opening tag, where its content starts.
+
+        Raises
+        ------
+        ValueError
+            If the tag is not allowed at this position.
+
+        Returns
+        -------
+        shape : Shape
+            The new shape or None, if the tag is an attribute.
+
+        """
+        if name == "":
+            raise ValueError(f"empty tag before index {position}")
+
+        shape = shapes.get_shape(name)
+        if not self.stack:
+            if self.root is not None:
+                raise ValueError(f"second root tag <{name}> "
+                                 f"before index {position}")
+            if shape is None:
+                raise ValueError(f"root tag <{name}> is no shape")
+            self.root = shape
+        else:
+            parent = self.stack[-1][1]
+            if parent is None:
+                raise ValueError(f"tag <{name}> before index {position} "
+                                 f"is inside the attribute "
+                                 f"<{self.stack[-1][0]}>")
+            if shape is not None and (self.keep_children
+                                      or len(self.stack) > 1):
+                parent.append_shape(shape)
+
+        self.stack.append((name, shape, position))
+        return shape
+
+    def end_tag(self, name: str, position: int, text: str, offset: int = 0):
+        """
+        Close the last opened tag.
+
+        Parameters
+        ----------
+        name : str
+            Name of the closing tag.
+        position : int
+            Index of the '<' of the closing tag.
+        text : str
+            Text the positions refer to.
+        offset : int, optional
+            Index of the first character of text, if it is only a part of the
+            whole document. The default is 0.
+
+        Raises
+        ------
+        ValueError
+            If the closing tag does not belong to the last opened tag or the
+            value of an attribute is not valid.
+
+        Returns
+        -------
+        shape : Shape
+            The closed shape or None, if the tag was an attribute.
+
+        """
+        if not self.stack:
+            raise ValueError(f"closing tag </{name}> at index {position} "
+                             f"was never opened")
+        tag_name, shape, content_start = self.stack.pop()
+        if tag_name != name:
+            raise ValueError(f"closing tag </{name}> at index {position} "
+                             f"does not match <{tag_name}>")
+
+        if shape is None:
+            value = text[content_start - offset:position - offset]
+            self.stack[-1][1].set_attribute(name, value)
+        elif isinstance(shape, (shapes.Definition, shapes.Use)):
+            self.__link(shape, position)
+        return shape
+
+    def __link(self, shape, position: int):
+        """
+        Remember a closed definition or link a closed instance to its one.
+
+        Parameters
+        ----------
+        shape : Shape
+            The definition or the instance.
+        position : int
+            Index of the '<' of its closing tag.
+
+        Raises
+        ------
+        ValueError
+            If the definition is not valid or the instance refers to an
+            unknown definition.
+
+        Returns
+        -------
+        None.
+
+        """
+        if isinstance(shape, shapes.Use):
+            try:
+                shape.link(self.definitions)
+            except ValueError as error:
+                raise ValueError(f"<use> closed at index {position}: "
+                                 f"{error}") from None
+            return
+
+        if shape.name is None:
+            raise ValueError(f"<define> closed at index {position} "
+                             f"has no name")
+        if len(shape.sub_shapes) != 1:
+            raise ValueError(f"<define> closed at index {position} "
+                             f"does not contain exactly one shape")
+        if shape.name in self.definitions:
+            raise ValueError(f"<define> closed at index {position}: "
+                             f"'{shape.name}' is defined twice")
+        self.definitions[shape.name] = shape
+
+    def close(self):
+        """
+        Finish building the tree.
+
+        Raises
+        ------
+        ValueError
+            If no tag was found or some tags were never closed.
+
+        Returns
+        -------
+        Shape
+            The root of the tree.
+
+        """
+        if self.root is None:
+            raise ValueError("no tag found")
+        if self.stack:
+            raise ValueError(f"tag <{self.stack[-1][0]}> is never closed")
+        return self.root
+
+
+def parse(text: str, start: int = 0, end: int = None,
+          definitions: dict = None):
+    """
+    Parse the given TML-text into a shape-tree.
+
+    Only the first tag of the text and its content are read, everything after
+    its closing tag is ignored.
+
+    Parameters
+    ----------
+    text : str
+        Text to parse.
+    start : int, optional
+        Start index of the parsing. The default is 0.
+    end : int, optional
+        Ending index of the parsing. The default is the end of the text.
+    definitions : dict, optional
+        Definitions by their name, which were read before, like when only a
+        part of a document is parsed again. New definitions are added.
+        The default knows no definitions.
+
+    Raises
+    ------
+    ValueError
+        If the text is not a valid TML.
+
+    Returns
+    -------
+    Shape
+        The root shape, usually an image.
+
+    """
+    profiler = profiling.ACTIVE
+    if profiler is not None:
+        return __profiled_parse(profiler, text, start, end, definitions)
+
+    builder = TreeBuilder()
+    if definitions is not None:
+        builder.definitions = definitions
+    for kind, name, tag_start, tag_end in tokenize(text, start, end):
+        if kind == OPEN:
+            builder.start_tag(name, tag_end)
+        elif kind == CLOSE:
+            builder.end_tag(name, tag_start, text)
+            if not builder.stack:
+                break
+    return builder.close()
+
+
+def __profiled_parse(profiler, text: str, start: int, end: int,
+                     definitions: dict):
+    """
+    Parse the given TML-text, counting the tags and shapes.
+
+    This is the same as parse, which is left without any extra work while
+    no profiler is active.
+
+    Parameters
+    ----------
+    profiler : Profiler
+        The active profiler.
+    text : str
+        Text to parse.
+    start : int
+        Start index of the parsing.
+    end : int
+        Ending index of the parsing or None.
+    definitions : dict
+        Definitions read before or None.
+
+    Returns
+    -------
+    Shape
+        The root shape, usually an image.
+
+    """
+    tags = 0
+    position = start
+    with profiler.phase("parse"):
+        builder = TreeBuilder()
+        if definitions is not None:
+            builder.definitions = definitions
+        for kind, name, tag_start, tag_end in tokenize(text, start, end):
+            position = tag_end
+            if kind == OPEN:
+                tags += 1
+                builder.start_tag(name, tag_end)
+            elif kind == CLOSE:
+                builder.end_tag(name, tag_start, text)
+                if not builder.stack:
+                    break
+        root = builder.close()
+    profiler.count("tags scanned", tags)
+    profiler.count("characters scanned", position - start)
+    profiler.count_shapes(root)
+    return root
+
+
+def split_children(text: str, start: int = 0, end: int = None) -> list:
+    """
+    Find the shapes directly below the root without parsing them.
+
+    Only the tags directly below the root are looked at. The end of every
+    shape is found by searching for its closing tag and counting the tags
+    of the same name opened in between, so the text inside of the shapes is
+    only searched by str.find and str.count.
+
+    Parameters
+    ----------
+    text : str
+        The TML-text.
+    start : int, optional
+        Start index of the search. The default is 0.
+    end : int, optional
+        Ending index of the search. The default is the end of the text.
+
+    Raises
+    ------
+    ValueError
+        If the tags directly below the root are not balanced. The text has
+        to be parsed as a whole then, to find the exact error.
+
+    Returns
+    -------
+    list
+        (start, end) of every shape, from its opening to its closing tag,
+        in the order of the text.
+
+    """
+    if end is None:
+        end = len(text)
+    find = text.find
+
+    tag_start = find("<", start, end)
+    tag_end = find(">", tag_start, end)
+    if tag_start == -1 or tag_end == -1:
+        raise ValueError("no root tag found")
+    root_name = text[tag_start + 1:tag_end]
+    if not root_name or root_name.startswith("/"):
+        raise ValueError(f"no root tag at index {tag_start}")
+
+    children = list()
+    position = tag_end + 1
+    while True:
+        tag_start = find("<", position, end)
+        tag_end = find(">", tag_start, end)
+        if tag_start == -1 or tag_end == -1:
+            raise ValueError(f"tag <{root_name}> is never closed")
+        name = text[tag_start + 1:tag_end]
+        if name.startswith("/"):
+            if name[1:] != root_name:
+                raise ValueError(f"closing tag <{name}> at index "
+                                 f"{tag_start} does not match")
+            return children
+        if not name:
+            raise ValueError(f"empty tag at index {tag_start}")
+
+        # the matching closing tag is the first one, before which as many
+        # tags of the same name were opened as closed
+        opening = f"<{name}>"
+        closing = f"</{name}>"
+        search = tag_end + 1
+        opened = 0
+        closed = 0
+        while True:
+            close_start = find(closing, search, end)
+            if close_start == -1:
+                raise ValueError(f"tag <{name}> at index {tag_start} is "
+                                 f"never closed")
+            opened += text.count(opening, search, close_start)
+            if opened == closed:
+                break
+            closed += 1
+            search = close_start + len(closing)
+        position = close_start + len(closing)
+        if shapes.get_shape_class(name) is not None:
+            children.append((tag_start, position))
+
+
+def __feed(builder: TreeBuilder, text: str, offset: int = 0):
+    """
+    Hand all tags of a text to a tree builder.
+
+    Parameters
+    ----------
+    builder : TreeBuilder
+        The tree builder.
+    text : str
+        The text, which may be a part of a document.
+    offset : int, optional
+        Index of the first character of text in the whole document.
+        The default is 0.
+
+    Returns
+    -------
+    None.
+
+    """
+    for kind, name, tag_start, tag_end in tokenize(text):
+        if kind == OPEN:
+            builder.start_tag(name, offset + tag_end)
+        elif kind == CLOSE:
+            builder.end_tag(name, offset + tag_start, text, offset)
+
+
+def _parse_children(text: str, offset: int, root_name: str,
+                    definitions: list) -> list:
+    """
+    Parse a part of the shapes below the root, called in a process.
+
+    Parameters
+    ----------
+    text : str
+        Text from the first to the last shape of the part.
+    offset : int
+        Index of the first character of text in the whole document.
+    root_name : str
+        Name of the root tag.
+    definitions : list
+        Texts of all definitions below the root before the part, so the
+        instances of the part can be linked to them.
+
+    Raises
+    ------
+    ValueError
+        If the text is not a valid TML.
+
+    Returns
+    -------
+    list
+        The shapes of the part in the order of the text.
+
+    """
+    builder = TreeBuilder()
+    builder.start_tag(root_name, offset)
+    for definition in definitions:
+        __feed(builder, definition)
+    root = builder.root
+    root.sub_shapes = ()
+
+    __feed(builder, text, offset)
+    if len(builder.stack) != 1:
+        raise ValueError(f"tag <{builder.stack[-1][0]}> is never closed")
+    return list(root.sub_shapes)
+
+
+def parse_parallel(text: str, workers: int = None):
+    """
+    Parse a big TML-text in parallel processes.
+
+    The shapes directly below the root are found by split_children and
+    handed to the processes in parts of about the same size. The parsed
+    shapes are put together in the order of the text, so they are drawn
+    just like the ones of parse. Texts which are small or can not be split
+    are parsed by parse in this process.
+
+    Parameters
+    ----------
+    text : str
+        The TML-text.
+    workers : int, optional
+        Number of processes. The default is the number of processors.
+
+    Raises
+    ------
+    ValueError
+        If the text is not a valid TML.
+
+    Returns
+    -------
+    Shape
+        The root shape, usually an image.
+
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 2 or len(text) < PARALLEL_MIN_SIZE:
+        return parse(text)
+    try:
+        children = split_children(text)
+    except ValueError:
+        # parse finds the exact position of the error
+        return parse(text)
+    if len(children) < 2:
+        return parse(text)
+
+    # the root and its attributes are read from the text around the shapes
+    builder = TreeBuilder()
+    position = 0
+    for child_start, child_end in children:
+        __feed(builder, text[position:child_start], position)
+        position = child_end
+    for kind, name, tag_start, tag_end in tokenize(text, position):
+        if kind == OPEN:
+            builder.start_tag(name, tag_end)
+        elif kind == CLOSE:
+            builder.end_tag(name, tag_start, text)
+            if not builder.stack:
+                break
+    root = builder.close()
+    root_name = text[text.find("<") + 1:text.find(">")]
+
+    # a few parts for every process, so a slow part does not leave the
+    # other processes waiting
+    part_size = (children[-1][1] - children[0][0]) / (workers * 4)
+    parts = list()
+    definitions = list()
+    first = 0
+    for index, (child_start, child_end) in enumerate(children):
+        last = index + 1 == len(children)
+        if child_end - children[first][0] >= part_size or last:
+            part_start = children[first][0]
+            parts.append((text[part_start:child_end], part_start,
+                          root_name, list(definitions)))
+            for definition_start, definition_end in children[first:index + 1]:
+                if text.startswith("<define>", definition_start):
+                    definitions.append(
+                        text[definition_start:definition_end])
+            first = index + 1
+
+    logger.debug("parsing %d shapes in %d parts with %d processes",
+                 len(children), len(parts), workers)
+    with profiling.phase("parse"), concurrent.futures.ProcessPoolExecutor(
+            min(workers, len(parts))) as executor:
+        for sub_shapes in executor.map(_parse_children, *zip(*parts)):
+            for shape in sub_shapes:
+                root.append_shape(shape)
+    return root
+
+
+def read_tml(file_path: str, workers: int = 1):
+    """
+    Read and parse the given TML-file.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the File.
+    workers : int, optional
+        Number of processes parsing a big file, see parse_parallel. None
+        uses all processors. The default parses in this process.
+
+    Returns
+    -------
+    Shape
+        The root shape of the file.
+
+    """
+    with profiling.phase("read"), open(file_path) as file:
+        text = file.read()
+    if profiling.ACTIVE is not None:
+        profiling.ACTIVE.count("bytes read", os.path.getsize(file_path))
+    logger.debug("parsing %s (%d characters)", file_path, len(text))
+    if workers != 1:
+        return parse_parallel(text, workers)
+    return parse(text)
+
+
+class StreamParser():
+    """
+    Parse a TML-text which is given in chunks.
+
+    Every shape directly below the root is handed out as soon as its closing
+    tag is read and is not kept afterwards. Only the text of the shape which
+    is read at the moment is buffered, so the memory needed is bounded by the
+    biggest single shape instead of the size of the whole file.
+    """
+
+    def __init__(self):
+        """
+        Create a new stream parser.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.builder = TreeBuilder(keep_children=False)
+        self.done = False
+
+        self.__buffer = ""
+        # index of the first character of the buffer in the whole document
+        self.__offset = 0
+        # index in the buffer, up to which the text is already tokenized
+        self.__position = 0
+        # index in the buffer, where the currently read top-level shape starts
+        self.__shape_start = 0
+
+    @property
+    def root(self):
+        """
+        The root shape, as far as it is read yet.
+
+        Its attributes are set, but the shapes below it are not appended.
+
+        Returns
+        -------
+        Shape
+            The root shape or None, if it was not found yet.
+
+        """
+        return self.builder.root
+
+    def feed(self, chunk: str):
+        """
+        Read the next chunk of the text.
+
+        Tags which are cut off at the end of the chunk are kept and completed
+        with the next chunk.
+
+        Parameters
+        ----------
+        chunk : str
+            The next part of the text.
+
+        Raises
+        ------
+        ValueError
+            If the text is not a valid TML.
+
+        Returns
+        -------
+        list
+            All shapes below the root which were completed by this chunk.
+
+        """
+        if self.done:
+            return list()
+
+        builder = self.builder
+        completed = list()
+        self.__buffer += chunk
+
+        for kind, name, tag_start, tag_end in tokenize(self.__buffer,
+                                                       self.__position,
+                                                       final=False):
+            if kind == OPEN:
+                if len(builder.stack) == 1:
+                    self.__shape_start = tag_start
+                builder.start_tag(name, self.__offset + tag_end)
+            elif kind == CLOSE:
+                shape = builder.end_tag(name,
+                                        self.__offset + tag_start,
+                                        self.__buffer,
+                                        self.__offset)
+                if shape is not None and len(builder.stack) == 1:
+                    completed.append(shape)
+            else:
+                continue
+
+            self.__position = tag_end
+            if not builder.stack:
+                self.done = True
+                break
+
+        # everything before the currently read top-level shape is not
+        # needed anymore and can be forgotten
+        if len(builder.stack) <= 1:
+            self.__shape_start = self.__position
+        self.__buffer = self.__buffer[self.__shape_start:]
+        self.__offset += self.__shape_start
+        self.__position -= self.__shape_start
+        self.__shape_start = 0
+
+        return completed
+
+    def close(self):
+        """
+        Finish the parsing after the last chunk was read.
+
+        Raises
+        ------
+        ValueError
+            If the text ended inside of a tag.
+
+        Returns
+        -------
+        Shape
+            The root shape.
+
+        """
+        if not self.done:
+            tag_start = self.__buffer.find("<", self.__position)
+            if tag_start != -1:
+                raise ValueError(f"tag at index {self.__offset + tag_start} "
+                                 f"is not closed")
+        return self.builder.close()
+
+    def read(self, file, chunk_size: int = 65536):
+        """
+        Read a whole file chunk by chunk.
+
+        Parameters
+        ----------
+        file : file-object
+            An opened text-file.
+        chunk_size : int, optional
+            Number of characters to read at once. The default is 65536.
+
+        Raises
+        ------
+        ValueError
+            If the text is not a valid TML.
+
+        Yields
+        ------
+        Shape
+            Every shape directly below the root, in the order of the file.
+
+        """
+        while not self.done:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            yield from self.feed(chunk)
+        self.close()
+
+
+def iter_shapes(file_path: str, chunk_size: int = 65536):
+    """
+    Read the given TML-file piece by piece and yield its shapes.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the File.
+    chunk_size : int, optional
+        Number of characters to read at once. The default is 65536.
+
+    Yields
+    ------
+    Shape
+        Every shape directly below the root, in the order of the file.
+
+    """
+    with open(file_path) as file:
+        yield from StreamParser().read(file, chunk_size)
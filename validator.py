@@ -0,0 +1,354 @@
+"""
+Validator for TML-files, which checks files without creating any shapes.
+
+The text is walked through once by the tokenizer. The tags are checked to be
+balanced, to be known shapes or to be attributes allowed for the shape they
+belong to. Definitions and their instances are checked like the parser links
+them. Every problem is reported with its line and column.
+"""
+
+import bisect
+import concurrent.futures
+
+import shapes
+import tml_parser
+
+
+class Diagnostic():
+    """A problem found in a TML-text."""
+
+    def __init__(self, line: int, column: int, tag: str, message: str):
+        """
+        Create a new diagnostic.
+
+        Parameters
+        ----------
+        line : int
+            Line of the problem, starting at 1.
+        column : int
+            Column of the problem, starting at 1.
+        tag : str
+            Name of the tag concerned or None.
+        message : str
+            Description of the problem.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.line = line
+        self.column = column
+        self.tag = tag
+        self.message = message
+
+    def __repr__(self):
+        """
+        Get a readable representation of the diagnostic.
+
+        Returns
+        -------
+        str
+            The diagnostic as 'line:column: <tag> message'.
+
+        """
+        if self.tag is None:
+            return f"{self.line}:{self.column}: {self.message}"
+        return f"{self.line}:{self.column}: <{self.tag}> {self.message}"
+
+
+class _Collector():
+    """Collects the diagnostics of a text with their lines and columns."""
+
+    def __init__(self, text: str):
+        """
+        Create a new collector, the lines are only searched when needed.
+
+        Parameters
+        ----------
+        text : str
+            The text which is checked.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.text = text
+        self.diagnostics = list()
+        self.__line_starts = None
+
+    def report(self, index: int, tag: str, message: str):
+        """
+        Add a diagnostic.
+
+        Parameters
+        ----------
+        index : int
+            Index of the problem in the text.
+        tag : str
+            Name of the tag concerned or None.
+        message : str
+            Description of the problem.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.__line_starts is None:
+            self.__line_starts = [0]
+            newline = self.text.find("\n")
+            while newline != -1:
+                self.__line_starts.append(newline + 1)
+                newline = self.text.find("\n", newline + 1)
+        line = bisect.bisect_right(self.__line_starts, index)
+        column = index - self.__line_starts[line - 1] + 1
+        self.diagnostics.append(Diagnostic(line, column, tag, message))
+
+
+def __check_value(shape_class: type, name: str, value: str, index: int,
+                  report):
+    """
+    Check if the value of an attribute can be converted.
+
+    Parameters
+    ----------
+    shape_class : type
+        Class of the shape the attribute belongs to.
+    name : str
+        Name of the attribute.
+    value : str
+        Text of the attribute.
+    index : int
+        Index of the value in the text.
+    report : callable
+        Called with index, tag and message, if the value is not valid.
+
+    Returns
+    -------
+    None.
+
+    """
+    attribute = shape_class.find_attribute(name)
+    if attribute is None:
+        return
+    try:
+        attribute.converter(value)
+    except ValueError:
+        report(index, name, f"'{value.strip()}' is no valid value")
+
+
+def __note_attribute(shape_class: type, name: str, value: str,
+                     details: dict):
+    """
+    Remember an attribute of a definition or instance for __check_link.
+
+    Parameters
+    ----------
+    shape_class : type
+        Class of the definition or instance.
+    name : str
+        Name of the attribute tag.
+    value : str
+        Text of the attribute.
+    details : dict
+        Details of the definition or instance.
+
+    Returns
+    -------
+    None.
+
+    """
+    attribute = shape_class.attribute_table.get(name.strip().lower())
+    if attribute is not None and attribute.name == "name":
+        details["name"] = value
+    elif attribute is None:
+        details["overrides"].append(name)
+
+
+def __check_link(shape_class: type, details: dict, index: int,
+                 definitions: dict, report):
+    """
+    Check a closed definition or instance like the parser links them.
+
+    Parameters
+    ----------
+    shape_class : type
+        Class of the closed shape.
+    details : dict
+        The name, the classes of the shapes directly inside and the replaced
+        attributes of the closed shape.
+    index : int
+        Index of its opening tag in the text.
+    definitions : dict
+        Class of the defined shape of every definition so far by its name,
+        a valid definition is added.
+    report : callable
+        Called with index, tag and message for every problem.
+
+    Returns
+    -------
+    None.
+
+    """
+    name = details["name"]
+    if issubclass(shape_class, shapes.Use):
+        tag = "use"
+        if name not in definitions:
+            report(index, tag, f"there is no definition '{name}'")
+            return
+        defined_class = definitions[name]
+        for attribute in details["overrides"]:
+            if defined_class.find_attribute(attribute) is None:
+                report(index, tag, f"{defined_class.__name__} has no "
+                                   f"attribute '{attribute}'")
+        return
+
+    tag = "define"
+    if name is None:
+        report(index, tag, "has no name")
+    if len(details["shapes"]) != 1:
+        report(index, tag, "does not contain exactly one shape")
+    if name is not None and name in definitions:
+        report(index, tag, f"'{name}' is defined twice")
+    elif name is not None and details["shapes"]:
+        definitions[name] = details["shapes"][0]
+
+
+def validate(text: str) -> list:
+    """
+    Check the given TML-text.
+
+    Parameters
+    ----------
+    text : str
+        The text to check.
+
+    Returns
+    -------
+    list
+        A Diagnostic for every problem found, empty if the text is valid.
+
+    """
+    collector = _Collector(text)
+    report = collector.report
+
+    # every open tag as (name, class of the shape or None, index of the tag,
+    # index of its content, details of a shape needed to check definitions
+    # and instances or None)
+    stack = list()
+    root_found = False
+    # class of the defined shape by the name of every definition
+    definitions = dict()
+    try:
+        for kind, name, start, end in tml_parser.tokenize(text):
+            if kind == tml_parser.OPEN:
+                if name == "":
+                    report(start, None, "empty tag")
+                    continue
+
+                shape_class = shapes.get_shape_class(name)
+                if not stack:
+                    if root_found:
+                        break
+                    root_found = True
+                    if shape_class is None:
+                        report(start, name, "root tag is no shape")
+                elif stack[-1][1] is None:
+                    report(start, name,
+                           f"is inside of the attribute <{stack[-1][0]}>")
+                elif (shape_class is None
+                      and stack[-1][1].find_attribute(name) is None):
+                    report(start, name,
+                           f"is no shape and no attribute of "
+                           f"<{stack[-1][0]}>")
+                elif shape_class is not None:
+                    stack[-1][4]["shapes"].append(shape_class)
+                details = None
+                if shape_class is not None:
+                    details = {"name": None, "shapes": list(),
+                               "overrides": list()}
+                stack.append((name, shape_class, start, end, details))
+
+            elif kind == tml_parser.CLOSE:
+                if any(entry[0] == name for entry in stack):
+                    # all tags opened after this one were never closed
+                    while stack[-1][0] != name:
+                        open_name, _, open_start, _, _ = stack.pop()
+                        report(open_start, open_name, "is never closed")
+                    _, shape_class, open_start, content_start, details = (
+                        stack.pop())
+                    if issubclass(shape_class or object,
+                                  (shapes.Definition, shapes.Use)):
+                        __check_link(shape_class, details, open_start,
+                                     definitions, report)
+                    if not stack:
+                        break
+                    parent_class = stack[-1][1]
+                    if shape_class is None and parent_class is not None:
+                        value = text[content_start:start]
+                        __check_value(parent_class, name, value,
+                                      content_start, report)
+                        if issubclass(parent_class, (shapes.Definition,
+                                                     shapes.Use)):
+                            __note_attribute(parent_class, name, value,
+                                             stack[-1][4])
+                else:
+                    report(start, name, "closing tag was never opened")
+
+    except ValueError:
+        # the first '<' after the last '>' has no end
+        report(text.find("<", text.rfind(">") + 1), None,
+               "tag is not closed with '>'")
+
+    for name, _, start, _, _ in reversed(stack):
+        report(start, name, "is never closed")
+    if not root_found:
+        report(0, None, "no tag found")
+    return collector.diagnostics
+
+
+def validate_file(file_path: str) -> list:
+    """
+    Check the given TML-file.
+
+    Parameters
+    ----------
+    file_path : str
+        Path of the .tml file.
+
+    Returns
+    -------
+    list
+        A Diagnostic for every problem found, empty if the file is valid.
+
+    """
+    try:
+        with open(file_path) as file:
+            text = file.read()
+    except (OSError, UnicodeDecodeError) as error:
+        return [Diagnostic(0, 0, None, f"can not be read: {error}")]
+    return validate(text)
+
+
+def validate_files(file_paths: list, workers: int = None):
+    """
+    Check many TML-files in parallel processes.
+
+    Parameters
+    ----------
+    file_paths : list
+        Paths of the .tml files.
+    workers : int, optional
+        Number of processes. The default is the number of processors.
+
+    Yields
+    ------
+    tuple
+        (file path, list of diagnostics) for every file, in the given order.
+
+    """
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        yield from zip(file_paths,
+                       executor.map(validate_file, file_paths, chunksize=16))
@@ -0,0 +1,464 @@
+"""
+Watch a TML-file and render it again after every change, as fast as possible.
+
+A new version of the text is compared with the last one, only the part
+between the first and the last changed character is tokenized again. The
+shapes directly below the image in this part are compared with their last
+version by their text and only the changed ones are parsed again. The
+picture is kept in memory and only the areas covered by the changed shapes,
+before and after the change, are drawn again, together with all other
+shapes overlapping them.
+
+Changes to the attributes of the image or to definitions parse and draw the
+whole file again.
+"""
+
+import copy
+import difflib
+import math
+import os
+import time
+
+import raster
+import shapes
+import spatial
+import tml_parser
+
+
+def split_shapes(text: str, start: int = 0, end: int = None,
+                 inside: bool = False):
+    """
+    Find the shapes directly below the root of a text.
+
+    Parameters
+    ----------
+    text : str
+        The TML-text.
+    start : int, optional
+        Start index of the search. The default is 0.
+    end : int, optional
+        Ending index of the search. The default is the end of the text.
+    inside : bool, optional
+        If True, the search starts inside of the root tag, like for a part
+        of the text between two shapes. The default is False.
+
+    Raises
+    ------
+    ValueError
+        If a tag is not closed with a '>' or the tags are not balanced.
+
+    Returns
+    -------
+    tuple
+        (list of (start, end) of the shapes, text of all attributes of the
+        root), the shapes reach from their opening to their closing tag.
+
+    """
+    offsets = list()
+    attributes = list()
+    # the root of a part of the text is not known
+    stack = [None] if inside else list()
+    shape_start = None
+    for kind, name, tag_start, tag_end in tml_parser.tokenize(text, start,
+                                                              end):
+        if kind == tml_parser.OPEN:
+            stack.append(name)
+            if len(stack) == 2:
+                shape_start = tag_start
+        elif kind == tml_parser.CLOSE:
+            if not stack or stack.pop() != name:
+                raise ValueError(f"closing tag </{name}> at index "
+                                 f"{tag_start} does not match")
+            if len(stack) == 1:
+                if shapes.get_shape_class(name) is not None:
+                    offsets.append((shape_start, tag_end))
+                else:
+                    attributes.append(text[shape_start:tag_end])
+            elif not stack:
+                break
+    if len(stack) != (1 if inside else 0):
+        raise ValueError(f"tag <{stack[-1]}> is never closed")
+    return offsets, "".join(attributes)
+
+
+def common_lengths(old: str, new: str, chunk_size: int = 65536):
+    """
+    Find how many characters two texts share at their start and end.
+
+    Parameters
+    ----------
+    old : str
+        The first text.
+    new : str
+        The second text.
+    chunk_size : int, optional
+        Number of characters compared at once. The default is 65536.
+
+    Returns
+    -------
+    tuple
+        (length of the common start, length of the common end), which do
+        not overlap in any of the texts.
+
+    """
+    limit = min(len(old), len(new))
+    prefix = 0
+    while prefix < limit:
+        size = min(chunk_size, limit - prefix)
+        if old[prefix:prefix + size] == new[prefix:prefix + size]:
+            prefix += size
+        elif size > 1:
+            chunk_size = max(1, size // 2)
+        else:
+            break
+
+    limit -= prefix
+    suffix = 0
+    chunk_size = 65536
+    while suffix < limit:
+        size = min(chunk_size, limit - suffix)
+        if (old[len(old) - suffix - size:len(old) - suffix]
+                == new[len(new) - suffix - size:len(new) - suffix]):
+            suffix += size
+        elif size > 1:
+            chunk_size = max(1, size // 2)
+        else:
+            break
+    return prefix, suffix
+
+
+def _definitions(shape, found: dict = None) -> dict:
+    """
+    Collect all definitions below a shape.
+
+    Parameters
+    ----------
+    shape : Shape
+        The shape.
+    found : dict, optional
+        Definitions found so far. The default is a new dictionary.
+
+    Returns
+    -------
+    dict
+        The definitions by their name.
+
+    """
+    if found is None:
+        found = dict()
+    if isinstance(shape, shapes.Definition):
+        found[shape.name] = shape
+    for sub_shape in shape.sub_shapes:
+        _definitions(sub_shape, found)
+    return found
+
+
+class IncrementalRenderer():
+    """
+    A picture of a TML-text, which is updated piece by piece.
+
+    The picture is kept in a RasterBackend, which can be written into a
+    file after every update.
+    """
+
+    def __init__(self, width: int = None, height: int = None):
+        """
+        Create a renderer without a picture.
+
+        Parameters
+        ----------
+        width : int, optional
+            Width of the picture in pixels. The default is the width of the
+            image in world coordinates.
+        height : int, optional
+            Height of the picture in pixels. The default is the height of
+            the image in world coordinates.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.width = width
+        self.height = height
+        self.image = None
+        self.backend = None
+        self.text = None
+        # position, shape and bounding box of every shape below the image
+        self.__offsets = list()
+        self.__shapes = list()
+        self.__boxes = list()
+        self.__definitions = dict()
+
+    def update(self, text: str) -> list:
+        """
+        Bring the picture up to date with a new version of the text.
+
+        Parameters
+        ----------
+        text : str
+            The whole TML-text.
+
+        Raises
+        ------
+        ValueError
+            If the text is not a valid TML. The picture is not changed.
+
+        Returns
+        -------
+        list
+            Areas of the picture drawn again as (left, top, right, bottom)
+            in pixels, one area covering the whole picture if everything
+            was drawn again.
+
+        """
+        if self.image is None or not self.__offsets:
+            return self.__rebuild(text)
+        old = self.text
+        offsets = self.__offsets
+        prefix, suffix = common_lengths(old, text)
+        if prefix == len(old) == len(text):
+            return list()
+
+        # the shapes ending before the change and starting after it are
+        # kept, the part of the text between them is read again
+        first = 0
+        while first < len(offsets) and offsets[first][1] <= prefix:
+            first += 1
+        last = len(offsets)
+        while last > first and offsets[last - 1][0] >= len(old) - suffix:
+            last -= 1
+        if first == 0 and prefix < offsets[0][0]:
+            return self.__rebuild(text)
+        if last == len(offsets) and len(old) - suffix > offsets[-1][1]:
+            return self.__rebuild(text)
+
+        shift = len(text) - len(old)
+        start = offsets[first - 1][1] if first > 0 else offsets[0][0]
+        end = offsets[last][0] if last < len(offsets) else offsets[-1][1]
+        try:
+            middle, attributes = split_shapes(text, start, end + shift,
+                                              inside=True)
+        except ValueError:
+            return self.__rebuild(text)
+        old_spans = [old[begin:finish]
+                     for begin, finish in offsets[first:last]]
+        spans = [text[begin:finish] for begin, finish in middle]
+        if attributes or any("<define>" in span
+                             for span in old_spans + spans):
+            return self.__rebuild(text)
+
+        new_shapes = list()
+        new_boxes = list()
+        dirty = list()
+        matcher = difflib.SequenceMatcher(None, old_spans, spans,
+                                          autojunk=False)
+        for operation, old_first, old_last, new_first, new_last in (
+                matcher.get_opcodes()):
+            old_first += first
+            old_last += first
+            if operation == "equal":
+                new_shapes.extend(self.__shapes[old_first:old_last])
+                new_boxes.extend(self.__boxes[old_first:old_last])
+                continue
+            dirty.extend(box for box in self.__boxes[old_first:old_last]
+                         if box is not None)
+            for span in spans[new_first:new_last]:
+                # every definition is kept, so instances can be parsed
+                shape = tml_parser.parse(span,
+                                         definitions=self.__definitions)
+                box = spatial.shape_bounds(shape)
+                new_shapes.append(shape)
+                new_boxes.append(box)
+                if box is not None:
+                    dirty.append(box)
+
+        self.text = text
+        self.__offsets = (offsets[:first] + middle
+                          + [(begin + shift, finish + shift)
+                             for begin, finish in offsets[last:]])
+        self.__shapes[first:last] = new_shapes
+        self.__boxes[first:last] = new_boxes
+        self.image.sub_shapes = self.__shapes
+        return self.__redraw(dirty)
+
+    def __rebuild(self, text: str) -> list:
+        """
+        Parse and draw the whole text.
+
+        Parameters
+        ----------
+        text : str
+            The whole TML-text.
+
+        Returns
+        -------
+        list
+            One area covering the whole picture.
+
+        """
+        offsets, _ = split_shapes(text)
+        image = tml_parser.parse(text)
+        backend = raster.RasterBackend(self.width, self.height)
+        image.draw(backend)
+
+        self.image = image
+        self.backend = backend
+        self.text = text
+        self.__offsets = offsets
+        self.__shapes = list(image.sub_shapes)
+        self.__boxes = [spatial.shape_bounds(shape)
+                        for shape in self.__shapes]
+        self.__definitions = _definitions(image)
+        return [(0, 0, backend.pixel_width, backend.pixel_height)]
+
+    def __to_area(self, box: tuple):
+        """
+        Get the pixels covered by a box, with one more pixel around them.
+
+        Parameters
+        ----------
+        box : tuple
+            Box in world coordinates.
+
+        Returns
+        -------
+        tuple
+            (left, top, right, bottom) in pixels or None, if the box is
+            outside of the picture.
+
+        """
+        image = self.image
+        width = self.backend.pixel_width
+        height = self.backend.pixel_height
+        scale_x = width / (image.upper_right_x - image.lower_left_x)
+        scale_y = height / (image.upper_right_y - image.lower_left_y)
+        left = max(0, math.floor((box[0] - image.lower_left_x) * scale_x)
+                   - 1)
+        right = min(width, math.ceil((box[2] - image.lower_left_x)
+                                     * scale_x) + 1)
+        top = max(0, math.floor((image.upper_right_y - box[3]) * scale_y)
+                  - 1)
+        bottom = min(height, math.ceil((image.upper_right_y - box[1])
+                                       * scale_y) + 1)
+        if left >= right or top >= bottom:
+            return None
+        return (left, top, right, bottom)
+
+    def __redraw(self, dirty: list) -> list:
+        """
+        Draw the areas covered by some boxes again.
+
+        Parameters
+        ----------
+        dirty : list
+            Boxes in world coordinates, which changed.
+
+        Returns
+        -------
+        list
+            Areas drawn again as (left, top, right, bottom) in pixels.
+
+        """
+        areas = [area for area in map(self.__to_area, dirty)
+                 if area is not None]
+        if not areas:
+            return areas
+
+        image = self.image
+        width = self.backend.pixel_width
+        height = self.backend.pixel_height
+        scale_x = width / (image.upper_right_x - image.lower_left_x)
+        scale_y = height / (image.upper_right_y - image.lower_left_y)
+
+        boxes = self.__boxes
+        view = copy.copy(image)
+        view.sub_shapes = ()
+        pixels = self.backend.pixels
+        for left, top, right, bottom in areas:
+            # one more pixel around the area catches rounding at the borders
+            box = (image.lower_left_x + (left - 1) / scale_x,
+                   image.upper_right_y - (bottom + 1) / scale_y,
+                   image.lower_left_x + (right + 1) / scale_x,
+                   image.upper_right_y - (top - 1) / scale_y)
+            columns = right - left
+            tile = raster.RasterBackend(columns, bottom - top)
+            tile.begin_tile(view, width, height, left, top)
+            # a scan of all boxes is faster than building a grid index
+            # again for every update
+            for index, shape_box in enumerate(boxes):
+                if shape_box is not None and spatial.intersects(shape_box,
+                                                                box):
+                    self.__shapes[index].draw(tile)
+            tile.end_image(view)
+
+            for row in range(bottom - top):
+                start = ((top + row) * width + left) * 3
+                pixels[start:start + columns * 3] = (
+                    tile.pixels[row * columns * 3:(row + 1) * columns * 3])
+        return areas
+
+
+def watch(file_path: str, output_path: str, width: int = None,
+          height: int = None, interval: float = 0.1, callback=None,
+          stop=None):
+    """
+    Render a file again, whenever it changes.
+
+    The file is polled, so no further packages are needed.
+
+    Parameters
+    ----------
+    file_path : str
+        Path of the .tml file.
+    output_path : str
+        Path of the picture, the format is chosen by the file extension.
+    width : int, optional
+        Width of the picture in pixels. The default is the width of the
+        image.
+    height : int, optional
+        Height of the picture in pixels. The default is the height of the
+        image.
+    interval : float, optional
+        Seconds between two looks at the file. The default is 0.1.
+    callback : callable, optional
+        Called after every update with the list of areas drawn again and
+        the seconds needed, or with None and the error, if the file is not
+        valid. The default does nothing.
+    stop : callable, optional
+        Called before every look at the file, watching ends when it
+        returns True. The default watches until the program is stopped.
+
+    Returns
+    -------
+    None.
+
+    """
+    renderer = IncrementalRenderer(width, height)
+    last = None
+    while stop is None or not stop():
+        try:
+            status = os.stat(file_path)
+        except FileNotFoundError:
+            # editors often replace a file by removing it first
+            time.sleep(interval)
+            continue
+        version = (status.st_mtime_ns, status.st_size)
+        if version == last:
+            time.sleep(interval)
+            continue
+        last = version
+
+        start = time.perf_counter()
+        try:
+            with open(file_path) as file:
+                areas = renderer.update(file.read())
+        except ValueError as error:
+            if callback is not None:
+                callback(None, error)
+            continue
+        seconds = time.perf_counter() - start
+        if areas:
+            renderer.backend.save(output_path)
+        if callback is not None:
+            callback(areas, seconds)